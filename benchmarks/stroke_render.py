@@ -0,0 +1,108 @@
+"""Headless benchmark: rasterize 50k annotation segments into a capture-sized layer.
+
+Compares the old per-segment painting (new QPen + drawLine per segment),
+one polyline per stroke, and the batched StrokeRenderer used to rebuild the
+annotation layer.
+
+    python benchmarks/stroke_render.py [--strokes 1000] [--points 51] [--repeat 3]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QPoint, QPointF
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen
+from src.ui.stroke_document import StrokeDocument, TOOL_PEN, TOOL_HIGHLIGHTER
+from src.ui.annotation_layer import StrokeRenderer
+
+WIDTH, HEIGHT = 1920, 1080
+HIGHLIGHTER_CAP = Qt.PenCapStyle.FlatCap
+HIGHLIGHTER_JOIN = Qt.PenJoinStyle.MiterJoin
+
+
+def build_document(stroke_count, points_per_stroke, seed=1):
+    """Random scribbles: runs of pen strokes per colour, every 10th stroke a highlight"""
+    rng = random.Random(seed)
+    document = StrokeDocument()
+    colors = [QColor(255, 0, 0), QColor(0, 160, 0), QColor(0, 0, 255)]
+    highlight = QColor(255, 255, 0, 64)
+    for n in range(stroke_count):
+        is_highlight = n % 10 == 9
+        tool = TOOL_HIGHLIGHTER if is_highlight else TOOL_PEN
+        color = highlight if is_highlight else colors[(n // 50) % len(colors)]
+        width = 20 if is_highlight else 3
+        x, y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        stroke = document.begin(tool, color, width, QPoint(int(x), int(y)))
+        for _ in range(points_per_stroke - 1):
+            x += rng.uniform(-6, 6)
+            y += rng.uniform(-6, 6)
+            stroke.add_point(x, y)
+    return document
+
+
+def paint_per_segment(painter, document):
+    for stroke in document.strokes:
+        color = document.color(stroke)
+        for i in range(1, len(stroke)):
+            pen = QPen(color, stroke.width)
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            painter.setPen(pen)
+            painter.drawLine(QPointF(*stroke.point(i - 1)), QPointF(*stroke.point(i)))
+
+
+def paint_per_stroke(painter, document):
+    for stroke in document.strokes:
+        pen = QPen(document.color(stroke), stroke.width)
+        if stroke.tool == TOOL_HIGHLIGHTER:
+            pen.setCapStyle(HIGHLIGHTER_CAP)
+            pen.setJoinStyle(HIGHLIGHTER_JOIN)
+        else:
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        painter.setPen(pen)
+        painter.drawPolyline(stroke.polygon())
+
+
+def measure(name, paint, document, repeat):
+    image = QImage(WIDTH, HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+    best = None
+    for _ in range(repeat):
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        start = time.perf_counter()
+        paint(painter, document)
+        painter.end()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<22} {best * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strokes", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=51)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    document = build_document(args.strokes, args.points)
+    for stroke in document.strokes:
+        stroke.polygon()  # Built once per stroke in the app as well
+    segments = sum(len(stroke) - 1 for stroke in document.strokes)
+    print(f"{len(document)} strokes, {segments} segments, {WIDTH}x{HEIGHT} layer (best of {args.repeat})")
+
+    renderer = StrokeRenderer(HIGHLIGHTER_CAP, HIGHLIGHTER_JOIN)
+    measure("per segment", paint_per_segment, document, args.repeat)
+    measure("polyline per stroke", paint_per_stroke, document, args.repeat)
+    measure("StrokeRenderer", lambda painter, doc: renderer.paint(painter, doc, doc.strokes), document, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Capture scopes for the zoom view: whole screen, active window or a region
+around the pointer. Smaller scopes cut grab time and the memory held by the
+zoom view (a 1280x720 region instead of a full 4K screen).
+"""
+from PyQt6.QtCore import QRect, QSettings
+from src.ui.screen_topology import ScreenTopology
+import sys
+import ctypes
+import ctypes.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("screen", "window", "region", "all")
+DEFAULT_REGION_SCALE = 3.0  # Region = screen size / scale (the zoom at which it fills the screen)
+MIN_CAPTURE_SIZE = 64
+
+
+def _foreground_window_rect_win32():
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+
+    class RECT(ctypes.Structure):
+        _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long),
+                    ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+    rect = RECT()
+    # Extended frame bounds exclude the invisible resize borders of Windows 10+
+    DWMWA_EXTENDED_FRAME_BOUNDS = 9
+    try:
+        result = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+            hwnd, DWMWA_EXTENDED_FRAME_BOUNDS, ctypes.byref(rect), ctypes.sizeof(rect))
+    except OSError:
+        result = -1
+    if result != 0 and not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        return None
+    return QRect(rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+
+
+def _active_window_rect_x11():
+    path = ctypes.util.find_library("X11")
+    if not path:
+        return None
+    x11 = ctypes.CDLL(path)
+    x11.XOpenDisplay.restype = ctypes.c_void_p
+    x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    x11.XDefaultRootWindow.restype = ctypes.c_ulong
+    x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    x11.XInternAtom.restype = ctypes.c_ulong
+    x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    x11.XGetWindowProperty.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+        ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_void_p)]
+    x11.XGetGeometry.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+        ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+    x11.XTranslateCoordinates.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong)]
+    x11.XFree.argtypes = [ctypes.c_void_p]
+
+    display = x11.XOpenDisplay(None)
+    if not display:
+        return None
+    try:
+        root = x11.XDefaultRootWindow(display)
+        atom = x11.XInternAtom(display, b"_NET_ACTIVE_WINDOW", 1)
+        if not atom:
+            return None
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        count, remaining, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+        XA_WINDOW = 33
+        status = x11.XGetWindowProperty(display, root, atom, 0, 1, 0, XA_WINDOW,
+                                        ctypes.byref(actual_type), ctypes.byref(actual_format),
+                                        ctypes.byref(count), ctypes.byref(remaining), ctypes.byref(data))
+        if status != 0 or not data.value or count.value == 0:
+            return None
+        window = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))[0]
+        x11.XFree(data)
+        if not window:
+            return None
+
+        geometry_root = ctypes.c_ulong()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        if not x11.XGetGeometry(display, window, ctypes.byref(geometry_root), ctypes.byref(x), ctypes.byref(y),
+                                ctypes.byref(width), ctypes.byref(height), ctypes.byref(border), ctypes.byref(depth)):
+            return None
+        root_x, root_y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+        x11.XTranslateCoordinates(display, window, root, 0, 0,
+                                  ctypes.byref(root_x), ctypes.byref(root_y), ctypes.byref(child))
+        return QRect(root_x.value, root_y.value, width.value, height.value)
+    finally:
+        x11.XCloseDisplay(display)
+
+
+def active_window_rect():
+    """Geometry of the foreground window in device pixels, or None if unknown"""
+    try:
+        if sys.platform == "win32":
+            return _foreground_window_rect_win32()
+        if sys.platform.startswith("linux"):
+            return _active_window_rect_x11()
+    except Exception as e:
+        logger.debug(f"Active window lookup failed: {e}")
+    return None
+
+
+def region_around(info, pos, scale=None):
+    """Rect around pos sized screen / scale, kept inside the screen (logical coordinates)"""
+    if scale is None:
+        scale = QSettings().value("capture/region_scale", DEFAULT_REGION_SCALE, float)
+    scale = max(1.0, scale)
+    geometry = info.geometry
+    width = max(MIN_CAPTURE_SIZE, int(geometry.width() / scale))
+    height = max(MIN_CAPTURE_SIZE, int(geometry.height() / scale))
+    rect = QRect(pos.x() - width // 2, pos.y() - height // 2, width, height)
+    # Shift (not clip) so the region keeps its size near screen edges
+    rect.moveLeft(max(geometry.left(), min(rect.left(), geometry.right() + 1 - width)))
+    rect.moveTop(max(geometry.top(), min(rect.top(), geometry.bottom() + 1 - height)))
+    return rect.intersected(geometry)
+
+
+def capture_target(mode, pos, screen=None):
+    """Return (ScreenInfo, logical capture rect) for a capture mode at pointer pos
+
+    screen forces a whole-screen capture of that screen (used for "all",
+    which opens one zoom view per screen).
+    """
+    topology = ScreenTopology.instance()
+    if screen is not None and topology.info_for(screen) is not None:
+        info = topology.info_for(screen)
+        return info, QRect(info.geometry)
+    info = topology.screen_under_cursor(pos)
+
+    if mode == "region":
+        return info, region_around(info, pos)
+
+    if mode == "window":
+        native = active_window_rect()
+        if native is not None:
+            window_info = topology.screen_at_native(native.center().x(), native.center().y()) or info
+            top_left = window_info.map_from_native(native.x(), native.y())
+            ratio = window_info.device_pixel_ratio
+            rect = QRect(top_left.x(), top_left.y(), int(native.width() / ratio), int(native.height() / ratio))
+            rect = rect.intersected(window_info.geometry)
+            if rect.width() >= MIN_CAPTURE_SIZE and rect.height() >= MIN_CAPTURE_SIZE:
+                return window_info, rect
+        logger.debug("Active window not available, capturing the screen")
+
+    return info, QRect(info.geometry)
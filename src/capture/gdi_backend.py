@@ -0,0 +1,196 @@
+"""Windows GDI capture backend (ctypes, no extra Python dependencies).
+
+BitBlt copies the desktop into a DIB section and the QImage is wrapped
+around the section's pixels without a copy. GDI may be called from any
+thread, so unlike QScreen.grabWindow the grab runs on the capture pool and
+the screens of "all" mode are grabbed in parallel. One DIB section is kept
+per screen and capture size and reused.
+
+The returned image is only valid until the next capture of the same screen;
+consumers copy it (e.g. QPixmap.fromImage) before that.
+"""
+from PyQt6.QtGui import QImage
+from PyQt6 import sip
+from collections import OrderedDict
+import sys
+import ctypes
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+SRCCOPY = 0x00CC0020
+CAPTUREBLT = 0x40000000      # Include layered windows, as grabWindow does
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+MAX_BUFFERS_PER_SCREEN = 2
+
+
+class _BitmapInfoHeader(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.c_uint32),
+        ("biWidth", ctypes.c_int32),
+        ("biHeight", ctypes.c_int32),
+        ("biPlanes", ctypes.c_uint16),
+        ("biBitCount", ctypes.c_uint16),
+        ("biCompression", ctypes.c_uint32),
+        ("biSizeImage", ctypes.c_uint32),
+        ("biXPelsPerMeter", ctypes.c_int32),
+        ("biYPelsPerMeter", ctypes.c_int32),
+        ("biClrUsed", ctypes.c_uint32),
+        ("biClrImportant", ctypes.c_uint32),
+    ]
+
+
+class _DibBuffer:
+    """Memory DC with a selected 32 bpp top-down DIB section of a fixed size"""
+
+    def __init__(self, backend, width, height):
+        gdi32 = backend.gdi32
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.bytes_per_line = width * 4
+        self.size = self.bytes_per_line * height
+
+        header = _BitmapInfoHeader()
+        header.biSize = ctypes.sizeof(_BitmapInfoHeader)
+        header.biWidth = width
+        header.biHeight = -height  # Top-down rows, like QImage
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = BI_RGB
+
+        self.dc = gdi32.CreateCompatibleDC(None)
+        if not self.dc:
+            raise RuntimeError("CreateCompatibleDC failed")
+        bits = ctypes.c_void_p()
+        self.bitmap = gdi32.CreateDIBSection(self.dc, ctypes.byref(header), DIB_RGB_COLORS,
+                                             ctypes.byref(bits), None, 0)
+        if not self.bitmap:
+            gdi32.DeleteDC(self.dc)
+            raise RuntimeError("CreateDIBSection failed")
+        self.bits = bits.value
+        self.previous = gdi32.SelectObject(self.dc, self.bitmap)
+
+    def release(self):
+        gdi32 = self.backend.gdi32
+        gdi32.SelectObject(self.dc, self.previous)
+        gdi32.DeleteObject(self.bitmap)
+        gdi32.DeleteDC(self.dc)
+
+
+class _Surface:
+    """DIB sections of one screen; one grab at a time"""
+
+    def __init__(self):
+        self.buffers = OrderedDict()  # (width, height) -> _DibBuffer, most recently used last
+        self.lock = threading.Lock()
+
+
+class GdiCaptureBackend:
+    """Capture through BitBlt from the desktop DC.
+
+    Every screen gets its own DIB sections and lock, so screens are grabbed
+    in parallel on the capture pool. Qt makes the process per-monitor DPI
+    aware, so desktop coordinates are device pixels, as in native_geometry.
+    """
+
+    name = "gdi"
+    reuses_buffers = True
+
+    def __init__(self):
+        if sys.platform != "win32":
+            raise RuntimeError("GDI capture is only available on Windows")
+        self.user32 = ctypes.WinDLL("user32")
+        self.gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+        self._declare()
+
+        self._surfaces = {}  # Screen name -> _Surface
+        self._lock = threading.Lock()  # Guards the surface map only
+
+        logger.debug("GDI capture backend ready")
+
+    def _declare(self):
+        user32, gdi32 = self.user32, self.gdi32
+        user32.GetDC.restype = ctypes.c_void_p
+        user32.GetDC.argtypes = [ctypes.c_void_p]
+        user32.ReleaseDC.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+
+        gdi32.CreateCompatibleDC.restype = ctypes.c_void_p
+        gdi32.CreateCompatibleDC.argtypes = [ctypes.c_void_p]
+        gdi32.DeleteDC.argtypes = [ctypes.c_void_p]
+        gdi32.CreateDIBSection.restype = ctypes.c_void_p
+        gdi32.CreateDIBSection.argtypes = [ctypes.c_void_p, ctypes.POINTER(_BitmapInfoHeader), ctypes.c_uint,
+                                           ctypes.POINTER(ctypes.c_void_p), ctypes.c_void_p, ctypes.c_uint32]
+        gdi32.SelectObject.restype = ctypes.c_void_p
+        gdi32.SelectObject.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        gdi32.DeleteObject.argtypes = [ctypes.c_void_p]
+        gdi32.BitBlt.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_uint32]
+        gdi32.GdiFlush.argtypes = []
+
+    def _surface(self, screen_name):
+        with self._lock:
+            surface = self._surfaces.get(screen_name)
+            if surface is None:
+                surface = _Surface()
+                self._surfaces[screen_name] = surface
+        return surface
+
+    def _buffer(self, surface, width, height):
+        key = (width, height)
+        buffer = surface.buffers.get(key)
+        if buffer is None:
+            buffer = _DibBuffer(self, width, height)
+            surface.buffers[key] = buffer
+            logger.debug(f"GDI buffer allocated: {width}x{height} ({buffer.size // 1024} KB)")
+            # Region/window captures come in many sizes; keep only a few sections per screen
+            while len(surface.buffers) > MAX_BUFFERS_PER_SCREEN:
+                surface.buffers.popitem(last=False)[1].release()
+        else:
+            surface.buffers.move_to_end(key)
+        return buffer
+
+    def grab(self, info, rect=None):
+        """Capture a ScreenInfo's screen, or a logical rect inside it, from the desktop"""
+        rect = info.native_geometry if rect is None else info.native_rect(rect)
+        surface = self._surface(info.name)
+        with surface.lock:
+            buffer = self._buffer(surface, rect.width(), rect.height())
+            screen_dc = self.user32.GetDC(None)
+            if not screen_dc:
+                raise RuntimeError("GetDC failed")
+            try:
+                ok = self.gdi32.BitBlt(buffer.dc, 0, 0, rect.width(), rect.height(),
+                                       screen_dc, rect.x(), rect.y(), SRCCOPY | CAPTUREBLT)
+            finally:
+                self.user32.ReleaseDC(None, screen_dc)
+            # The DIB bits are read directly below; finish any batched GDI work first
+            self.gdi32.GdiFlush()
+        if not ok:
+            raise RuntimeError(f"BitBlt failed (error {ctypes.get_last_error()})")
+
+        # Wraps the DIB section (no copy); BGRX rows are Format_RGB32
+        image = QImage(sip.voidptr(buffer.bits, buffer.size), buffer.width, buffer.height,
+                       buffer.bytes_per_line, QImage.Format.Format_RGB32)
+        image.setDevicePixelRatio(info.device_pixel_ratio)
+        return image
+
+    def release_screens(self, keep):
+        """Free the buffers of screens not named in keep (the capture pool must be idle)"""
+        with self._lock:
+            gone = [name for name in self._surfaces if name not in keep]
+            for name in gone:
+                for buffer in self._surfaces.pop(name).buffers.values():
+                    buffer.release()
+                logger.debug(f"GDI buffers of removed screen {name} freed")
+
+    def close(self):
+        """Release all buffers (the capture pool must be idle)"""
+        with self._lock:
+            for surface in self._surfaces.values():
+                for buffer in surface.buffers.values():
+                    buffer.release()
+                surface.buffers.clear()
+            self._surfaces = {}
@@ -0,0 +1,255 @@
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QSettings, pyqtSignal
+from PyQt6.QtGui import QImage
+from src.ui.frame_clock import FrameClock
+from src.ui.screen_topology import ScreenTopology
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QtCaptureBackend:
+    """Capture through QScreen.grabWindow.
+
+    grabWindow talks to the platform plugin and returns a QPixmap, neither of
+    which Qt allows off the GUI thread, so ScreenCapturer calls grab() on the
+    GUI thread: it blocks the event loop for the length of the grab and the
+    screens of "all" mode are grabbed one after another. It is only the
+    default where no native backend exists (macOS, Wayland).
+    """
+
+    name = "qt"
+    reuses_buffers = False
+    gui_thread_only = True
+
+    def grab(self, info, rect=None):
+        if rect is None:
+            return info.screen.grabWindow(0).toImage()
+        # Coordinates are relative to the screen
+        return info.screen.grabWindow(0, rect.x() - info.geometry.x(), rect.y() - info.geometry.y(),
+                                      rect.width(), rect.height()).toImage()
+
+
+def selected_backend_name():
+    """Backend selected by capture/backend (auto, xshm, gdi, qt); auto uses XShm on X11, GDI on Windows"""
+    name = QSettings().value("capture/backend", "auto", str)
+    if name == "auto":
+        name = {"xcb": "xshm", "windows": "gdi"}.get(QApplication.platformName(), "qt")
+    return name
+
+
+def create_backend(name=None):
+    """Create a capture backend; one that cannot be initialised falls back to Qt"""
+    if name is None:
+        name = selected_backend_name()
+    if name == "xshm":
+        try:
+            from .xshm_backend import XShmCaptureBackend
+            return XShmCaptureBackend()
+        except Exception as e:
+            logger.warning(f"XShm capture unavailable, using Qt: {e}")
+    elif name == "gdi":
+        try:
+            from .gdi_backend import GdiCaptureBackend
+            return GdiCaptureBackend()
+        except Exception as e:
+            logger.warning(f"GDI capture unavailable, using Qt: {e}")
+    return QtCaptureBackend()
+
+
+class _CaptureSignals(QObject):
+    finished = pyqtSignal(int, QImage, float)  # request id, image, grab time (s)
+    failed = pyqtSignal(int, str)
+
+
+def _grab(backend, info, rect):
+    """(image, grab time) or (None, error message)"""
+    start = time.perf_counter()
+    try:
+        image = backend.grab(info, rect)
+    except Exception as e:
+        return None, str(e)
+    if image is None or image.isNull():
+        return None, "empty capture"
+    return image, time.perf_counter() - start
+
+
+class _CaptureTask(QRunnable):
+    """Runs one grab on the thread pool and reports back through queued signals"""
+
+    def __init__(self, backend, info, rect, request_id, signals):
+        super().__init__()
+        self.backend = backend
+        self.info = info
+        self.rect = rect
+        self.request_id = request_id
+        self.signals = signals
+
+    def run(self):
+        image, grab_time = _grab(self.backend, self.info, self.rect)
+        if image is None:
+            self.signals.failed.emit(self.request_id, grab_time)
+            return
+        self.signals.finished.emit(self.request_id, image, grab_time)
+
+
+class ScreenCapturer(QObject):
+    """Asynchronous screen capture service.
+
+    capture() returns a request id immediately; the grab runs on a worker
+    thread once the next compositor frame has been issued (so effects hidden
+    just before, like the circle cursor, are already off screen), and the
+    result arrives as a QImage through the captured signal.
+
+    Only the native backends (XShm on X11, GDI on Windows) grab off the GUI
+    thread and in parallel per screen. The Qt fallback grabs synchronously on
+    the GUI thread, so there capture() is asynchronous only in its API.
+    """
+
+    captured = pyqtSignal(int, QImage)  # request id, image (copy it if kept beyond the slot)
+    failed = pyqtSignal(int, str)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ScreenCapturer()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.backend = create_backend()
+        # One worker per screen so multi-screen captures take as long as the slowest screen
+        # (native backends only; the Qt backend never uses the pool).
+        # Backend state is per screen, not per worker, so more workers cost no extra connections.
+        self.pool = QThreadPool(self)
+        self._update_thread_count()
+        ScreenTopology.instance().changed.connect(self._on_topology_changed)
+        self._prune_pending = False  # Screens may have gone; release their backend state when idle
+        self._next_id = 1
+        self._requested = {}  # request id -> request time
+        # Backends that reuse one buffer per screen grab each screen one at a time
+        self._busy = set()    # Screens with a grab in flight
+        self._waiting = []    # (screen, request id, rect) queued behind a busy screen
+        self._screens = {}    # request id -> (screen, rect) of a started grab
+        self._retired = []    # Replaced backends, closed once no started grab is left
+
+        self._signals = _CaptureSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def capture(self, screen, rect=None):
+        """Queue a capture of screen (or of a logical rect inside it) and return its request id"""
+        request_id = self._next_id
+        self._next_id += 1
+        self._requested[request_id] = time.perf_counter()
+
+        clock = FrameClock.instance()
+        # Frame that applies pending hides, then one more so it has been painted
+        clock.call_after_frame(lambda: clock.call_after_frame(lambda: self._start(screen, request_id, rect)))
+        return request_id
+
+    def _update_thread_count(self):
+        self.pool.setMaxThreadCount(max(2, len(ScreenTopology.instance().screens())))
+
+    def _on_topology_changed(self):
+        self._update_thread_count()
+        self._prune_pending = True
+        self._close_retired()
+
+    def cancel(self, request_id):
+        """Forget a request; its result is dropped when it arrives"""
+        self._requested.pop(request_id, None)
+
+    def apply_settings(self):
+        """Switch backends after capture/backend changed"""
+        if selected_backend_name() == self.backend.name:
+            return
+        old = self.backend
+        self.pool.waitForDone()
+        self.backend = create_backend()
+        self._retire(old)
+        logger.debug(f"Capture backend: {self.backend.name}")
+
+    def _retire(self, backend):
+        """Close a replaced backend once its queued results have been delivered.
+
+        A finished signal still in the queue carries an image that wraps the
+        backend's buffers, so close() has to wait.
+        """
+        if hasattr(backend, "close"):
+            self._retired.append(backend)
+            self._close_retired()
+
+    def _close_retired(self):
+        if self._screens:
+            return
+        for backend in self._retired:
+            backend.close()
+        self._retired.clear()
+        if self._prune_pending:
+            self._prune_pending = False
+            if hasattr(self.backend, "release_screens"):
+                self.backend.release_screens({info.name for info in ScreenTopology.instance().screens()})
+
+    def _start(self, screen, request_id, rect=None):
+        if request_id not in self._requested:
+            return
+        if self.backend.reuses_buffers and screen in self._busy:
+            self._waiting.append((screen, request_id, rect))
+            return
+        info = ScreenTopology.instance().info_for(screen)
+        if info is None:
+            self._on_failed(request_id, "screen removed")
+            return
+        self._busy.add(screen)
+        self._screens[request_id] = (screen, rect)
+        if getattr(self.backend, "gui_thread_only", False):
+            image, message = _grab(self.backend, info, rect)
+            if image is None:
+                self._on_failed(request_id, message)
+            else:
+                self._on_finished(request_id, image, message)
+            return
+        self.pool.start(_CaptureTask(self.backend, info, rect, request_id, self._signals))
+
+    def _on_finished(self, request_id, image, grab_time):
+        requested = self._requested.pop(request_id, None)
+        if requested is not None:
+            started = self._screens.get(request_id)
+            name = started[0].name() if started else "?"
+            logger.debug(f"Screen capture {request_id} [{name}] ({self.backend.name}): {image.width()}x{image.height()}, "
+                         f"grab {grab_time * 1000:.1f} ms, total {(time.perf_counter() - requested) * 1000:.1f} ms")
+            self.captured.emit(request_id, image)
+        self._release(request_id)
+
+    def _on_failed(self, request_id, message):
+        started = self._screens.get(request_id)
+        if self.backend.name != QtCaptureBackend.name and started is not None and request_id in self._requested:
+            # Fall back to Qt for the rest of the session and retry this request
+            logger.warning(f"{self.backend.name} capture failed ({message}), falling back to Qt")
+            self._retire(self.backend)
+            self.backend = QtCaptureBackend()
+            self._release(request_id)
+            self._start(started[0], request_id, started[1])
+            return
+        if self._requested.pop(request_id, None) is not None:
+            logger.error(f"Screen capture {request_id} failed: {message}")
+            self.failed.emit(request_id, message)
+        self._release(request_id)
+
+    def _release(self, request_id):
+        """The buffer of a finished grab is free again; start the next grab of that screen"""
+        started = self._screens.pop(request_id, None)
+        if started is None:
+            return
+        self._close_retired()
+        screen = started[0]
+        self._busy.discard(screen)
+        for i, (waiting_screen, waiting_id, waiting_rect) in enumerate(self._waiting):
+            if waiting_screen is screen:
+                del self._waiting[i]
+                self._start(waiting_screen, waiting_id, waiting_rect)
+                break
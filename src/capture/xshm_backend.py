@@ -0,0 +1,322 @@
+"""X11 MIT-SHM capture backend (ctypes, no extra Python dependencies).
+
+XShmGetImage copies the root window straight into a SysV shared memory
+segment and the QImage is wrapped around that segment without a copy. One
+segment is kept per screen and capture size and reused, so repeated
+captures do not allocate a new full-screen buffer each time.
+
+The returned image is only valid until the next capture of the same screen;
+consumers copy it (e.g. QPixmap.fromImage) before that.
+"""
+from PyQt6.QtGui import QImage
+from PyQt6 import sip
+from collections import OrderedDict
+import ctypes
+import ctypes.util
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+Z_PIXMAP = 2
+ALL_PLANES = 0xFFFFFFFFFFFFFFFF
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+MAX_BUFFERS_PER_SCREEN = 2
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("funcs", ctypes.c_void_p * 6),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+class _ErrorRouting:
+    """Xlib error handler shared by all open XShm backends.
+
+    XSetErrorHandler is process-wide, so the handler is installed while at
+    least one backend is open. Errors of a backend's own connections are
+    recorded on that connection (instead of letting Xlib exit the process);
+    anything else goes to the handler that was replaced, which is restored
+    when the last backend closes.
+    """
+
+    def __init__(self):
+        self.handler = _XErrorHandler(self._on_error)
+        self.backends = []
+        self.previous = None  # Replaced handler (function pointer) or None
+        self.lock = threading.Lock()
+
+    def add(self, backend):
+        with self.lock:
+            if not self.backends:
+                self.previous = backend.x11.XSetErrorHandler(self.handler)
+            self.backends.append(backend)
+
+    def remove(self, backend):
+        with self.lock:
+            if backend not in self.backends:
+                return
+            self.backends.remove(backend)
+            if self.backends:
+                return
+            x11 = backend.x11
+            current = x11.XSetErrorHandler(_XErrorHandler(self.previous or 0))  # 0 = Xlib's default
+            if current != ctypes.cast(self.handler, ctypes.c_void_p).value:
+                # Someone installed their own handler after us; leave theirs in place
+                x11.XSetErrorHandler(_XErrorHandler(current or 0))
+            self.previous = None
+
+    def _on_error(self, display, event):
+        for backend in list(self.backends):
+            connection = backend._by_display.get(display)
+            if connection is not None:
+                # XErrorEvent.error_code is an unsigned char after type, display, resourceid, serial
+                connection.x_error = ctypes.cast(event, ctypes.POINTER(ctypes.c_ubyte))[ctypes.sizeof(ctypes.c_void_p) * 4]
+                return 0
+        if self.previous:
+            return _XErrorHandler(self.previous)(display, event)
+        return 0
+
+
+_error_routing = _ErrorRouting()
+
+
+class _ShmBuffer:
+    """One attached shared memory segment + XImage of a fixed size"""
+
+    def __init__(self, backend, connection, width, height):
+        x11, xext, libc = backend.x11, backend.xext, backend.libc
+        display = connection.display
+        self.backend = backend
+        self.connection = connection
+        self.info = _XShmSegmentInfo()
+        self.image = xext.XShmCreateImage(display, connection.visual, connection.depth, Z_PIXMAP, None,
+                                          ctypes.byref(self.info), width, height)
+        if not self.image:
+            raise RuntimeError("XShmCreateImage failed")
+        ximage = self.image.contents
+        self.size = ximage.bytes_per_line * ximage.height
+
+        self.info.shmid = libc.shmget(IPC_PRIVATE, self.size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            x11.XFree(self.image)
+            raise RuntimeError("shmget failed")
+        address = libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self.info.shmid, IPC_RMID, None)
+            x11.XFree(self.image)
+            raise RuntimeError("shmat failed")
+        self.info.shmaddr = address
+        self.info.readOnly = 0
+        ximage.data = address
+
+        connection.x_error = None
+        attached = xext.XShmAttach(display, ctypes.byref(self.info))
+        x11.XSync(display, 0)
+        # The segment is freed automatically once both sides detach
+        libc.shmctl(self.info.shmid, IPC_RMID, None)
+        if not attached or connection.x_error is not None:
+            libc.shmdt(ctypes.c_void_p(address))
+            x11.XFree(self.image)
+            raise RuntimeError(f"XShmAttach failed (X error {connection.x_error})")
+
+    def release(self):
+        backend, display = self.backend, self.connection.display
+        backend.xext.XShmDetach(display, ctypes.byref(self.info))
+        backend.x11.XSync(display, 0)
+        backend.libc.shmdt(ctypes.c_void_p(self.info.shmaddr))
+        self.image.contents.data = None
+        backend.x11.XFree(self.image)
+
+
+class _Connection:
+    """X display connection of one screen with its own shared buffers"""
+
+    def __init__(self, backend):
+        x11 = backend.x11
+        self.display = x11.XOpenDisplay(None)
+        if not self.display:
+            raise RuntimeError("cannot open X display")
+        screen = x11.XDefaultScreen(self.display)
+        self.root = x11.XRootWindow(self.display, screen)
+        self.visual = x11.XDefaultVisual(self.display, screen)
+        self.depth = x11.XDefaultDepth(self.display, screen)
+        self.buffers = OrderedDict()  # (screen name, width, height) -> _ShmBuffer, most recently used last
+        self.x_error = None
+        self.lock = threading.Lock()  # Xlib is not initialised for threads: one user at a time
+
+
+class XShmCaptureBackend:
+    """Capture through XShmGetImage on the X root window.
+
+    Every screen gets its own long-lived display connection, so screens are
+    grabbed in parallel without sharing an Xlib display between threads.
+    Connections are keyed by screen rather than by pool thread: the pool
+    retires idle threads, and the number of segments must not depend on how
+    many threads happened to grab.
+    """
+
+    name = "xshm"
+    reuses_buffers = True
+
+    def __init__(self):
+        x11_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise RuntimeError("libX11/libXext not found")
+        self.x11 = ctypes.CDLL(x11_path)
+        self.xext = ctypes.CDLL(xext_path)
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._declare()
+
+        # Probe the extension once on a throwaway connection
+        display = self.x11.XOpenDisplay(None)
+        if not display:
+            raise RuntimeError("cannot open X display")
+        available = self.xext.XShmQueryExtension(display)
+        self.depth = self.x11.XDefaultDepth(display, self.x11.XDefaultScreen(display))
+        self.x11.XCloseDisplay(display)
+        if not available:
+            raise RuntimeError("MIT-SHM extension not available")
+
+        self._connections = {}  # Screen name -> _Connection
+        self._by_display = {}   # Display pointer -> _Connection, for routing X errors
+        self._lock = threading.Lock()  # Guards the connection maps only
+
+        # Record X errors instead of letting Xlib exit the process (e.g. remote displays)
+        _error_routing.add(self)
+
+        logger.debug(f"XShm capture backend ready (depth {self.depth})")
+
+    def _declare(self):
+        x11, xext, libc = self.x11, self.xext, self.libc
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        x11.XSetErrorHandler.argtypes = [_XErrorHandler]
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+                                         ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo),
+                                         ctypes.c_uint, ctypes.c_uint]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+                                      ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def _connection(self, screen_name):
+        with self._lock:
+            connection = self._connections.get(screen_name)
+            if connection is None:
+                connection = _Connection(self)
+                self._connections[screen_name] = connection
+                self._by_display[connection.display] = connection
+        return connection
+
+    def _buffer(self, connection, screen_name, width, height):
+        key = (screen_name, width, height)
+        buffer = connection.buffers.get(key)
+        if buffer is None:
+            buffer = _ShmBuffer(self, connection, width, height)
+            connection.buffers[key] = buffer
+            logger.debug(f"XShm buffer allocated: {width}x{height} ({buffer.size // 1024} KB)")
+            # Region/window captures come in many sizes; keep only a few segments per screen.
+            # Only buffers of the same screen are evicted - its previous image has been consumed.
+            same_screen = [k for k in connection.buffers if k[0] == screen_name]
+            for old_key in same_screen[:-MAX_BUFFERS_PER_SCREEN]:
+                connection.buffers.pop(old_key).release()
+        else:
+            connection.buffers.move_to_end(key)
+        return buffer
+
+    def grab(self, info, rect=None):
+        """Capture a ScreenInfo's screen, or a logical rect inside it, from the root window"""
+        rect = info.native_geometry if rect is None else info.native_rect(rect)
+        connection = self._connection(info.name)
+        with connection.lock:
+            buffer = self._buffer(connection, info.name, rect.width(), rect.height())
+            connection.x_error = None
+            ok = self.xext.XShmGetImage(connection.display, connection.root, buffer.image,
+                                        rect.x(), rect.y(), ALL_PLANES)
+        if not ok or connection.x_error is not None:
+            raise RuntimeError(f"XShmGetImage failed (X error {connection.x_error})")
+
+        ximage = buffer.image.contents
+        if ximage.bits_per_pixel != 32:
+            raise RuntimeError(f"unsupported pixel size {ximage.bits_per_pixel} bpp")
+        # Wraps the shared segment (no copy)
+        image = QImage(sip.voidptr(ximage.data, buffer.size), ximage.width, ximage.height,
+                       ximage.bytes_per_line, QImage.Format.Format_RGB32)
+        image.setDevicePixelRatio(info.device_pixel_ratio)
+        return image
+
+    def release_screens(self, keep):
+        """Close the connections of screens not named in keep (the capture pool must be idle)"""
+        with self._lock:
+            gone = [name for name in self._connections if name not in keep]
+            for name in gone:
+                connection = self._connections.pop(name)
+                for buffer in connection.buffers.values():
+                    buffer.release()
+                self.x11.XCloseDisplay(connection.display)
+                del self._by_display[connection.display]
+                logger.debug(f"XShm connection of removed screen {name} closed")
+
+    def close(self):
+        """Release all buffers and connections and the X error handler (the capture pool must be idle)"""
+        with self._lock:
+            for connection in self._connections.values():
+                for buffer in connection.buffers.values():
+                    buffer.release()
+                connection.buffers.clear()
+                self.x11.XCloseDisplay(connection.display)
+            self._connections = {}
+            self._by_display = {}
+        _error_routing.remove(self)
@@ -43,7 +43,10 @@ NUMBER_KEYS = {
 
 # Keyboard shortcut mapping
 KEYBOARD_SHORTCUTS = {
-    "ctrl+1": "activate_zoom", # Ctrl+1: Activate screen capture and zoom function
+    "ctrl+1": "activate_zoom", # Ctrl+1: Activate screen capture and zoom function (capture/mode scope)
+    "ctrl+2": "activate_zoom_region", # Ctrl+2: Zoom into the area around the pointer
+    "ctrl+3": "activate_zoom_window", # Ctrl+3: Zoom into the active window
+    "ctrl+4": "activate_zoom_all", # Ctrl+4: Zoom view on every screen (captured in parallel by XShm/GDI)
     "ctrl+shift++": "increase_circle_cursor", # Ctrl+Shift++: Increase circular cursor size
     "ctrl+shift+=": "increase_circle_cursor", # Ctrl+Shift+=: Increase circular cursor size
     "ctrl+shift+-": "decrease_circle_cursor" # Ctrl+Shift+-: Decrease circular cursor size
@@ -61,6 +64,7 @@ class InputListener(QObject):
     scroll_effect = pyqtSignal(int, int, str)
     show_modifier = pyqtSignal(str)
     activate_zoom = pyqtSignal()
+    activate_zoom_mode = pyqtSignal(str)  # Capture mode: screen / window / region / all
     toggle_circle_cursor = pyqtSignal()
     increase_circle_cursor = pyqtSignal()
     decrease_circle_cursor = pyqtSignal()
@@ -218,6 +222,8 @@ class InputListener(QObject):
                 # Explicitly check if it's Ctrl+1
                 if combo_lower == "ctrl+1":
                     self.activate_zoom.emit()
+            elif action.startswith("activate_zoom_"):
+                self.activate_zoom_mode.emit(action[len("activate_zoom_"):])
             elif action == "toggle_circle_cursor":
                 self.toggle_circle_cursor.emit()
             elif action == "increase_circle_cursor":
@@ -444,6 +450,10 @@ class InputListener(QObject):
         if s.startswith('<') and s.endswith('>') and s[1:-1].isdigit():
             if s == '<21>':
                 return 'KO/EN'
+            # Ctrl을 누른 채 숫자를 누르면 char 없이 vk만 온다 (<50> 등)
+            vk = int(s[1:-1])
+            if vk in NUMBER_KEYS:
+                return NUMBER_KEYS[vk]
             return ''
         return s
     
@@ -0,0 +1,363 @@
+"""Committed annotation strokes rasterized once at capture resolution.
+
+The zoom view blits this layer over the capture instead of re-stroking
+every committed stroke on each repaint (cursor moves repaint constantly).
+New strokes are painted on top as they are committed; erasing repaints
+only the damaged region from the remaining strokes. The stroke being drawn
+goes to a separate scratch layer, so each motion event costs the same no
+matter how long the gesture is.
+
+While zoomed in, the layer is magnified like the capture during zoom and
+pan gestures (constant cost per frame); once the view settles, a screen
+resolution copy is rendered from the visible strokes only, each at the
+coarsest detail level that is not visible at the current scale.
+"""
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPolygonF, QTransform
+from .stroke_document import TOOL_HIGHLIGHTER
+from itertools import chain, islice
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+LOD_ERROR = 0.5   # Deviation a detail level may add (device pixels)
+TINY_EXTENT = 3.0  # Strokes smaller than this on screen (device pixels) use their coarsest level
+RENDER_CHUNK = 8   # Strokes painted between deadline checks of ViewLayer.step()
+
+
+class StrokeRenderer:
+    """Paints strokes with as few pen changes and draw calls as possible.
+
+    Consecutive strokes with the same tool, colour and width share one pen
+    (paint order is kept, so overlaps stack exactly as drawn). Runs of
+    opaque pen strokes are sent as a single drawLines() call from a reused
+    point-pair buffer: with round caps this looks the same as round-joined
+    polylines and rasterizes faster. Highlighters and translucent pens keep
+    one polyline per stroke so their joins never stack alpha.
+    """
+
+    def __init__(self, highlighter_cap, highlighter_join):
+        self.highlighter_cap = highlighter_cap
+        self.highlighter_join = highlighter_join
+        self._pen = QPen()
+        self._pairs = []  # Point pairs of the current opaque run, reused between calls
+
+    def paint(self, painter, document, strokes, pixel_size=None):
+        """Paint strokes as polylines/line runs in image coordinates.
+
+        pixel_size is the size of one device pixel in image coordinates;
+        when given, each stroke is drawn at the coarsest detail level whose
+        error stays below LOD_ERROR device pixels.
+        """
+        pen = self._pen
+        pairs = self._pairs
+        key = None
+        batch = False
+        max_error = LOD_ERROR * pixel_size if pixel_size else 0.0
+        tiny = TINY_EXTENT * pixel_size if pixel_size else 0.0
+        for stroke in strokes:
+            if len(stroke) < 2:
+                continue
+            if not stroke.levels or not max_error or stroke.tool == TOOL_HIGHLIGHTER:
+                polygon = stroke.polygon()
+            elif stroke.max_x - stroke.min_x < tiny and stroke.max_y - stroke.min_y < tiny:
+                polygon = stroke.levels[-1].polygon()
+            else:
+                polygon = stroke.detail_polygon(max_error)
+            stroke_key = (stroke.tool, stroke.color_id, stroke.width)
+            if stroke_key != key:
+                self._flush(painter)
+                key = stroke_key
+                color = document.color(stroke)
+                pen.setColor(color)
+                pen.setWidthF(stroke.width)
+                if stroke.tool == TOOL_HIGHLIGHTER:
+                    pen.setCapStyle(self.highlighter_cap)
+                    pen.setJoinStyle(self.highlighter_join)
+                else:
+                    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+                    pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+                painter.setPen(pen)
+                batch = stroke.tool != TOOL_HIGHLIGHTER and color.alpha() == 255
+            if stroke.min_x == stroke.max_x and stroke.min_y == stroke.max_y:
+                # A tap: zero-length lines paint nothing, a point paints the pen's cap
+                self._flush(painter)
+                painter.drawPoint(QPointF(stroke.min_x, stroke.min_y))
+            elif batch:
+                points = list(polygon)
+                pairs.extend(chain.from_iterable(zip(points, islice(points, 1, None))))
+            else:
+                painter.drawPolyline(polygon)
+        self._flush(painter)
+
+    def _flush(self, painter):
+        if self._pairs:
+            painter.drawLines(self._pairs)
+            self._pairs.clear()
+
+
+class ViewLayer:
+    """Committed strokes rendered with the zoom view's transform at screen resolution.
+
+    Only valid for the transform it was rendered with; the zoom view falls
+    back to the magnified AnnotationLayer until it renders a new one. A
+    render is split into steps of a few milliseconds so a busy board never
+    blocks input; an edit in the middle starts it over.
+    """
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.image = None
+        self.transform = None  # Transform the image was rendered with (None: stale or in progress)
+        self._target = None    # Transform of the render in progress
+        self._pending = None   # Strokes still to render, in paint order
+        self._document = None
+
+    def invalidate(self, release=False):
+        self.transform = None
+        self._pending = None
+        if release:
+            self.image = None
+            self._document = None
+
+    def _fits(self, size, ratio):
+        image = self.image
+        return image is not None and image.devicePixelRatio() == ratio and \
+            image.deviceIndependentSize().toSize() == size
+
+    def matches(self, transform, size, ratio):
+        return self.transform is not None and self.transform == transform and self._fits(size, ratio)
+
+    def rendering(self, transform, size, ratio):
+        return self._pending is not None and self._target == transform and self._fits(size, ratio)
+
+    def _painter(self, transform):
+        painter = QPainter(self.image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setTransform(transform)
+        return painter
+
+    def _pixel_size(self, transform):
+        # Transforms are scale + translation only
+        return 1.0 / (transform.m11() * self.image.devicePixelRatio())
+
+    def begin(self, document, transform, size, ratio):
+        """Start rendering the strokes visible in a widget of size (logical) with transform"""
+        if not self._fits(size, ratio):
+            self.image = QImage(size * ratio, QImage.Format.Format_ARGB32_Premultiplied)
+            self.image.setDevicePixelRatio(ratio)
+        self.image.fill(Qt.GlobalColor.transparent)
+        self.transform = None
+        self._target = QTransform(transform)
+        self._document = document
+        # Off-screen strokes are never drawn
+        visible = transform.inverted()[0].mapRect(QRectF(0, 0, size.width(), size.height()))
+        self._pending = document.strokes_in(visible)
+        self._pending.reverse()  # Popped from the end
+
+    def step(self, budget):
+        """Render pending strokes for about budget seconds; True once the image is complete"""
+        if self._pending is None:
+            return self.transform is not None
+        pending = self._pending
+        painter = self._painter(self._target)
+        pixel_size = self._pixel_size(self._target)
+        deadline = time.perf_counter() + budget
+        while pending and time.perf_counter() < deadline:
+            chunk = [pending.pop() for _ in range(min(RENDER_CHUNK, len(pending)))]
+            self.renderer.paint(painter, self._document, chunk, pixel_size)
+        painter.end()
+        if pending:
+            return False
+        self.transform, self._pending = self._target, None
+        return True
+
+    def add(self, document, stroke):
+        if self._pending is not None:
+            self._pending = None  # Paint order would break; start over
+            return
+        if self.transform is None:
+            return
+        painter = self._painter(self.transform)
+        self.renderer.paint(painter, document, (stroke,), self._pixel_size(self.transform))
+        painter.end()
+
+    def repaint(self, document, rect):
+        """Same as AnnotationLayer.repaint, rect in image coordinates"""
+        if self._pending is not None:
+            self._pending = None
+            return
+        if self.transform is None:
+            return
+        screen = QRectF(self.transform.mapRect(rect).adjusted(-1, -1, 1, 1).toAlignedRect())
+        painter = self._painter(QTransform())
+        painter.setClipRect(screen)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(screen, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        painter.setTransform(self.transform)
+        self.renderer.paint(painter, document, document.strokes_in(self.transform.inverted()[0].mapRect(screen)),
+                            self._pixel_size(self.transform))
+        painter.end()
+
+
+class AnnotationLayer:
+    """Transparent ARGB image holding the committed strokes of a StrokeDocument.
+
+    The image is allocated on the first committed stroke, with the device
+    size and DPR of the capture, so painting it at the capture's logical
+    rect lines up pixel for pixel. view holds the screen resolution copy
+    used while zoomed in.
+    """
+
+    def __init__(self, highlighter_cap, highlighter_join):
+        self.renderer = StrokeRenderer(highlighter_cap, highlighter_join)
+        self.view = ViewLayer(self.renderer)
+        self.image = None
+        self._size = None
+        self._ratio = 1.0
+
+    def reset(self, capture=None):
+        """Drop all pixels; the next stroke allocates an image matching capture"""
+        self.image = None
+        self.view.invalidate(release=True)
+        if capture is not None:
+            self._size = capture.size()
+            self._ratio = capture.devicePixelRatio()
+
+    def _ensure_image(self):
+        if self.image is None and self._size is not None:
+            self.image = QImage(self._size, QImage.Format.Format_ARGB32_Premultiplied)
+            self.image.setDevicePixelRatio(self._ratio)
+            self.image.fill(Qt.GlobalColor.transparent)
+            logger.debug(f"Annotation layer allocated: {self._size.width()}x{self._size.height()}")
+        return self.image
+
+    def _painter(self):
+        painter = QPainter(self.image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        return painter
+
+    def add(self, document, stroke):
+        """Paint a committed stroke on top of the layer"""
+        if len(stroke) < 2 or self._ensure_image() is None:
+            return
+        painter = self._painter()
+        self.renderer.paint(painter, document, (stroke,), 1.0 / self._ratio)
+        painter.end()
+        self.view.add(document, stroke)
+
+    def repaint(self, document, rect):
+        """Clear rect (image coordinates) and repaint the strokes that overlap it"""
+        if self.image is None or rect.isEmpty():
+            return
+        # Whole pixels plus a margin so antialiased edges are redrawn too
+        rect = QRectF(rect.adjusted(-1, -1, 1, 1).toAlignedRect())
+        painter = self._painter()
+        painter.setClipRect(rect)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(rect, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        self.renderer.paint(painter, document, document.strokes_in(rect), 1.0 / self._ratio)
+        painter.end()
+        self.view.repaint(document, rect)
+
+
+class LiveStrokeLayer:
+    """Scratch image the stroke being drawn is rendered into incrementally.
+
+    Each motion event only strokes the newest segment together with the one
+    before it, so the join at the shared vertex is drawn as well. The
+    stroke is drawn opaque with Lighten composition, so redrawn pixels do
+    not change (one stroke = one colour; only antialiased edges gain a
+    little coverage). Its translucency is applied once when the scratch
+    image is blitted, so overlapping segments never stack alpha.
+    """
+
+    def __init__(self, highlighter_cap, highlighter_join):
+        self.highlighter_cap = highlighter_cap
+        self.highlighter_join = highlighter_join
+        self.image = None
+        self.stroke = None
+        self._size = None
+        self._ratio = 1.0
+        self._pen = QPen()
+        self._opacity = 1.0
+        self._drawn = 0              # Points of the stroke already rendered
+        self._dirty = QRectF()       # Area holding pixels of the last stroke
+
+    def reset(self, capture=None):
+        self.image = None
+        self.stroke = None
+        self._dirty = QRectF()
+        if capture is not None:
+            self._size = capture.size()
+            self._ratio = capture.devicePixelRatio()
+
+    def begin(self, document, stroke):
+        """Start rendering stroke; pixels of the previous stroke are cleared"""
+        self.stroke = stroke
+        self._drawn = 1
+        if self._size is None:
+            return
+        if self.image is None:
+            self.image = QImage(self._size, QImage.Format.Format_ARGB32_Premultiplied)
+            self.image.setDevicePixelRatio(self._ratio)
+            self.image.fill(Qt.GlobalColor.transparent)
+        elif not self._dirty.isEmpty():
+            painter = QPainter(self.image)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            painter.fillRect(self._dirty.adjusted(-1, -1, 1, 1).toAlignedRect(), Qt.GlobalColor.transparent)
+            painter.end()
+        self._dirty = QRectF()
+
+        color = document.color(stroke)
+        self._opacity = color.alphaF()
+        opaque = QColor(color)
+        opaque.setAlpha(255)
+        self._pen = QPen(opaque, stroke.width)
+        if stroke.tool == TOOL_HIGHLIGHTER:
+            self._pen.setCapStyle(self.highlighter_cap)
+            self._pen.setJoinStyle(self.highlighter_join)
+        else:
+            self._pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+
+    def extend(self):
+        """Render the points added since the last call; returns the updated area"""
+        stroke = self.stroke
+        count = len(stroke) if stroke is not None else 0
+        if self.image is None or count < 2 or count == self._drawn:
+            return QRectF()
+        first = max(0, self._drawn - 2)  # Redraw one old segment for the join
+        polygon = QPolygonF([QPointF(*stroke.point(i)) for i in range(first, count)])
+        self._drawn = count
+
+        painter = QPainter(self.image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Lighten)
+        painter.setPen(self._pen)
+        painter.drawPolyline(polygon)
+        painter.end()
+
+        # Miter joins can reach further than half the width; be generous
+        margin = stroke.width * 2
+        area = polygon.boundingRect().adjusted(-margin, -margin, margin, margin)
+        self._dirty = self._dirty.united(area)
+        return area
+
+    def end(self):
+        self.stroke = None
+
+    def paint(self, painter):
+        """Blit the live stroke area with the stroke's opacity"""
+        if self.stroke is None or self.image is None or self._dirty.isEmpty():
+            return
+        ratio = self._ratio
+        target = self._dirty.intersected(QRectF(0, 0, self._size.width() / ratio, self._size.height() / ratio))
+        source = QRectF(target.x() * ratio, target.y() * ratio, target.width() * ratio, target.height() * ratio)
+        painter.save()
+        painter.setOpacity(self._opacity)
+        painter.drawImage(target, self.image, source)
+        painter.restore()
@@ -1,31 +1,19 @@
-from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import Qt, QPoint, QRect
-from PyQt6.QtGui import QPainter, QColor
+from PyQt6.QtGui import QColor, QCursor
+from .effect_layer import EffectItem
 import logging
 
 logger = logging.getLogger(__name__)
 
-class CircleCursor(QWidget):
+class CircleCursor(EffectItem):
     """
-    원형 커서 위젯 - 마우스 포인터를 따라다니는 반투명 원형 커서
+    원형 커서 아이템 - 마우스 포인터를 따라다니는 반투명 원형 커서
+    (EffectCompositor 레이어에 그려짐)
     """
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        
-        # 기본 설정
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)  # 마우스 이벤트를 통과시킴
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool |
-            Qt.WindowType.WindowTransparentForInput  # 마우스 입력 투명 처리
-        )
-        
-        # 포커스 비활성화 (별도 설정)
-        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        
+
+    def __init__(self):
+        super().__init__()
+
         # 원형 커서 관련 변수
         self._size = 50  # 원형 커서 크기 (지름, 픽셀 단위)
         self._min_size = 0  # 최소 크기
@@ -33,31 +21,26 @@ class CircleCursor(QWidget):
         self._step = 5  # 크기 조절 단계
         self._opacity = 0.2  # 불투명도 (0.2 = 80% 투명)
         self._color = QColor(255, 20, 147, int(255 * self._opacity))  # 분홍색, 투명도 적용
-        
-        # 위젯 크기 설정 (충분히 크게 설정하여 전체 화면 커버)
-        desktop = self.screen().size()
-        self.setGeometry(0, 0, desktop.width(), desktop.height())
-        
-        # 마우스 트래킹 활성화
-        self.setMouseTracking(True)
-        
-        self.show()
-        logger.debug("CircleCursor initialized with click pass-through")
-    
+
+        # 현재 포인터 위치 (전역 논리 좌표)
+        self._pos = QCursor.pos()
+
+        logger.debug("CircleCursor initialized")
+
     @property
     def size(self):
         return self._size
-        
+
     @size.setter
     def size(self, value):
         """원형 커서 크기 설정"""
         self._size = max(self._min_size, min(self._max_size, value))
         self.update()
-        
+
     @property
     def color(self):
         return self._color
-        
+
     @color.setter
     def color(self, value):
         """원형 커서 색상 설정"""
@@ -68,39 +51,49 @@ class CircleCursor(QWidget):
         else:
             # 기본값 - 파란색, 기존 불투명도 적용
             self._color = QColor(0, 120, 215, int(255 * self._opacity))
-        
+
         # 즉시 화면 갱신
         self.update()
-    
-    def paintEvent(self, event):
-        """화면 그리기 이벤트"""
+
+    def _circle_rect(self):
+        return QRect(
+            self._pos.x() - self._size // 2,
+            self._pos.y() - self._size // 2,
+            self._size,
+            self._size
+        )
+
+    def bounding_rect(self):
+        """원형 커서가 차지하는 영역 (안티앨리어싱 여유 1px 포함)"""
+        if self._size <= 0:
+            return QRect()
+        return self._circle_rect().adjusted(-1, -1, 1, 1)
+
+    def paint(self, painter):
+        """원형 커서 그리기"""
         if self._size <= 0:
             return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # 원형 커서 그리기
         painter.setPen(Qt.PenStyle.NoPen)  # 테두리 없음
         painter.setBrush(self._color)  # 원 색상 및 투명도
-        
-        # 마우스 위치를 기준으로 원 그리기
-        pos = self.mapFromGlobal(self.cursor().pos())
-        circle_rect = QRect(
-            pos.x() - self._size // 2,
-            pos.y() - self._size // 2,
-            self._size,
-            self._size
-        )
-        painter.drawEllipse(circle_rect)
-    
+        painter.drawEllipse(self._circle_rect())
+
+    def update(self):
+        """변경된 영역만 다시 그리도록 요청"""
+        self.invalidate()
+
     def update_position(self, pos=None):
-        """마우스 위치에 따라 원형 커서 업데이트"""
-        # 항상 업데이트하여 마우스를 쫓아다니게 함
-        self.update()
-        # 로그 비활성화 (너무 많은 로그 출력 방지)
-        # logger.debug(f"Circle cursor position updated: {self.cursor().pos()}")
-    
+        """마우스 위치에 따라 원형 커서 업데이트
+
+        위치가 바뀐 경우에만 이전/새 원 영역을 무효화한다 (전체 화면 갱신 없음).
+        pos가 없을 때만 QCursor.pos()를 조회한다.
+        """
+        new_pos = QCursor.pos() if pos is None else pos
+        if new_pos == self._pos:
+            return
+        self._pos = QPoint(new_pos)
+        if self._visible and self._size > 0:
+            self.update()
+
     def increase_size(self):
         """원형 커서 크기 증가"""
         old_size = self._size
@@ -108,7 +101,7 @@ class CircleCursor(QWidget):
         if old_size != self._size:
             logger.debug(f"Circle cursor size increased to {self._size}px")
             self.update()
-    
+
     def decrease_size(self):
         """원형 커서 크기 감소"""
         old_size = self._size
@@ -116,17 +109,20 @@ class CircleCursor(QWidget):
         if old_size != self._size:
             logger.debug(f"Circle cursor size decreased to {self._size}px")
             self.update()
-    
+
     def show(self):
-        """원형 커서 표시 - 오버라이드하여 디버그 로그 추가"""
-        super().show()
+        """원형 커서 표시"""
+        self._visible = True
+        self.update_position()
+        self.update()
         logger.debug("CircleCursor.show() called explicitly")
-        
+
     def hide(self):
-        """원형 커서 숨김 - 오버라이드하여 디버그 로그 추가"""
-        super().hide()
+        """원형 커서 숨김"""
+        self._visible = False
+        self.update()
         logger.debug("CircleCursor.hide() called explicitly")
-        
+
     def toggle_visibility(self):
         """원형 커서 표시/숨김 토글"""
         if self.isVisible():
@@ -134,4 +130,4 @@ class CircleCursor(QWidget):
             logger.debug("Circle cursor hidden via toggle")
         else:
             self.show()
-            logger.debug("Circle cursor shown via toggle") 
+            logger.debug("Circle cursor shown via toggle")
@@ -1,195 +1,145 @@
-from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QPropertyAnimation, QPoint, QSize, QTimer, pyqtProperty, QEasingCurve
-from PyQt6.QtGui import QPainter, QColor, QPen
+from PyQt6.QtCore import QPoint, QRect, QEasingCurve
+from PyQt6.QtGui import QColor, QPen, QPainter
+from .effect_layer import EffectItem
+from .frame_clock import Animation
+from .sprite_cache import SpriteCache
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ClickEffectWidget(QWidget):
-    def __init__(self, parent=None, is_drag=False):
-        super().__init__(parent)
-        logger.debug("Initializing ClickEffectWidget")
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
-        
+RIPPLE_MIN_RADIUS = 10.0
+RIPPLE_MAX_RADIUS = 150.0
+RIPPLE_FRAMES = 32  # Pre-rendered radius steps
+RIPPLE_PEN_WIDTH = 2
+
+
+def _ripple_frame_index(radius):
+    span = RIPPLE_MAX_RADIUS - RIPPLE_MIN_RADIUS
+    t = (radius - RIPPLE_MIN_RADIUS) / span
+    return max(0, min(RIPPLE_FRAMES - 1, int(round(t * (RIPPLE_FRAMES - 1)))))
+
+
+def _render_ripple(color, radius, dpr):
+    """Render one ring frame (opacity is applied when blitting)"""
+    extent = radius * 2 + RIPPLE_PEN_WIDTH * 2
+    pixmap = SpriteCache.new_pixmap(extent, extent, dpr)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pen = QPen(color)
+    pen.setWidth(RIPPLE_PEN_WIDTH)
+    painter.setPen(pen)
+    painter.drawEllipse(
+        int(RIPPLE_PEN_WIDTH),
+        int(RIPPLE_PEN_WIDTH),
+        int(radius * 2),
+        int(radius * 2)
+    )
+    painter.end()
+    return pixmap
+
+
+def ripple_sprite(color, dpr, radius):
+    """Cached ring sprite for (colour, DPR, radius frame)"""
+    index = _ripple_frame_index(radius)
+    frame_radius = RIPPLE_MIN_RADIUS + (RIPPLE_MAX_RADIUS - RIPPLE_MIN_RADIUS) * index / (RIPPLE_FRAMES - 1)
+    key = ("ripple", color.rgba(), dpr, index)
+    return SpriteCache.instance().get(key, lambda: _render_ripple(color, frame_radius, dpr))
+
+class ClickEffectItem(EffectItem):
+    """Click ripple / drag ring drawn by the EffectCompositor"""
+
+    def __init__(self, is_drag=False):
+        super().__init__()
+        logger.debug("Initializing ClickEffectItem")
+
         # Set drag mode
         self.is_drag = is_drag
         self.is_complete = False
-        
+
         # Set animation properties
         self._size = 10
         self._opacity = 1.0
-        self._max_size = 150.0
+        self._max_size = RIPPLE_MAX_RADIUS
         self._half_size = self._max_size * 0.5
-        
+
         # Circle color (default: white)
         self._color = QColor(255, 255, 255)
-        
-        # Set initial widget size
-        self.setFixedSize(300, 300)
-        
-        # Configure animations
-        self.size_animation = QPropertyAnimation(self, b"circle_size")
-        self.opacity_animation = QPropertyAnimation(self, b"opacity")
-        
-        # Timer to remove widget after animation completes
-        self.cleanup_timer = QTimer(self)
-        self.cleanup_timer.setSingleShot(True)
-        self.cleanup_timer.timeout.connect(self.deleteLater)
-        
-        # Get device pixel ratio for high DPI displays
-        self.pixel_ratio = QApplication.primaryScreen().devicePixelRatio()
-        logger.debug(f"Device pixel ratio: {self.pixel_ratio}")
-        
-        logger.debug("ClickEffectWidget initialized")
-    
-    # Property for circle size
-    @pyqtProperty(float)
-    def circle_size(self):
-        return self._size
-    
-    @circle_size.setter
-    def circle_size(self, size):
-        self._size = size
-        self.update()  # Refresh widget
-    
-    # Property for opacity
-    @pyqtProperty(float)
-    def opacity(self):
-        return self._opacity
-    
-    @opacity.setter
-    def opacity(self, opacity):
-        self._opacity = opacity
-        self.update()  # Refresh widget
-    
-    # Property for color
-    @pyqtProperty(QColor)
+
+        # Ripple center (global logical coordinates)
+        self.center = QPoint(0, 0)
+
+        # Running animations
+        self.size_animation = None
+        self.opacity_animation = None
+
+    @property
     def color(self):
         return self._color
-    
+
     @color.setter
     def color(self, color):
         self._color = color
-        self.update()  # Refresh widget
-        
+        self.invalidate()
+
+    def bounding_rect(self):
+        # Pen width plus half a sprite frame step of margin
+        radius = int(self._size) + RIPPLE_PEN_WIDTH + 3
+        return QRect(self.center.x() - radius, self.center.y() - radius, radius * 2, radius * 2)
+
+    def is_animating(self):
+        return self.size_animation is not None and not self.finished
+
     def show_at(self, pos):
-        logger.debug(f"Showing effect at position: {pos}, pixel ratio: {self.pixel_ratio}")
-        # 화면 배율을 고려한 위치 조정
-        adjusted_pos = QPoint(
-            int(pos.x() / self.pixel_ratio),
-            int(pos.y() / self.pixel_ratio)
-        )
-        # 위젯 위치 설정 (중앙에 표시)
-        self.move(adjusted_pos.x() - self.width()//2, adjusted_pos.y() - self.height()//2)
-        
+        """Show the effect centered at pos (logical coordinates)"""
+        logger.debug(f"Showing effect at position: {pos}")
+        self.center = QPoint(pos)
+
         # Play full animation when not in drag mode
         if not self.is_drag:
-            self._start_full_animation()
+            self._start_animation(10.0, self._max_size, 1.0, 0.0, 400)
         else:
-            self._start_half_animation()
-    
-    def _start_full_animation(self):
-        # Configure size animation
-        self.size_animation.setDuration(400)
-        self.size_animation.setStartValue(10.0)
-        self.size_animation.setEndValue(self._max_size)
-        self.size_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Configure opacity animation
-        self.opacity_animation.setDuration(400)
-        self.opacity_animation.setStartValue(1.0)
-        self.opacity_animation.setEndValue(0.0)
-        self.opacity_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Start animations
-        self.show()
-        self.size_animation.start()
-        self.opacity_animation.start()
-        logger.debug("Full effect animations started")
-        
-        # Remove widget after animation completes
-        self.cleanup_timer.start(450)
-    
-    def _start_half_animation(self):
-        # Configure size animation for half progress
-        self.size_animation.setDuration(200)
-        self.size_animation.setStartValue(10.0)
-        self.size_animation.setEndValue(self._half_size)
-        self.size_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Configure opacity animation for half progress
-        self.opacity_animation.setDuration(200)
-        self.opacity_animation.setStartValue(1.0)
-        self.opacity_animation.setEndValue(0.5)
-        self.opacity_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Start animations
-        self.show()
-        self.size_animation.start()
-        self.opacity_animation.start()
-        logger.debug("Half effect animations started")
-    
+            self._start_animation(10.0, self._half_size, 1.0, 0.5, 200)
+
+    def _start_animation(self, size_from, size_to, opacity_from, opacity_to, duration):
+        self.size_animation = Animation([(0.0, size_from), (1.0, size_to)], duration, QEasingCurve.Type.OutCubic)
+        self.opacity_animation = Animation([(0.0, opacity_from), (1.0, opacity_to)], duration, QEasingCurve.Type.OutCubic)
+        self._size = size_from
+        self._opacity = opacity_from
+        self.invalidate()
+
+    def advance(self, now):
+        if self.size_animation is None:
+            return False
+        self._size = self.size_animation.value(now)
+        self._opacity = self.opacity_animation.value(now)
+        if self.size_animation.is_finished(now):
+            self.size_animation = None
+            self.opacity_animation = None
+            # Drag rings wait at half progress until the drag completes
+            if not self.is_drag or self.is_complete:
+                self.finished = True
+        return True
+
     def update_position(self, pos):
         """Update position during drag"""
-        if self.is_drag and not self.is_complete:
-            # 화면 배율을 고려한 위치 조정
-            adjusted_pos = QPoint(
-                int(pos.x() / self.pixel_ratio),
-                int(pos.y() / self.pixel_ratio)
-            )
-            self.move(adjusted_pos.x() - self.width()//2, adjusted_pos.y() - self.height()//2)
-    
+        if self.is_drag and not self.is_complete and pos != self.center:
+            self.center = QPoint(pos)
+            self.invalidate()
+
     def complete_animation(self, pos):
         """Run remaining animation when drag completes"""
         if self.is_drag and not self.is_complete:
             self.is_complete = True
-            # 화면 배율을 고려한 위치 조정
-            adjusted_pos = QPoint(
-                int(pos.x() / self.pixel_ratio),
-                int(pos.y() / self.pixel_ratio)
-            )
-            self.move(adjusted_pos.x() - self.width()//2, adjusted_pos.y() - self.height()//2)
-            
+            self.center = QPoint(pos)
+
             # Run the second half of the animation
-            self.size_animation.setDuration(200)
-            self.size_animation.setStartValue(self._half_size)
-            self.size_animation.setEndValue(self._max_size)
-            self.size_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-            
-            self.opacity_animation.setDuration(200)
-            self.opacity_animation.setStartValue(0.5)
-            self.opacity_animation.setEndValue(0.0)
-            self.opacity_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-            
-            self.size_animation.start()
-            self.opacity_animation.start()
+            self._start_animation(self._half_size, self._max_size, 0.5, 0.0, 200)
             logger.debug("Completing drag animation")
-            
-            # Remove widget after animation completes
-            self.cleanup_timer.start(250)
-        
-    def paintEvent(self, event):
-        # Excessive logging removed
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw circle with the configured color
-        pen = QPen(self._color)
-        pen.setWidth(2)
-        painter.setPen(pen)
+
+    def paint(self, painter):
+        # Blit the pre-rendered ring frame closest to the current radius
+        dpr = painter.device().devicePixelRatio()
+        sprite = ripple_sprite(self._color, dpr, self._size)
+        half = sprite.width() / dpr / 2
         painter.setOpacity(self._opacity)
-        
-        # Calculate circle center and radius
-        center_x = self.width() / 2
-        center_y = self.height() / 2
-        radius = self._size
-        
-        # Draw circle (starting from center)
-        painter.drawEllipse(
-            int(center_x - radius), 
-            int(center_y - radius), 
-            int(radius * 2), 
-            int(radius * 2)
-        )
+        painter.drawPixmap(int(self.center.x() - half), int(self.center.y() - half), sprite)
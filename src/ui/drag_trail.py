@@ -0,0 +1,97 @@
+from PyQt6.QtCore import Qt, QPointF, QRectF, QEasingCurve
+from PyQt6.QtGui import QColor, QPen, QPainterPath
+from .effect_layer import EffectItem
+from .frame_clock import Animation
+from .polyline import DecimatingPolyline, simplify_rdp
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRAIL_MIN_DISTANCE = 4.0   # Online decimation threshold (px)
+TRAIL_RDP_TOLERANCE = 1.5  # Simplification tolerance on completion (px)
+TRAIL_WIDTH = 3
+TRAIL_OPACITY = 0.8
+TRAIL_FADE_DURATION = 600  # ms
+
+
+class DragTrailItem(EffectItem):
+    """Fading path that follows a drag so the audience can see its route"""
+
+    def __init__(self, pos, color=None):
+        super().__init__()
+        self.color = QColor(color) if color is not None else QColor(255, 255, 255)
+        self._opacity = TRAIL_OPACITY
+        self.fade_animation = None
+
+        # Decimated path + the live pointer position after the last kept point
+        self.polyline = DecimatingPolyline(TRAIL_MIN_DISTANCE)
+        self.polyline.append(float(pos.x()), float(pos.y()))
+        self.path = QPainterPath(QPointF(pos))
+        self._tail = QPointF(pos)
+        self._bounds = QRectF(QPointF(pos), QPointF(pos))
+
+    def _margin_rect(self, rect):
+        margin = TRAIL_WIDTH + 1
+        return rect.toAlignedRect().adjusted(-margin, -margin, margin, margin)
+
+    def bounding_rect(self):
+        return self._margin_rect(self._bounds)
+
+    def is_animating(self):
+        return self.fade_animation is not None and not self.finished
+
+    def add_point(self, pos):
+        """Record a drag position - O(1) per motion event"""
+        if self.fade_animation is not None:
+            return
+        x, y = float(pos.x()), float(pos.y())
+        last_x, last_y = self.polyline.last()
+        old_tail = self._tail
+        self._tail = QPointF(x, y)
+        if self.polyline.append(x, y):
+            self.path.lineTo(self._tail)
+        self._bounds = self._bounds.united(QRectF(self._tail, self._tail))
+
+        # Only the segment from the last kept point to the pointer changed
+        changed = QRectF(QPointF(last_x, last_y), old_tail).normalized()
+        changed = changed.united(QRectF(QPointF(last_x, last_y), self._tail).normalized())
+        self.invalidate(self._margin_rect(changed))
+
+    def complete(self):
+        """Simplify the recorded path and fade it out"""
+        if len(self.polyline) < 2:
+            self.finished = True
+            self.invalidate()
+            return
+
+        xy = simplify_rdp(self.polyline.xy(), TRAIL_RDP_TOLERANCE)
+        logger.debug(f"Drag trail simplified from {len(self.polyline)} to {len(xy)} points")
+        points = xy.tolist()
+        path = QPainterPath(QPointF(*points[0]))
+        for x, y in points[1:]:
+            path.lineTo(x, y)
+        self.path = path
+        self._tail = None
+
+        self.fade_animation = Animation([(0.0, TRAIL_OPACITY), (1.0, 0.0)], TRAIL_FADE_DURATION, QEasingCurve.Type.InQuad)
+        self.invalidate()
+
+    def advance(self, now):
+        if self.fade_animation is None:
+            return False
+        self._opacity = self.fade_animation.value(now)
+        if self.fade_animation.is_finished(now):
+            self.fade_animation = None
+            self.finished = True
+        return True
+
+    def paint(self, painter):
+        pen = QPen(self.color, TRAIL_WIDTH)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setOpacity(self._opacity)
+        painter.drawPath(self.path)
+        if self._tail is not None:
+            painter.drawLine(self.path.currentPosition(), self._tail)
@@ -0,0 +1,230 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QObject, QRect
+from PyQt6.QtGui import QPainter, QRegion
+from .frame_clock import FrameClock
+from .screen_topology import ScreenTopology
+import logging
+
+logger = logging.getLogger(__name__)
+
+class EffectItem:
+    """Lightweight effect drawn by the compositor (not a window).
+
+    Items live in global logical coordinates. Subclasses override
+    bounding_rect(), paint() and, for animated items, advance().
+    """
+
+    def __init__(self):
+        self.compositor = None
+        self.finished = False
+        self._visible = True
+        self._painted_rect = QRect()  # Rect as of the last flush (for damage tracking)
+        self._partial_damage = None  # Sub-rect to repaint instead of old/new rects
+
+    def bounding_rect(self):
+        """Area covered by the item in global logical coordinates"""
+        return QRect()
+
+    def is_animating(self):
+        return False
+
+    def advance(self, now):
+        """Advance animation state. Return True when the item needs repainting."""
+        return False
+
+    def paint(self, painter):
+        pass
+
+    def isVisible(self):
+        return self._visible
+
+    def invalidate(self, rect=None):
+        """Request a repaint of the item's old and new area (or only rect)"""
+        if self.compositor:
+            self.compositor.mark_dirty(self, rect)
+
+
+class EffectLayer(QWidget):
+    """Input-transparent translucent window covering one screen.
+
+    The layer does not own items; it paints whatever part of the
+    compositor's scene intersects its screen, limited to the damaged region.
+    """
+
+    def __init__(self, compositor, screen):
+        super().__init__()
+        self.compositor = compositor
+        self.screen_ref = screen
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating, True)
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowTransparentForInput
+        )
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setGeometry(screen.geometry())
+        self._damage = QRegion()
+        self.show()
+        # Keep the window on its own screen (uses that screen's DPR)
+        if self.windowHandle():
+            self.windowHandle().setScreen(screen)
+
+    def add_damage(self, rect):
+        """Accumulate a damaged rect (global coordinates) for the next flush"""
+        local = rect.intersected(self.geometry()).translated(-self.x(), -self.y())
+        if not local.isEmpty():
+            self._damage = self._damage.united(local)
+
+    def flush(self):
+        """Repaint only the accumulated damage"""
+        if self._damage.isEmpty():
+            return
+        self.update(self._damage)
+        self._damage = QRegion()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipRegion(event.region())
+
+        # Items are positioned in global coordinates
+        origin = self.pos()
+        dirty = event.region().translated(origin)
+        painter.translate(-origin.x(), -origin.y())
+
+        for item in self.compositor.items:
+            if item.isVisible() and dirty.intersects(item._painted_rect):
+                painter.save()
+                item.paint(painter)
+                painter.restore()
+
+
+class EffectCompositor(QObject):
+    """Owns the effect scene and one EffectLayer per screen.
+
+    Click ripples, drag rings, scroll indicators and the circle cursor are all
+    items of a single scene, painted in one pass per layer with damage tracking.
+    Layers are created lazily the first time something is drawn on a screen
+    and torn down when the screen is removed.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self._dirty = []
+        self.layers = {}  # QScreen -> EffectLayer
+
+        # Shared frame clock - ticks only while an item is animating
+        self.clock = FrameClock.instance()
+
+        # Cached screen geometry/DPR (updated on hot-plug and screen changes)
+        self.topology = ScreenTopology.instance()
+        self.topology.screen_removed.connect(self._on_screen_removed)
+        self.topology.changed.connect(self._on_topology_changed)
+
+        logger.debug("EffectCompositor initialized")
+
+    def map_from_listener(self, x, y):
+        """Convert input listener coordinates (device pixels) to logical coordinates"""
+        return self.topology.map_from_native(x, y)
+
+    def _layer_for(self, screen):
+        """Get or lazily create the layer of a screen"""
+        layer = self.layers.get(screen)
+        if layer is None:
+            layer = EffectLayer(self, screen)
+            self.layers[screen] = layer
+            logger.debug(f"Effect layer created for screen {screen.name()} "
+                         f"({screen.geometry().width()}x{screen.geometry().height()} @ {screen.devicePixelRatio()}x)")
+        return layer
+
+    def _on_screen_removed(self, screen):
+        layer = self.layers.pop(screen, None)
+        if layer is not None:
+            layer.close()
+            layer.deleteLater()
+            logger.debug(f"Effect layer removed with screen {screen.name()}")
+
+    def _on_topology_changed(self):
+        for screen, layer in self.layers.items():
+            info = self.topology.info_for(screen)
+            if info is not None and layer.geometry() != info.geometry:
+                layer.setGeometry(info.geometry)
+                logger.debug(f"Effect layer moved with screen {info.name}")
+
+    def _add_damage(self, rect):
+        """Route a damaged rect to the layers of the screens it touches"""
+        for info in self.topology.screens():
+            if info.geometry.intersects(rect):
+                self._layer_for(info.screen).add_damage(rect)
+
+    def add_item(self, item):
+        item.compositor = self
+        self.items.append(item)
+        self.mark_dirty(item)
+        return item
+
+    def remove_item(self, item):
+        if item in self.items:
+            item.finished = True
+            self.mark_dirty(item)
+
+    def mark_dirty(self, item, rect=None):
+        if item not in self._dirty:
+            self._dirty.append(item)
+            item._partial_damage = rect
+        elif item._partial_damage is not None:
+            item._partial_damage = None if rect is None else item._partial_damage.united(rect)
+        # Invalidations are coalesced into one flush per frame
+        if item.is_animating():
+            self.clock.add_surface(self)
+        else:
+            self.clock.request_frame(self)
+
+    def advance_frame(self, now):
+        """FrameClock callback: advance items and repaint each layer once"""
+        animating = False
+        for item in self.items:
+            if item.advance(now) or item.finished:
+                if item not in self._dirty:
+                    self._dirty.append(item)
+                item._partial_damage = None
+            animating = animating or item.is_animating()
+        self.flush()
+        return animating
+
+    def flush(self):
+        """Push the old and new rects of changed items to the layers"""
+        if not self._dirty:
+            return
+        for item in self._dirty:
+            new_rect = QRect() if item.finished or not item.isVisible() else item.bounding_rect()
+            if item._partial_damage is not None and not new_rect.isEmpty():
+                # Only part of the item changed (e.g. a new trail segment)
+                damage = [item._partial_damage]
+            elif item._painted_rect.intersects(new_rect):
+                damage = [item._painted_rect.united(new_rect)]
+            else:
+                # Disjoint old/new rects (e.g. a fast cursor move) stay separate
+                damage = [item._painted_rect, new_rect]
+            item._painted_rect = new_rect
+            item._partial_damage = None
+            for rect in damage:
+                if not rect.isEmpty():
+                    self._add_damage(rect)
+        self._dirty = []
+        self.items = [item for item in self.items if not item.finished]
+        for layer in self.layers.values():
+            layer.flush()
+
+    def close_all(self):
+        """Tear down all layers (application exit)"""
+        self.items = []
+        self._dirty = []
+        for layer in self.layers.values():
+            layer.close()
+            layer.deleteLater()
+        self.layers = {}
@@ -0,0 +1,194 @@
+from PyQt6.QtCore import Qt, QObject, QTimer, QEasingCurve, QSettings
+from .screen_topology import ScreenTopology
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+EASING_TABLE_SIZE = 256
+
+# Shared easing lookup tables, one per QEasingCurve type
+_easing_tables = {}
+
+
+def eased(easing_type, progress):
+    """Eased progress from a shared precomputed table (linear interpolation)"""
+    table = _easing_tables.get(easing_type)
+    if table is None:
+        curve = QEasingCurve(easing_type)
+        table = [curve.valueForProgress(i / (EASING_TABLE_SIZE - 1)) for i in range(EASING_TABLE_SIZE)]
+        _easing_tables[easing_type] = table
+    if progress <= 0.0:
+        return table[0]
+    if progress >= 1.0:
+        return table[-1]
+    pos = progress * (EASING_TABLE_SIZE - 1)
+    index = int(pos)
+    frac = pos - index
+    return table[index] + (table[index + 1] - table[index]) * frac
+
+
+class Animation:
+    """Keyframe animation advanced by the FrameClock.
+
+    Mirrors QPropertyAnimation semantics: the easing curve is applied to the
+    overall progress, then the value is interpolated linearly between keyframes.
+    Effect items poll value(now) from their compositor; other users register
+    the animation with FrameClock.animate() and get on_update/on_finished calls.
+    """
+
+    def __init__(self, keyframes, duration, easing=QEasingCurve.Type.OutCubic,
+                 on_update=None, on_finished=None):
+        self.keyframes = sorted(keyframes)  # [(progress, value), ...]
+        self.duration = duration / 1000.0
+        self.easing = easing
+        self.on_update = on_update
+        self.on_finished = on_finished
+        self.start_time = time.monotonic()
+
+    def is_finished(self, now):
+        return now - self.start_time >= self.duration
+
+    def value(self, now):
+        if self.duration <= 0:
+            return self.keyframes[-1][1]
+        progress = min(1.0, max(0.0, (now - self.start_time) / self.duration))
+        progress = eased(self.easing, progress)
+        prev_t, prev_v = self.keyframes[0]
+        for t, v in self.keyframes[1:]:
+            if progress <= t:
+                span = t - prev_t
+                if span <= 0:
+                    return v
+                return prev_v + (v - prev_v) * (progress - prev_t) / span
+            prev_t, prev_v = t, v
+        return self.keyframes[-1][1]
+
+    def step(self, now):
+        """Push the current value to on_update. Return False once finished."""
+        if self.on_update:
+            self.on_update(self.value(now))
+        if self.is_finished(now):
+            if self.on_finished:
+                self.on_finished()
+            return False
+        return True
+
+
+class FrameClock(QObject):
+    """Central clock driving every animation in the app.
+
+    Ticks at the display refresh rate (capped by animation/max_fps) only while
+    something is animating. Each tick advances all registered animations, then
+    lets every surface flush its accumulated damage once.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = FrameClock()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._animations = []
+        self._surfaces = []  # Objects with advance_frame(now) -> bool (still animating)
+        self._pending = []   # Surfaces that requested a single frame
+        self._after_frame = []
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.apply_settings()
+        # Follow refresh rate changes (e.g. a 60 Hz projector plugged in)
+        ScreenTopology.instance().changed.connect(self.apply_settings)
+
+        logger.debug(f"FrameClock initialized ({self.timer.interval()} ms per frame)")
+
+    def apply_settings(self):
+        """Recompute the frame interval from the refresh rate and the global FPS cap"""
+        refresh = ScreenTopology.instance().max_refresh_rate()
+        max_fps = QSettings().value("animation/max_fps", 0, int)
+        fps = min(refresh, max_fps) if max_fps > 0 else refresh
+        self.timer.setInterval(max(1, int(round(1000.0 / fps))))
+
+    def animate(self, animation):
+        """Register an animation; it is stepped every frame until finished"""
+        animation.start_time = time.monotonic()
+        if animation not in self._animations:
+            self._animations.append(animation)
+        self._ensure_running()
+        return animation
+
+    def stop(self, animation):
+        if animation in self._animations:
+            self._animations.remove(animation)
+
+    def is_running(self, animation):
+        return animation in self._animations
+
+    def add_surface(self, surface):
+        """Keep ticking surface.advance_frame(now) while it reports activity"""
+        if surface not in self._surfaces:
+            self._surfaces.append(surface)
+        self._ensure_running()
+
+    def request_frame(self, surface):
+        """Ask for one advance_frame() call at the next frame.
+
+        When the clock is idle the frame runs on the next event loop iteration,
+        so pointer-driven repaints are not delayed; otherwise it is coalesced
+        into the running tick.
+        """
+        if surface not in self._pending and surface not in self._surfaces:
+            self._pending.append(surface)
+        if not self.timer.isActive():
+            self.timer.start(0)
+
+    def call_after_frame(self, callback):
+        """Run callback once the next frame has been issued"""
+        self._after_frame.append(callback)
+        if not self.timer.isActive():
+            self.timer.start(0)
+
+    def time_to_next_frame(self):
+        """Seconds until the next tick (0 when idle - the next frame runs immediately)"""
+        if not self.timer.isActive():
+            return 0.0
+        return max(0, self.timer.remainingTime()) / 1000.0
+
+    def _ensure_running(self):
+        if not self.timer.isActive() or self.timer.interval() == 0:
+            self.apply_settings()
+            self.timer.start()
+
+    def _tick(self):
+        now = time.monotonic()
+
+        # 1) Property-style animations
+        self._animations = [anim for anim in self._animations if anim.step(now)]
+
+        # 2) One flush per surface per frame
+        pending, self._pending = self._pending, []
+        active = []
+        for surface in self._surfaces:
+            if surface.advance_frame(now):
+                active.append(surface)
+        for surface in pending:
+            if surface.advance_frame(now) and surface not in active:
+                active.append(surface)
+        self._surfaces = active
+
+        after, self._after_frame = self._after_frame, []
+        for callback in after:
+            callback()
+
+        if self._animations or self._surfaces or self._pending or self._after_frame:
+            if self.timer.interval() == 0:
+                self.apply_settings()
+            if not self.timer.isActive():
+                self.timer.start()
+        else:
+            self.timer.stop()
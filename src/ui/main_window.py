@@ -1,12 +1,19 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QMenu, QSystemTrayIcon, QDialog, QMessageBox
-from PyQt6.QtCore import Qt, QPoint, QSettings, QTimer
-from PyQt6.QtGui import QColor, QKeyEvent, QIcon, QPen
+from PyQt6.QtCore import Qt, QSettings, QTimer
+from PyQt6.QtGui import QColor, QKeyEvent, QIcon, QPen, QCursor
 from src.input.input_listener import InputListener
 from src.ui.overlay_widget import OverlayWidget
-from src.ui.click_effect import ClickEffectWidget
-from src.ui.scroll_effect import ScrollEffectWidget
+from src.ui.effect_layer import EffectCompositor
+from src.ui.frame_clock import FrameClock
+from src.ui.click_effect import ClickEffectItem
+from src.ui.scroll_effect import ScrollEffectItem
+from src.ui.drag_trail import DragTrailItem
 from src.ui.zoom_view import ZoomView
 from src.ui.circle_cursor import CircleCursor
+from src.ui.pointer_predictor import PointerPredictor
+from src.ui.screen_topology import ScreenTopology
+from src.capture.screen_capture import ScreenCapturer
+import time
 import logging
 from PyQt6.QtWidgets import QApplication
 
@@ -23,12 +30,25 @@ class MainWindow(QMainWindow):
         
         # Drag effect related variables
         self.drag_effects = {}  # Store effects by button type (left, right)
+        self.drag_trails = {}  # Drag path trails by button type
+        self.scroll_effect = None  # Live scroll indicator of the current gesture
         
         # Initialize zoom view (not displayed yet)
-        self.zoom_view = None
+        self.zoom_view = None  # Zoom view under the pointer (has focus)
+        self.zoom_views = []  # All zoom views of the session (one per screen in "all" mode)
+        self.zoom_view_pool = []  # Long-lived hidden views, reused by every session
+        self._zoom_ready_count = 0
+        self._zoom_activation_time = None
+        self._closing_zoom_views = False
+        
+        # Single compositor for all transient effects (one layer per screen)
+        self.effect_compositor = EffectCompositor(self)
         
         # Initialize circular cursor
-        self.circle_cursor = CircleCursor()
+        self.circle_cursor = self.effect_compositor.add_item(CircleCursor())
+        
+        # Optional motion prediction for the cursor and drag rings (cursor/prediction_ms)
+        self.pointer_predictor = PointerPredictor(clock=FrameClock.instance())
         
         # Variables to save original circular cursor properties
         self.original_circle_cursor_size = self.circle_cursor.size
@@ -61,6 +81,7 @@ class MainWindow(QMainWindow):
         
         # Connect zoom view activation signal
         self.input_listener.activate_zoom.connect(self.activate_zoom_view)
+        self.input_listener.activate_zoom_mode.connect(self.activate_zoom_view)
         
         # Connect circular cursor toggle signal
         self.input_listener.toggle_circle_cursor.connect(self.toggle_circle_cursor)
@@ -85,6 +106,9 @@ class MainWindow(QMainWindow):
         # Hide window (minimize to system tray)
         self.hide()
         self.load_settings()
+        
+        # Build the first zoom view once the event loop is idle, so Ctrl+1 only shows it
+        QTimer.singleShot(0, self._prewarm_zoom_view)
         logger.info("Main window initialized")
         
     def setup_tray_icon(self):
@@ -154,8 +178,8 @@ class MainWindow(QMainWindow):
     def cleanup(self):
         """Clean up resources on application exit"""
         # Add resource cleanup code if needed
-        if self.circle_cursor:
-            self.circle_cursor.deleteLater()
+        if self.effect_compositor:
+            self.effect_compositor.close_all()
         
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
@@ -174,51 +198,71 @@ class MainWindow(QMainWindow):
         if not self.click_effect_enabled:
             return
         logger.debug(f"Creating click effect at ({x}, {y})")
-        effect = ClickEffectWidget()
+        effect = self.effect_compositor.add_item(ClickEffectItem())
         # 설정된 색상 적용
         effect.color = QSettings().value("click_effect/color", QColor(255,0,0), type=QColor)
-        effect.show_at(QPoint(x, y))
+        effect.show_at(self.effect_compositor.map_from_listener(x, y))
         logger.debug("Click effect created and shown")
         
     def show_scroll_effect(self, x, y, direction):
         """Display scroll effect."""
         if not self.scroll_effect_enabled:
             return
+        pos = self.effect_compositor.map_from_listener(x, y)
+        # Update the live indicator of the current gesture in place
+        if self.scroll_effect is not None and self.scroll_effect.accepts(pos):
+            self.scroll_effect.add_notch(direction)
+            return
         logger.debug(f"Creating scroll effect at ({x}, {y}), direction: {direction}")
-        effect = ScrollEffectWidget(direction=direction)
-        effect.show_at(QPoint(x, y))
+        self.scroll_effect = self.effect_compositor.add_item(ScrollEffectItem(direction=direction))
+        self.scroll_effect.show_at(pos)
         logger.debug("Scroll effect created and shown")
         
     def on_mouse_down(self, x, y, button_type):
         if not self.click_effect_enabled:
             return
         logger.debug(f"Mouse {button_type} down at ({x}, {y})")
-        # Start drag - create drag effect
-        self.drag_effects[button_type] = ClickEffectWidget(is_drag=True)
+        pos = self.effect_compositor.map_from_listener(x, y)
         # 설정된 색상 적용
-        self.drag_effects[button_type].color = QSettings().value("click_effect/color", QColor(255,0,0), type=QColor)
-        self.drag_effects[button_type].show_at(QPoint(x, y))
+        color = QSettings().value("click_effect/color", QColor(255,0,0), type=QColor)
+        # Start drag - create drag effect
+        self.drag_effects[button_type] = self.effect_compositor.add_item(ClickEffectItem(is_drag=True))
+        self.drag_effects[button_type].color = color
+        self.drag_effects[button_type].show_at(pos)
+        # Record the drag path
+        self.drag_trails[button_type] = self.effect_compositor.add_item(DragTrailItem(pos, color))
         logger.debug(f"Drag effect for {button_type} created and shown")
         
     def on_mouse_move(self, x, y):
-        # During drag - update effect position
+        pos = self.effect_compositor.map_from_listener(x, y)
+        # Extrapolated to the next frame's display time (same as pos when prediction is off)
+        predicted = self.pointer_predictor.add_sample(pos)
+        
+        # During drag - update effect position and trail
         for effect in self.drag_effects.values():
             if effect:
-                effect.update_position(QPoint(x, y))
+                effect.update_position(predicted)
+        for trail in self.drag_trails.values():
+            if trail:
+                # The trail records the real route, not the prediction
+                trail.add_point(pos)
         
         # Update circular cursor position - always perform
         if self.circle_cursor and self.circle_cursor.isVisible():
-            # Update with actual mouse position instead of QPoint
-            self.circle_cursor.update_position()
-            # Excessive logging removed
+            # Use the listener position; only the old and new circle rects are repainted
+            self.circle_cursor.update_position(predicted)
         
     def on_mouse_up(self, x, y, button_type):
         logger.debug(f"Mouse {button_type} up at ({x}, {y})")
         # End drag - complete effect
         if button_type in self.drag_effects and self.drag_effects[button_type]:
-            self.drag_effects[button_type].complete_animation(QPoint(x, y))
-            self.drag_effects[button_type] = None
+            self.drag_effects[button_type].complete_animation(self.effect_compositor.map_from_listener(x, y))
+            del self.drag_effects[button_type]
             logger.debug(f"Drag effect for {button_type} completed")
+        trail = self.drag_trails.pop(button_type, None)
+        if trail:
+            trail.add_point(self.effect_compositor.map_from_listener(x, y))
+            trail.complete()
     
     def handle_input(self, key_combo):
         """Handle key input."""
@@ -269,9 +313,9 @@ class MainWindow(QMainWindow):
         if self.circle_cursor:
             self.circle_cursor.decrease_size()
             
-    def activate_zoom_view(self):
-        """Activate zoom view."""
-        logger.debug("Activating zoom view")
+    def activate_zoom_view(self, mode=None):
+        """Activate zoom view (mode: screen / window / region / all, None = capture/mode setting)."""
+        logger.debug(f"Activating zoom view ({mode or 'default'} capture)")
         
         # Ignore if already active
         if self.zoom_view is not None and self.zoom_view.isVisible():
@@ -279,6 +323,8 @@ class MainWindow(QMainWindow):
             return
         
         try:
+            self._zoom_activation_time = time.perf_counter()
+            
             # 자막 상태 저장 및 비활성화
             self.original_subtitle_visible = self.overlay.subtitle_visible
             self.overlay.set_visibility(False)
@@ -291,36 +337,32 @@ class MainWindow(QMainWindow):
             else:
                 self.click_effect_state_before_zoom = False
             
-            # Create zoom view
-            self.zoom_view = ZoomView()
-            self.zoom_view.main_window_overlay = self.overlay
+            if mode is None:
+                mode = QSettings().value("capture/mode", "screen", str)
             
-            # Transfer current circular cursor settings
+            # "all": one zoom view per screen, captured in parallel by the native backends.
+            # The view under the pointer is activated last so it keeps the focus.
+            topology = ScreenTopology.instance()
+            if mode == "all":
+                focus_screen = topology.screen_under_cursor(QCursor.pos()).screen
+                screens = [info.screen for info in topology.screens() if info.screen is not focus_screen]
+                screens.append(focus_screen)
+            else:
+                screens = [None]
+            
+            # Circle cursor state before any view hides it for capture
+            cursor_was_visible = bool(self.circle_cursor and self.circle_cursor.isVisible())
             if self.circle_cursor:
-                # Save current circular cursor size and color
                 self.original_circle_cursor_size = self.circle_cursor.size
                 self.original_circle_cursor_color = self.circle_cursor.color
-                
-                # Transfer circular cursor size and color
-                self.zoom_view.circle_cursor_size = self.circle_cursor.size
-                self.zoom_view.circle_cursor_color = self.circle_cursor.color
-                
-                # Remember current circular cursor visibility state
-                cursor_was_visible = self.circle_cursor.isVisible()
-                self.zoom_view.circle_cursor_was_visible = cursor_was_visible
-                
-                # Only transfer if circular cursor is not visible
-                if not cursor_was_visible:
-                    self.zoom_view.circle_cursor_size = 0
-                    
-                # Directly pass circular cursor object to ZoomView
-                self.zoom_view.main_window_circle_cursor = self.circle_cursor
             
-            # 성능 개선: 신호 연결 전에 모든 설정 완료
-            self.zoom_view.closed.connect(self.on_zoom_view_closed)
-            
-            # 화면 활성화 - 다른 작업은 내부에서 지연 처리됨
-            self.zoom_view.activate()
+            self.zoom_views = []
+            self._zoom_ready_count = 0
+            for index, screen in enumerate(screens):
+                self.zoom_view = self._acquire_zoom_view(index, cursor_was_visible)
+                self.zoom_views.append(self.zoom_view)
+                # 화면 활성화 - 캡처는 워커 스레드에서 비동기로 수행됨
+                self.zoom_view.activate(mode, screen, requested_at=self._zoom_activation_time)
             
             # 원래 커서 숨기기 - 작업이 준비된 후에 실행
             QTimer.singleShot(200, self._hide_cursor_after_zoom_active)
@@ -332,9 +374,56 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'zoom_view') and self.zoom_view:
                 try:
                     self.zoom_view = None
+                    self.zoom_views = []
                 except:
                     pass
 
+    def _prewarm_zoom_view(self):
+        """Create the first pooled zoom view ahead of the first hotkey"""
+        if not self.zoom_view_pool:
+            self._pooled_zoom_view(0).prewarm()
+
+    def _pooled_zoom_view(self, index):
+        """Return the index-th long-lived zoom view, creating it on first use"""
+        while len(self.zoom_view_pool) <= index:
+            zoom_view = ZoomView()
+            zoom_view.main_window_overlay = self.overlay
+            # 성능 개선: 신호는 생성 시 한 번만 연결
+            zoom_view.closed.connect(self.on_zoom_view_closed)
+            zoom_view.capture_ready.connect(self._on_zoom_capture_ready)
+            self.zoom_view_pool.append(zoom_view)
+            logger.debug(f"Zoom view {len(self.zoom_view_pool)} created")
+        return self.zoom_view_pool[index]
+
+    def _acquire_zoom_view(self, index, cursor_was_visible):
+        """Reuse a pooled zoom view, carrying the circle cursor state"""
+        zoom_view = self._pooled_zoom_view(index)
+        
+        # Transfer current circular cursor settings
+        if self.circle_cursor:
+            # Transfer circular cursor size and color
+            zoom_view.circle_cursor_size = self.original_circle_cursor_size
+            zoom_view.circle_cursor_color = self.original_circle_cursor_color
+            
+            # Remember circular cursor visibility state
+            zoom_view.circle_cursor_was_visible = cursor_was_visible
+            
+            # Only transfer if circular cursor is not visible
+            if not cursor_was_visible:
+                zoom_view.circle_cursor_size = 0
+                
+            # Directly pass circular cursor object to ZoomView
+            zoom_view.main_window_circle_cursor = self.circle_cursor
+        
+        return zoom_view
+
+    def _on_zoom_capture_ready(self):
+        """Log when every zoom view of the session has its capture"""
+        self._zoom_ready_count += 1
+        if self._zoom_ready_count == len(self.zoom_views) and self._zoom_activation_time is not None:
+            elapsed = (time.perf_counter() - self._zoom_activation_time) * 1000
+            logger.debug(f"{len(self.zoom_views)} zoom view(s) ready in {elapsed:.1f} ms")
+
     def _hide_cursor_after_zoom_active(self):
         """그리기 모드가 활성화된 후 커서 숨기기"""
         if self.circle_cursor and self.zoom_view and self.zoom_view.isVisible():
@@ -343,8 +432,17 @@ class MainWindow(QMainWindow):
 
     def on_zoom_view_closed(self):
         """Method called when zoom view is closed"""
+        if self._closing_zoom_views:
+            return
         logger.debug("Zoom view closed")
         
+        # Closing one view ends the whole session (all screens)
+        self._closing_zoom_views = True
+        for view in self.zoom_views:
+            if view is not self.sender() and view.isVisible():
+                view.close_zoom_view()
+        self._closing_zoom_views = False
+        
         # Get updated circular cursor size and color from ZoomView
         if self.zoom_view and self.circle_cursor:
             # Update circular cursor size if new size exists
@@ -373,6 +471,7 @@ class MainWindow(QMainWindow):
         
         # Reset zoom view
         self.zoom_view = None
+        self.zoom_views = []
 
     def keyPressEvent(self, event):
         # ESC: Close zoom view only
@@ -475,29 +574,14 @@ class MainWindow(QMainWindow):
         if self.circle_cursor:
             self.circle_cursor.color = col  # color setter에서 불투명도 자동 적용
         
-        # Apply settings only if ZoomView has been created
-        if self.zoom_view:
-            # Pen thickness
-            self.zoom_view.pen_width = s.value("pen/width", 3, int)
-            
-            # Highlight opacity
-            alpha = s.value("highlight/opacity", 64, int)
-            self.zoom_view.highlighter_color.setAlpha(alpha)
-            
-            # Highlight width
-            self.zoom_view.highlighter_width = s.value("highlight/width", 20, int)
-            
-            # Highlight color
-            hl_color = s.value("highlight/color", QColor(255,255,0,64), type=QColor)
-            self.zoom_view.highlighter_color = hl_color
-            
-            # Highlight opacity
-            alpha = s.value("highlight/opacity", 64, int)
-            self.zoom_view.highlighter_color.setAlpha(alpha)
+        # Apply pen/highlight defaults to every pooled ZoomView (open or hidden)
+        for zoom_view in self.zoom_view_pool:
+            zoom_view.apply_settings()
             
             # Circular cursor color
-            self.zoom_view.circle_cursor_color = col
-            
+            zoom_view.circle_cursor_color = col
+        
+        if self.zoom_views:
             # Subtitle font size & background color
             fs = s.value("subtitle/fontsize", 50, int)
             bgcol = s.value("subtitle/bgcolor", QColor(60,60,60,217), type=QColor)
@@ -513,6 +597,15 @@ class MainWindow(QMainWindow):
         
         self.click_effect_enabled = s.value("click_effect/enabled", True, type=bool)
         self.scroll_effect_enabled = s.value("scroll_effect/enabled", True, type=bool)
+        
+        # Global animation FPS cap
+        FrameClock.instance().apply_settings()
+        
+        # Pointer prediction horizon
+        self.pointer_predictor.apply_settings()
+        
+        # Screen capture backend
+        ScreenCapturer.instance().apply_settings()
 
     def erase_at_position(self, pos):
         """Erase drawing at specified position"""
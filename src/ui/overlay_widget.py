@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QApplication
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QPoint, QSettings
-from PyQt6.QtGui import QColor
-from .click_effect import ClickEffectWidget
+from PyQt6.QtCore import Qt, QTimer, QEasingCurve, QRect, QPoint, QSettings
+from PyQt6.QtGui import QColor, QCursor
+from .frame_clock import FrameClock, Animation
+from .screen_topology import ScreenTopology
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ CARD_FONT_SIZE = 50
 SLIDE_MARGIN_X = 32
 SLIDE_MARGIN_Y = 32
 DISPLAY_DURATION = 2200  # ms
+SLIDE_DURATION = 250  # ms
 
 class OverlayWidget(QWidget):
     FONT_SIZE = CARD_FONT_SIZE
@@ -44,10 +46,12 @@ class OverlayWidget(QWidget):
         self.hide_timer.setSingleShot(True)
         self.hide_timer.timeout.connect(self.slide_out)
 
-        self.animation = QPropertyAnimation(self, b"geometry")
+        # Slide animation driven by the shared frame clock
+        self.clock = FrameClock.instance()
+        self.animation = None
         self.is_visible = False
-        self._anim_disconnect = False
         self.position = "left"  # Default: bottom left
+        self.slide_screen = None  # Screen the overlay slid in on
         
         # Load subtitle visibility setting (default: ON)
         self.subtitle_visible = QSettings().value("subtitle/visible", True, type=bool)
@@ -109,18 +113,29 @@ class OverlayWidget(QWidget):
         self.hide_timer.stop()
         self.hide_timer.start(DISPLAY_DURATION)
 
+    def _start_slide(self, start_rect, end_rect, on_finished=None):
+        """Slide horizontally from start_rect to end_rect"""
+        self._stop_slide()
+        y = end_rect.y()
+        self.animation = self.clock.animate(Animation(
+            [(0.0, start_rect.x()), (1.0, end_rect.x())],
+            SLIDE_DURATION,
+            QEasingCurve.Type.Linear,
+            on_update=lambda x: self.move(int(x), y),
+            on_finished=on_finished
+        ))
+
+    def _stop_slide(self):
+        if self.animation is not None:
+            self.clock.stop(self.animation)
+            self.animation = None
+
     def slide_in(self):
-        if self.animation.state() == self.animation.State.Running:
-            self.animation.stop()
-        if self._anim_disconnect:
-            try:
-                self.animation.finished.disconnect(self.hide)
-            except Exception:
-                pass
-            self._anim_disconnect = False
-
-        screen = QApplication.primaryScreen()
-        screen_geom = screen.geometry()
+
+        # Show on the screen the pointer is on
+        info = ScreenTopology.instance().screen_under_cursor(QCursor.pos())
+        self.slide_screen = info.screen
+        screen_geom = info.geometry
 
         if self.position == "left":
             target_x = screen_geom.x() + SLIDE_MARGIN_X
@@ -138,20 +153,19 @@ class OverlayWidget(QWidget):
         self.show()
         self.raise_()
 
-        self.animation.setDuration(250)
-        self.animation.setStartValue(start_rect)
-        self.animation.setEndValue(end_rect)
-        self.animation.start()
+        self._start_slide(start_rect, end_rect)
         self.is_visible = True
 
     def slide_out(self):
         if not self.is_visible:
             return
-        if self.animation.state() == self.animation.State.Running:
-            self.animation.stop()
+        self._stop_slide()
 
-        screen = QApplication.primaryScreen()
-        screen_geom = screen.geometry()
+        # Slide out on the same screen it slid in on
+        # (falls back to the primary screen if that screen was unplugged meanwhile)
+        topology = ScreenTopology.instance()
+        info = topology.info_for(self.slide_screen) or topology.primary()
+        screen_geom = info.geometry
 
         if self.position == "left":
             target_x = screen_geom.x() + SLIDE_MARGIN_X
@@ -165,17 +179,7 @@ class OverlayWidget(QWidget):
         else:
             end_rect = QRect(target_x + self.width(), target_y, self.width(), self.height())
 
-        try:
-            self.animation.finished.disconnect(self.hide)
-        except Exception:
-            pass
-        self.animation.finished.connect(self.hide)
-        self._anim_disconnect = True
-
-        self.animation.setDuration(250)
-        self.animation.setStartValue(start_rect)
-        self.animation.setEndValue(end_rect)
-        self.animation.start()
+        self._start_slide(start_rect, end_rect, on_finished=self.hide)
         self.is_visible = False
 
     def hide_input(self):
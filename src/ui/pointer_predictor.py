@@ -0,0 +1,144 @@
+from PyQt6.QtCore import QPoint, QSettings
+from collections import deque
+import math
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_ALPHA = 0.5          # Position correction gain of the alpha-beta filter
+PREDICTION_BETA = 0.2           # Velocity correction gain
+PREDICTION_MAX_DISTANCE = 48.0  # Never extrapolate further than this (px)
+PREDICTION_RESET_GAP = 0.1      # Samples further apart than this restart the filter (s)
+DIRECTION_CUTOFF_COS = 0.5      # Turns sharper than 60 degrees disable prediction
+MIN_SPEED = 30.0                # Below this speed (px/s) the pointer is treated as still
+ERROR_LOG_INTERVAL = 500        # Log error statistics every N measured predictions
+MAX_PENDING = 32                # Predictions awaiting their target time
+
+
+class PointerPredictor:
+    """Constant-velocity (alpha-beta) pointer predictor.
+
+    Extrapolates the pointer to the display time of the next frame: the
+    configured horizon (listener + queue + compositor latency) plus the time
+    left until the frame clock ticks. Sudden direction changes drop the
+    velocity so the cursor never overshoots a turn. Every prediction is later
+    compared with the real pointer position to measure the error.
+    """
+
+    def __init__(self, horizon_ms=0, clock=None):
+        self.horizon = horizon_ms / 1000.0
+        self.clock = clock
+        self.reset()
+
+        # Error statistics (prediction vs. real position at the target time)
+        self.error_count = 0
+        self.error_sum = 0.0
+        self.error_max = 0.0
+        self.baseline_sum = 0.0  # Error without prediction, for comparison
+
+    @property
+    def enabled(self):
+        return self.horizon > 0
+
+    def apply_settings(self):
+        self.horizon = max(0, QSettings().value("cursor/prediction_ms", 0, int)) / 1000.0
+        self.reset()
+        logger.debug(f"Pointer prediction horizon: {self.horizon * 1000:.0f} ms")
+
+    def reset(self):
+        self._t = None
+        self._x = self._y = 0.0
+        self._vx = self._vy = 0.0
+        self._raw_x = self._raw_y = 0.0
+        self._pending = deque(maxlen=MAX_PENDING)  # (target time, predicted x, y, raw x, y)
+
+    def add_sample(self, pos, t=None):
+        """Feed a measured pointer position and return the predicted position"""
+        if t is None:
+            t = time.monotonic()
+        mx, my = float(pos.x()), float(pos.y())
+
+        if self._t is None or not 0 < t - self._t < PREDICTION_RESET_GAP:
+            self._t = t
+            self._x, self._y = mx, my
+            self._vx = self._vy = 0.0
+            self._raw_x, self._raw_y = mx, my
+            self._pending.clear()
+            return QPoint(pos)
+
+        dt = t - self._t
+        self._measure_error(t, dt, mx, my)
+
+        # Alpha-beta update
+        px = self._x + self._vx * dt
+        py = self._y + self._vy * dt
+        rx, ry = mx - px, my - py
+        self._x = px + PREDICTION_ALPHA * rx
+        self._y = py + PREDICTION_ALPHA * ry
+        self._vx += PREDICTION_BETA * rx / dt
+        self._vy += PREDICTION_BETA * ry / dt
+
+        # Direction cutoff: compare the filtered velocity with the last step
+        ix, iy = (mx - self._raw_x) / dt, (my - self._raw_y) / dt
+        speed = math.hypot(self._vx, self._vy)
+        step_speed = math.hypot(ix, iy)
+        if step_speed < MIN_SPEED:
+            # Pointer stopped - nothing to extrapolate
+            self._vx = self._vy = 0.0
+        elif speed >= MIN_SPEED and (self._vx * ix + self._vy * iy) < DIRECTION_CUTOFF_COS * speed * step_speed:
+            self._vx = self._vy = 0.0
+            self._x, self._y = mx, my
+
+        self._t = t
+        self._raw_x, self._raw_y = mx, my
+        return self.predict(t)
+
+    def predict(self, t):
+        """Position expected when the next frame reaches the display"""
+        mx, my = self._raw_x, self._raw_y
+        if not self.enabled or (self._vx == 0.0 and self._vy == 0.0):
+            return QPoint(round(mx), round(my))
+
+        ahead = self.horizon + (self.clock.time_to_next_frame() if self.clock else 0.0)
+        dx, dy = self._vx * ahead, self._vy * ahead
+        distance = math.hypot(dx, dy)
+        if distance > PREDICTION_MAX_DISTANCE:
+            scale = PREDICTION_MAX_DISTANCE / distance
+            dx, dy = dx * scale, dy * scale
+
+        px, py = mx + dx, my + dy
+        self._pending.append((t + ahead, px, py, mx, my))
+        return QPoint(round(px), round(py))
+
+    def _measure_error(self, t, dt, mx, my):
+        """Compare pending predictions with the real position at their target time"""
+        while self._pending and self._pending[0][0] <= t:
+            target, px, py, bx, by = self._pending.popleft()
+
+            # Real position at the target time (interpolated between samples)
+            f = 1.0 - (t - target) / dt
+            f = min(1.0, max(0.0, f))
+            ax = self._raw_x + (mx - self._raw_x) * f
+            ay = self._raw_y + (my - self._raw_y) * f
+
+            error = math.hypot(px - ax, py - ay)
+            self.error_count += 1
+            self.error_sum += error
+            self.error_max = max(self.error_max, error)
+            self.baseline_sum += math.hypot(bx - ax, by - ay)
+
+            if self.error_count % ERROR_LOG_INTERVAL == 0:
+                stats = self.stats()
+                logger.debug(f"Pointer prediction error: mean {stats['mean_error']:.1f}px, "
+                             f"max {stats['max_error']:.1f}px, without prediction {stats['mean_baseline']:.1f}px "
+                             f"({stats['samples']} samples)")
+
+    def stats(self):
+        count = max(1, self.error_count)
+        return {
+            "samples": self.error_count,
+            "mean_error": self.error_sum / count,
+            "max_error": self.error_max,
+            "mean_baseline": self.baseline_sum / count,
+        }
@@ -0,0 +1,79 @@
+"""Polyline helpers for array-backed point storage.
+
+Points are stored interleaved in an array('f'): [x0, y0, x1, y1, ...] and
+viewed as (n, 2) NumPy arrays for bulk work.
+"""
+from array import array
+import numpy as np
+
+
+def simplify_rdp(xy, tolerance):
+    """Ramer-Douglas-Peucker on an (n, 2) array, one recursion level at a time.
+
+    Distances are measured to the chord segment rather than its line, so
+    points that overshoot a chord's end are kept. Each pass measures the points of
+    every open span against its chord and splits all spans whose farthest
+    point is out of tolerance at once; the points of spans that are within
+    tolerance are not looked at again.
+    """
+    count = len(xy)
+    if count < 3 or tolerance <= 0:
+        return xy
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    limit = tolerance * tolerance
+    active = np.arange(1, count - 1)  # Points of spans not settled yet, in order
+    while len(active):
+        kept = np.flatnonzero(keep)
+        span = np.searchsorted(kept, active, side="right") - 1
+        start = xy[kept[span]]
+        chord = xy[kept[span + 1]] - start
+        offset = xy[active] - start
+        length2 = np.einsum("ij,ij->i", chord, chord)
+        t = np.clip(np.einsum("ij,ij->i", offset, chord) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+        error = offset - t[:, None] * chord
+        distance2 = np.einsum("ij,ij->i", error, error)
+
+        # Active points are grouped by span: reduce per group
+        firsts = np.flatnonzero(np.concatenate(([True], span[1:] != span[:-1])))
+        sizes = np.diff(np.append(firsts, len(span)))
+        worst = np.repeat(np.maximum.reduceat(distance2, firsts), sizes)
+        splitting = worst > limit
+        farthest = np.flatnonzero(splitting & (distance2 == worst))
+        # One split per span: its first farthest point
+        _, first = np.unique(span[farthest], return_index=True)
+        keep[active[farthest[first]]] = True
+        active = active[splitting & ~keep[active]]
+    return xy[keep]
+
+
+class DecimatingPolyline:
+    """Append-only polyline that drops points closer than min_distance.
+
+    Each append is O(1), so storage and cost scale with the points kept rather
+    than with the number of motion events.
+    """
+
+    def __init__(self, min_distance):
+        self.min_distance_sq = min_distance * min_distance
+        self.points = array('f')
+
+    def __len__(self):
+        return len(self.points) // 2
+
+    def last(self):
+        return self.points[-2], self.points[-1]
+
+    def xy(self):
+        """Points as an (n, 2) float32 array sharing memory with the polyline"""
+        return np.frombuffer(self.points, dtype=np.float32).reshape(-1, 2)
+
+    def append(self, x, y):
+        """Append a point; return True when it was kept"""
+        if self.points:
+            lx, ly = self.points[-2], self.points[-1]
+            if (x - lx) ** 2 + (y - ly) ** 2 < self.min_distance_sq:
+                return False
+        self.points.append(x)
+        self.points.append(y)
+        return True
@@ -0,0 +1,155 @@
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QPoint, QRect, pyqtSignal
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class ScreenInfo:
+    """Cached snapshot of one screen"""
+    __slots__ = ("screen", "name", "geometry", "device_pixel_ratio", "refresh_rate", "native_geometry")
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.name = screen.name()
+        self.geometry = screen.geometry()
+        self.device_pixel_ratio = screen.devicePixelRatio()
+        refresh = screen.refreshRate()
+        self.refresh_rate = refresh if refresh > 0 else DEFAULT_REFRESH_RATE
+        # Qt keeps screen origins in device pixels and scales only the size
+        self.native_geometry = QRect(
+            self.geometry.x(),
+            self.geometry.y(),
+            int(self.geometry.width() * self.device_pixel_ratio),
+            int(self.geometry.height() * self.device_pixel_ratio)
+        )
+
+    def native_rect(self, rect):
+        """Logical rect inside this screen -> device pixel rect"""
+        ratio = self.device_pixel_ratio
+        return QRect(
+            self.geometry.x() + int((rect.x() - self.geometry.x()) * ratio),
+            self.geometry.y() + int((rect.y() - self.geometry.y()) * ratio),
+            int(rect.width() * ratio),
+            int(rect.height() * ratio)
+        )
+
+    def map_from_native(self, x, y):
+        """Device pixel position inside this screen -> logical position"""
+        return QPoint(
+            self.geometry.x() + int((x - self.geometry.x()) / self.device_pixel_ratio),
+            self.geometry.y() + int((y - self.geometry.y()) / self.device_pixel_ratio)
+        )
+
+
+class ScreenTopology(QObject):
+    """Single cache of screen geometries, DPRs and refresh rates.
+
+    Effect, overlay and zoom code read screens from here instead of querying
+    QScreen on hot paths. The cache is rebuilt from screenAdded/screenRemoved
+    and the QScreen change signals, so hot-plugged projectors never leave
+    stale geometry behind.
+    """
+
+    changed = pyqtSignal()
+    screen_added = pyqtSignal(object)    # QScreen
+    screen_removed = pyqtSignal(object)  # QScreen
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ScreenTopology()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._infos = []
+        self._by_screen = {}
+        self._primary = None
+        self._last_hit = None
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+        app.primaryScreenChanged.connect(self._on_changed)
+        for screen in app.screens():
+            self._watch(screen)
+        self.refresh()
+
+    def _watch(self, screen):
+        screen.geometryChanged.connect(self._on_changed)
+        screen.logicalDotsPerInchChanged.connect(self._on_changed)
+        screen.physicalDotsPerInchChanged.connect(self._on_changed)
+        screen.refreshRateChanged.connect(self._on_changed)
+
+    def refresh(self):
+        """Rebuild the cache from the current screens"""
+        self._infos = [ScreenInfo(screen) for screen in QApplication.screens()]
+        self._by_screen = {info.screen: info for info in self._infos}
+        primary = QApplication.primaryScreen()
+        self._primary = self._by_screen.get(primary) or (self._infos[0] if self._infos else None)
+        self._last_hit = None
+        logger.debug("Screen topology: " + ", ".join(
+            f"{info.name} {info.geometry.width()}x{info.geometry.height()}@{info.device_pixel_ratio}x "
+            f"{info.refresh_rate:.0f}Hz" for info in self._infos))
+
+    def _on_changed(self, *args):
+        self.refresh()
+        self.changed.emit()
+
+    def _on_screen_added(self, screen):
+        self._watch(screen)
+        self.refresh()
+        self.screen_added.emit(screen)
+        self.changed.emit()
+
+    def _on_screen_removed(self, screen):
+        self.refresh()
+        self.screen_removed.emit(screen)
+        self.changed.emit()
+
+    def screens(self):
+        return self._infos
+
+    def primary(self):
+        return self._primary
+
+    def info_for(self, screen):
+        return self._by_screen.get(screen)
+
+    def max_refresh_rate(self):
+        if not self._infos:
+            return DEFAULT_REFRESH_RATE
+        return max(info.refresh_rate for info in self._infos)
+
+    def screen_at(self, point):
+        """Screen containing a logical point (last hit is checked first)"""
+        if self._last_hit is not None and self._last_hit.geometry.contains(point):
+            return self._last_hit
+        for info in self._infos:
+            if info.geometry.contains(point):
+                self._last_hit = info
+                return info
+        return None
+
+    def screen_at_native(self, x, y):
+        """Screen containing a device pixel position (input listener coordinates)"""
+        for info in self._infos:
+            if info.native_geometry.contains(int(x), int(y)):
+                return info
+        return None
+
+    def screen_under_cursor(self, pos):
+        """Screen under pos, falling back to the primary screen"""
+        return self.screen_at(pos) or self._primary
+
+    def map_from_native(self, x, y):
+        """Input listener coordinates (device pixels) -> logical coordinates"""
+        info = self.screen_at_native(x, y)
+        if info is None:
+            return QPoint(int(x), int(y))
+        return info.map_from_native(x, y)
@@ -1,200 +1,276 @@
-from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import Qt, QPropertyAnimation, QTimer, pyqtProperty, QEasingCurve, QPoint, QPointF
-from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QPainterPath
-
-class ScrollEffectWidget(QWidget):
-    def __init__(self, parent=None, direction="up"):
-        super().__init__(parent)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
-        
-        # Scroll direction (up or down)
+from PyQt6.QtCore import Qt, QEasingCurve, QPoint, QRect
+from PyQt6.QtGui import QColor, QPen, QBrush, QPainterPath, QPainter, QFont
+from .effect_layer import EffectItem
+from .frame_clock import Animation
+from .sprite_cache import SpriteCache
+import time
+
+WIDTH = 44
+HEIGHT = 110  # Increased height for arrow margin
+ARROW_MARGIN = 25  # Increased top/bottom margin for arrows
+
+# Capsule area (add top and bottom margins)
+CAPSULE_RECT = QRect(0, 0, WIDTH, HEIGHT).adjusted(6, ARROW_MARGIN, -6, -ARROW_MARGIN)
+DOT_RADIUS = CAPSULE_RECT.width() // 4  # Circle radius
+
+# Gesture handling - one live indicator per gesture and location
+GESTURE_IDLE = 0.3       # s without notches before the indicator retires
+REUSE_DISTANCE = 60      # px - notches further away start a new indicator
+FADE_IN_DURATION = 150   # ms
+FADE_OUT_DURATION = 250  # ms
+BASE_SWEEP_DURATION = 500  # ms per dot sweep at low scroll speed
+MIN_SWEEP_DURATION = 120   # ms per dot sweep at high scroll speed
+COUNT_WIDTH = 40  # Space for the notch count label to the right of the capsule
+
+
+def _draw_chevron(painter, x, y, width, is_up):
+    """Draw a chevron arrow."""
+    # Calculate arrow size and thickness (enlarged 2x)
+    arrow_width = int(width * 1.2)
+    arrow_height = int(width * 0.6)
+    stroke_width = 3  # Changed to integer
+
+    # Set arrow pen - changed to translucent white
+    pen = QPen(QColor(255, 255, 255, 180))  # Alpha value 180 (approx. 70% opacity)
+    pen.setWidth(stroke_width)
+    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+    pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+    painter.setPen(pen)
+
+    # Set arrow internal fill color - very light translucent white
+    painter.setBrush(QBrush(QColor(255, 255, 255, 20)))  # Alpha value 20 (approx. 8% opacity)
+
+    # Create arrow path
+    path = QPainterPath()
+    if is_up:
+        # Upward arrow
+        path.moveTo(x - arrow_width/2, y + arrow_height/2)
+        path.lineTo(x, y - arrow_height/2)
+        path.lineTo(x + arrow_width/2, y + arrow_height/2)
+    else:
+        # Downward arrow
+        path.moveTo(x - arrow_width/2, y - arrow_height/2)
+        path.lineTo(x, y + arrow_height/2)
+        path.lineTo(x + arrow_width/2, y - arrow_height/2)
+
+    # Draw arrow
+    painter.drawPath(path)
+
+
+def _render_capsule(dpr):
+    """Outer capsule shape"""
+    pixmap = SpriteCache.new_pixmap(WIDTH, HEIGHT, dpr)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pen = QPen(QColor(255, 255, 255))
+    pen.setWidth(2)
+    painter.setPen(pen)
+    # Fill capsule with translucent white
+    painter.setBrush(QBrush(QColor(255, 255, 255, 40)))  # Alpha value 40 (approx. 15% opacity)
+    painter.drawRoundedRect(CAPSULE_RECT, CAPSULE_RECT.width() // 2, CAPSULE_RECT.width() // 2)
+    painter.end()
+    return pixmap
+
+
+def _render_dot(dpr):
+    """Inner circle - slightly darker blue with the capsule outline pen"""
+    extent = DOT_RADIUS * 2 + 2
+    pixmap = SpriteCache.new_pixmap(extent, extent, dpr)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pen = QPen(QColor(255, 255, 255))
+    pen.setWidth(2)
+    painter.setPen(pen)
+    painter.setBrush(QBrush(QColor(150, 200, 255, 180)))  # Alpha value 180 (approx. 70% opacity)
+    painter.drawEllipse(QPoint(extent // 2, extent // 2), DOT_RADIUS, DOT_RADIUS)
+    painter.end()
+    return pixmap
+
+
+def _render_count(count, dpr):
+    """Accumulated notch count label (e.g. "x3")"""
+    pixmap = SpriteCache.new_pixmap(COUNT_WIDTH, 24, dpr)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    font = QFont()
+    font.setPixelSize(16)
+    font.setBold(True)
+    painter.setFont(font)
+    painter.setPen(QColor(255, 255, 255, 220))
+    painter.drawText(QRect(0, 0, COUNT_WIDTH, 24), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f"x{count}")
+    painter.end()
+    return pixmap
+
+
+def _render_chevrons(direction, dpr):
+    """Both chevrons for one direction (arrow opacity is applied when blitting)"""
+    pixmap = SpriteCache.new_pixmap(WIDTH, HEIGHT, dpr)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    center_x = WIDTH // 2
+    if direction == "up":
+        # When scrolling down, show upward arrow only
+        _draw_chevron(painter, center_x, 12, int(CAPSULE_RECT.width() // 1.5), True)
+        _draw_chevron(painter, center_x, 20, int(CAPSULE_RECT.width() // 1.8), True)
+    else:
+        # When scrolling up, show downward arrow only
+        _draw_chevron(painter, center_x, HEIGHT - 20, int(CAPSULE_RECT.width() // 1.8), False)
+        _draw_chevron(painter, center_x, HEIGHT - 12, int(CAPSULE_RECT.width() // 1.5), False)
+    painter.end()
+    return pixmap
+
+class ScrollEffectItem(EffectItem):
+    """Scroll indicator for one scroll gesture.
+
+    Later notches of the same gesture update the live item in place (count,
+    direction, sweep speed) instead of creating new indicators. The item
+    retires once no notch arrived for GESTURE_IDLE seconds.
+    """
+    WIDTH = WIDTH
+    HEIGHT = HEIGHT
+
+    def __init__(self, direction="up"):
+        super().__init__()
+
+        # Scroll direction (up or down) and notches accumulated in that direction
         self.direction = direction
-        
+        self.count = 1
+
         # Animation properties
-        self._opacity = 1.0
+        self._opacity = 0.0
         self._dot_position = 0.0  # Position of inner circle (0.0 ~ 1.0)
-        
+
         # Chevron arrow properties
         self._arrow_opacity = 0.0
-        
-        # Widget size setting (increased height for arrow margin)
-        self.setFixedSize(44, 110)  # Slightly increased width and height
-        
+
+        # Top-left corner (global logical coordinates)
+        self.origin = QPoint(0, 0)
+
+        # Gesture state
+        self._last_notch = 0.0
+        self._velocity = 0.0  # Notches per second (smoothed)
+        self.retiring = False
+
         # Animation setup
-        self.opacity_animation = QPropertyAnimation(self, b"opacity")
-        self.dot_animation = QPropertyAnimation(self, b"dot_position")
-        self.arrow_animation = QPropertyAnimation(self, b"arrow_opacity")
-        
-        # Timer for removing widget after animation completion
-        self.cleanup_timer = QTimer(self)
-        self.cleanup_timer.setSingleShot(True)
-        self.cleanup_timer.timeout.connect(self.deleteLater)
-    
-    @pyqtProperty(float)
-    def opacity(self):
-        return self._opacity
-    
-    @opacity.setter
-    def opacity(self, opacity):
-        self._opacity = opacity
-        self.update()
-    
-    @pyqtProperty(float)
-    def dot_position(self):
-        return self._dot_position
-    
-    @dot_position.setter
-    def dot_position(self, position):
-        self._dot_position = position
-        self.update()
-    
-    @pyqtProperty(float)
-    def arrow_opacity(self):
-        return self._arrow_opacity
-    
-    @arrow_opacity.setter
-    def arrow_opacity(self, opacity):
-        self._arrow_opacity = opacity
-        self.update()
-    
+        self.opacity_animation = None
+        self.dot_animation = None
+
+    def center(self):
+        return QPoint(self.origin.x() + self.WIDTH // 2, self.origin.y() + self.HEIGHT // 2)
+
+    def bounding_rect(self):
+        width = self.WIDTH + (COUNT_WIDTH if self.count > 1 else 0)
+        return QRect(self.origin.x(), self.origin.y(), width, self.HEIGHT)
+
+    def is_animating(self):
+        return not self.finished
+
+    def accepts(self, pos):
+        """Whether a notch at pos belongs to this live gesture"""
+        if self.finished or self.retiring:
+            return False
+        delta = pos - self.center()
+        return abs(delta.x()) + abs(delta.y()) <= REUSE_DISTANCE
+
     def show_at(self, pos):
         """Display the scroll effect."""
-        # Display to the right of cursor
-        self.move(pos.x() - self.width() // 2, pos.y() - self.height() // 2)
-        
-        # Fade in/out animation
-        self.opacity_animation.setDuration(500)
-        self.opacity_animation.setStartValue(0.0)
-        self.opacity_animation.setKeyValueAt(0.3, 1.0)  # Fully opaque at 30% point
-        self.opacity_animation.setEndValue(0.0)
-        self.opacity_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Inner circle movement animation
-        self.dot_animation.setDuration(500)
-        if self.direction == "up":
-            self.dot_animation.setStartValue(0.1)  # Bottom start position (0.1)
-            self.dot_animation.setEndValue(0.9)    # Top end position (0.9)
+        # Display centered on cursor
+        self.origin = QPoint(pos.x() - self.WIDTH // 2, pos.y() - self.HEIGHT // 2)
+
+        # Fade in, then stay visible while the gesture continues
+        self.opacity_animation = Animation([(0.0, 0.0), (1.0, 1.0)], FADE_IN_DURATION, QEasingCurve.Type.OutCubic)
+        self._arrow_opacity = 0.8
+        self._last_notch = time.monotonic()
+        self._start_sweep(BASE_SWEEP_DURATION)
+        self.invalidate()
+
+    def add_notch(self, direction):
+        """Update the live indicator with one more scroll notch"""
+        now = time.monotonic()
+        if direction != self.direction:
+            self.direction = direction
+            self.count = 1
         else:
-            self.dot_animation.setStartValue(0.9)  # Top start position (0.9)
-            self.dot_animation.setEndValue(0.1)    # Bottom end position (0.1)
-            
-        # Arrow animation
-        self.arrow_animation.setDuration(500)
-        self.arrow_animation.setStartValue(0.0)
-        self.arrow_animation.setKeyValueAt(0.3, 1.0)
-        self.arrow_animation.setEndValue(0.8)
-        
-        self.dot_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        self.arrow_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-        
-        # Start animation
-        self.show()
-        self.opacity_animation.start()
-        self.dot_animation.start()
-        self.arrow_animation.start()
-        
-        # Remove widget after animation completion
-        self.cleanup_timer.start(550)
-    
-    def _draw_chevron(self, painter, x, y, width, is_up, opacity):
-        """Draw a chevron arrow."""
-        if opacity <= 0:
-            return
-            
-        # Calculate arrow size and thickness (enlarged 2x)
-        arrow_width = int(width * 1.2)
-        arrow_height = int(width * 0.6)
-        stroke_width = 3  # Changed to integer
-        
-        # Save original opacity
-        original_opacity = painter.opacity()
-        painter.setOpacity(original_opacity * opacity)
-        
-        # Set arrow pen - changed to translucent white
-        pen = QPen(QColor(255, 255, 255, 180))  # Alpha value 180 (approx. 70% opacity)
-        pen.setWidth(stroke_width)
-        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen)
-        
-        # Set arrow internal fill color - very light translucent white
-        painter.setBrush(QBrush(QColor(255, 255, 255, 20)))  # Alpha value 20 (approx. 8% opacity)
-        
-        # Create arrow path
-        path = QPainterPath()
-        if is_up:
-            # Upward arrow
-            path.moveTo(x - arrow_width/2, y + arrow_height/2)
-            path.lineTo(x, y - arrow_height/2)
-            path.lineTo(x + arrow_width/2, y + arrow_height/2)
+            self.count += 1
+
+        # Velocity-driven animation rate
+        interval = max(0.01, now - self._last_notch)
+        self._velocity = 0.6 * self._velocity + 0.4 / interval
+        self._last_notch = now
+        duration = BASE_SWEEP_DURATION / (1.0 + self._velocity / 10.0)
+        self._start_sweep(max(MIN_SWEEP_DURATION, duration))
+        self.invalidate()
+
+    def _start_sweep(self, duration):
+        """Inner circle movement animation"""
+        if self.direction == "up":
+            # Bottom start position (0.1) -> top end position (0.9)
+            self.dot_animation = Animation([(0.0, 0.1), (1.0, 0.9)], duration, QEasingCurve.Type.OutCubic)
         else:
-            # Downward arrow
-            path.moveTo(x - arrow_width/2, y - arrow_height/2)
-            path.lineTo(x, y + arrow_height/2)
-            path.lineTo(x + arrow_width/2, y - arrow_height/2)
-        
-        # Draw arrow
-        painter.drawPath(path)
-        
-        # Restore opacity
-        painter.setOpacity(original_opacity)
-    
-    def paintEvent(self, event):
-        """Draw the scroll effect."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            # Top start position (0.9) -> bottom end position (0.1)
+            self.dot_animation = Animation([(0.0, 0.9), (1.0, 0.1)], duration, QEasingCurve.Type.OutCubic)
+
+    def advance(self, now):
+        if self.finished:
+            return False
+
+        # Retire only after the gesture ends
+        if not self.retiring and now - self._last_notch > GESTURE_IDLE:
+            self.retiring = True
+            self.opacity_animation = Animation([(0.0, self._opacity), (1.0, 0.0)], FADE_OUT_DURATION, QEasingCurve.Type.OutCubic)
+
+        changed = False
+        if self.opacity_animation is not None:
+            self._opacity = self.opacity_animation.value(now)
+            if self.opacity_animation.is_finished(now):
+                self.opacity_animation = None
+                if self.retiring:
+                    # Remove item after fade out
+                    self.finished = True
+            changed = True
+
+        if self.dot_animation is not None:
+            self._dot_position = self.dot_animation.value(now)
+            if self.dot_animation.is_finished(now):
+                self.dot_animation = None
+            changed = True
+        return changed
+
+    def paint(self, painter):
+        """Draw the scroll effect by blitting cached sprites."""
+        cache = SpriteCache.instance()
+        dpr = painter.device().devicePixelRatio()
+        capsule = cache.get(("scroll_capsule", dpr), lambda: _render_capsule(dpr))
+        dot = cache.get(("scroll_dot", dpr), lambda: _render_dot(dpr))
+        chevrons = cache.get(("scroll_chevrons", self.direction, dpr), lambda: _render_chevrons(self.direction, dpr))
+
+        # Draw in item-local coordinates
+        painter.translate(self.origin.x(), self.origin.y())
         painter.setOpacity(self._opacity)
-        
-        # Calculate capsule area (add top and bottom margins)
-        arrow_margin = 25  # Increased top/bottom margin for arrows
-        capsule_top = arrow_margin
-        capsule_height = self.height() - 2 * arrow_margin
-        capsule_rect = self.rect().adjusted(6, capsule_top, -6, -(arrow_margin))
-        
-        # Draw outer capsule shape
-        pen = QPen(QColor(255, 255, 255))
-        pen.setWidth(2)
-        painter.setPen(pen)
-        # Fill capsule with translucent white
-        painter.setBrush(QBrush(QColor(255, 255, 255, 40)))  # Alpha value 40 (approx. 15% opacity)
-        painter.drawRoundedRect(capsule_rect, capsule_rect.width() // 2, capsule_rect.width() // 2)
-        
-        # Draw inner circle - changed to slightly darker blue
-        painter.setBrush(QBrush(QColor(150, 200, 255, 180)))  # Alpha value 180 (approx. 70% opacity)
-        
+        painter.drawPixmap(0, 0, capsule)
+
         # Calculate capsule top/bottom margins (to prevent circle from exceeding capsule)
-        dot_radius = capsule_rect.width() // 4  # Circle radius
-        top_margin = capsule_rect.width() // 2  # Top margin (rounded part of capsule)
-        bottom_margin = capsule_rect.width() // 2  # Bottom margin (rounded part of capsule)
-        
+        top_margin = CAPSULE_RECT.width() // 2  # Top margin (rounded part of capsule)
+        bottom_margin = CAPSULE_RECT.width() // 2  # Bottom margin (rounded part of capsule)
+
         # Movable height area for the circle
-        movable_height = capsule_rect.height() - top_margin - bottom_margin
-        
+        movable_height = CAPSULE_RECT.height() - top_margin - bottom_margin
+
         # Calculate Y position of circle (convert _dot_position in range 0.1~0.9 to actual pixel position)
-        dot_y = int(capsule_rect.top() + top_margin + (1.0 - self._dot_position) * movable_height)
-        
+        dot_y = int(CAPSULE_RECT.top() + top_margin + (1.0 - self._dot_position) * movable_height)
+
         # Set X position of circle to center of capsule (1 pixel adjustment)
-        dot_x = capsule_rect.center().x() + 1
-        
-        # Draw circle
-        painter.drawEllipse(QPoint(dot_x, dot_y), dot_radius, dot_radius)
-        
+        dot_x = CAPSULE_RECT.center().x() + 1
+
+        half = DOT_RADIUS + 1
+        painter.drawPixmap(dot_x - half, dot_y - half, dot)
+
+        # Accumulated notch count
+        if self.count > 1:
+            label = cache.get(("scroll_count", self.count, dpr), lambda: _render_count(self.count, dpr))
+            painter.drawPixmap(self.WIDTH, (self.HEIGHT - 24) // 2, label)
+
         # Draw only the opposite direction arrow based on scroll direction
-        center_x = self.width() // 2
-        
-        if self.direction == "up":
-            # When scrolling down, show upward arrow only
-            # Adjust arrow position with safe margin
-            top_y1 = 12
-            top_y2 = 20
-            self._draw_chevron(painter, center_x, top_y1, int(capsule_rect.width() // 1.5), True, self._arrow_opacity)
-            self._draw_chevron(painter, center_x, top_y2, int(capsule_rect.width() // 1.8), True, self._arrow_opacity)
-        else:
-            # When scrolling up, show downward arrow only
-            # Adjust arrow position with safe margin
-            bottom_y1 = self.height() - 20
-            bottom_y2 = self.height() - 12
-            self._draw_chevron(painter, center_x, bottom_y1, int(capsule_rect.width() // 1.8), False, self._arrow_opacity)
-            self._draw_chevron(painter, center_x, bottom_y2, int(capsule_rect.width() // 1.5), False, self._arrow_opacity) 
+        if self._arrow_opacity > 0:
+            painter.setOpacity(self._opacity * self._arrow_opacity)
+            painter.drawPixmap(0, 0, chevrons)
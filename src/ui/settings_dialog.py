@@ -2,11 +2,12 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox,
     QPushButton, QColorDialog, QSlider, QWidget, QGroupBox, QGridLayout,
-    QCheckBox
+    QCheckBox, QComboBox
 )
 from PyQt6.QtCore import Qt, QSettings
 from PyQt6.QtGui import QColor, QPalette
 from .overlay_widget import OverlayWidget
+from .sprite_cache import SpriteCache
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -109,6 +110,76 @@ class SettingsDialog(QDialog):
         scroll_effect_enabled_layout.addWidget(self.scroll_effect_enabled_checkbox)
         basic_layout.addLayout(scroll_effect_enabled_layout)
 
+        # Animation FPS cap (0 = display refresh rate)
+        fps_layout = QHBoxLayout()
+        fps_layout.addWidget(QLabel("Animation FPS Cap (0 = display):"))
+        self.max_fps_spin = QSpinBox()
+        self.max_fps_spin.setRange(0, 240)
+        self.max_fps_spin.setValue(self.settings.value("animation/max_fps", 0, int))
+        fps_layout.addWidget(self.max_fps_spin)
+        basic_layout.addLayout(fps_layout)
+
+        # Pointer prediction horizon (0 = off)
+        prediction_layout = QHBoxLayout()
+        prediction_layout.addWidget(QLabel("Cursor Prediction (ms, 0 = off):"))
+        self.prediction_spin = QSpinBox()
+        self.prediction_spin.setRange(0, 50)
+        self.prediction_spin.setValue(self.settings.value("cursor/prediction_ms", 0, int))
+        prediction_layout.addWidget(self.prediction_spin)
+        basic_layout.addLayout(prediction_layout)
+
+        # Screen capture backend (auto = XShm on X11, otherwise Qt)
+        capture_layout = QHBoxLayout()
+        capture_layout.addWidget(QLabel("Capture Backend:"))
+        self.capture_backend_combo = QComboBox()
+        self.capture_backend_combo.addItems(["auto", "xshm", "gdi", "qt"])
+        self.capture_backend_combo.setCurrentText(self.settings.value("capture/backend", "auto", str))
+        capture_layout.addWidget(self.capture_backend_combo)
+        basic_layout.addLayout(capture_layout)
+
+        # Ctrl+1 capture scope (Ctrl+2 = region, Ctrl+3 = window, Ctrl+4 = all screens)
+        capture_mode_layout = QHBoxLayout()
+        capture_mode_layout.addWidget(QLabel("Ctrl+1 Capture Scope:"))
+        self.capture_mode_combo = QComboBox()
+        self.capture_mode_combo.addItems(["screen", "window", "region", "all"])
+        self.capture_mode_combo.setCurrentText(self.settings.value("capture/mode", "screen", str))
+        capture_mode_layout.addWidget(self.capture_mode_combo)
+        basic_layout.addLayout(capture_mode_layout)
+
+        # Eraser footprint (strokes are cut exactly along its outline)
+        eraser_shape_layout = QHBoxLayout()
+        eraser_shape_layout.addWidget(QLabel("Eraser Shape:"))
+        self.eraser_shape_combo = QComboBox()
+        self.eraser_shape_combo.addItems(["square", "circle"])
+        self.eraser_shape_combo.setCurrentText(self.settings.value("eraser/shape", "square", str))
+        eraser_shape_layout.addWidget(self.eraser_shape_combo)
+        basic_layout.addLayout(eraser_shape_layout)
+
+        # Finished strokes: resample + simplify (fewer points), optional smoothing
+        simplify_layout = QHBoxLayout()
+        simplify_layout.addWidget(QLabel("Simplify Strokes:"))
+        self.simplify_checkbox = QCheckBox()
+        self.simplify_checkbox.setChecked(self.settings.value("pen/simplify", True, type=bool))
+        simplify_layout.addWidget(self.simplify_checkbox)
+        basic_layout.addLayout(simplify_layout)
+
+        smoothing_layout = QHBoxLayout()
+        smoothing_layout.addWidget(QLabel("Stroke Smoothing:"))
+        self.smoothing_combo = QComboBox()
+        self.smoothing_combo.addItems(["none", "chaikin", "catmull-rom"])
+        self.smoothing_combo.setCurrentText(self.settings.value("pen/smoothing", "none", str))
+        smoothing_layout.addWidget(self.smoothing_combo)
+        basic_layout.addLayout(smoothing_layout)
+
+        # Memory the zoom view undo history may keep (oldest steps are dropped beyond it)
+        undo_memory_layout = QHBoxLayout()
+        undo_memory_layout.addWidget(QLabel("Undo Memory (MB):"))
+        self.undo_memory_spin = QSpinBox()
+        self.undo_memory_spin.setRange(1, 1024)
+        self.undo_memory_spin.setValue(self.settings.value("undo/memory_mb", 32, int))
+        undo_memory_layout.addWidget(self.undo_memory_spin)
+        basic_layout.addLayout(undo_memory_layout)
+
         main_layout.addWidget(basic_group)
 
         # 새로운 숫자키 설정 섹션 (1-6 숫자키)
@@ -258,6 +329,8 @@ class SettingsDialog(QDialog):
             self.settings.setValue("click_effect/color", col)
             # 버튼 색상 업데이트
             self.set_button_color(self.click_effect_color_btn, col)
+            # 이전 색상으로 렌더링된 클릭 효과 스프라이트 폐기
+            SpriteCache.instance().invalidate("ripple")
 
     def pick_pen_color_num(self, num):
         """숫자키 펜 색상 선택"""
@@ -307,6 +380,14 @@ class SettingsDialog(QDialog):
         self.settings.setValue("subtitle/visible", self.subtitle_visibility_checkbox.isChecked())
         self.settings.setValue("click_effect/enabled", self.click_effect_enabled_checkbox.isChecked())
         self.settings.setValue("scroll_effect/enabled", self.scroll_effect_enabled_checkbox.isChecked())
+        self.settings.setValue("animation/max_fps", self.max_fps_spin.value())
+        self.settings.setValue("cursor/prediction_ms", self.prediction_spin.value())
+        self.settings.setValue("capture/backend", self.capture_backend_combo.currentText())
+        self.settings.setValue("capture/mode", self.capture_mode_combo.currentText())
+        self.settings.setValue("eraser/shape", self.eraser_shape_combo.currentText())
+        self.settings.setValue("undo/memory_mb", self.undo_memory_spin.value())
+        self.settings.setValue("pen/simplify", self.simplify_checkbox.isChecked())
+        self.settings.setValue("pen/smoothing", self.smoothing_combo.currentText())
         
         # 하이라이트 색상들 투명도 업데이트
         alpha = self.hl_opacity_slider.value()
@@ -367,10 +448,19 @@ class SettingsDialog(QDialog):
             "click_effect/color": QColor(255, 0, 0),        # 빨간색으로 변경
             "subtitle/visible": True,                       # 자막 표시 기본값은 True
             "click_effect/enabled": True,
-            "scroll_effect/enabled": True
+            "scroll_effect/enabled": True,
+            "animation/max_fps": 0,
+            "cursor/prediction_ms": 0,
+            "capture/backend": "auto",
+            "capture/mode": "screen",
+            "eraser/shape": "square",
+            "undo/memory_mb": 32,
+            "pen/simplify": True,
+            "pen/smoothing": "none"
         }
         for k, v in defaults.items():
             self.settings.setValue(k, v)
+        SpriteCache.instance().invalidate("ripple")
             
         # Update UI as well
         self.pen_width_spin.setValue(defaults["pen/width"])
@@ -380,6 +470,14 @@ class SettingsDialog(QDialog):
         self.subtitle_visibility_checkbox.setChecked(defaults["subtitle/visible"])
         self.click_effect_enabled_checkbox.setChecked(defaults["click_effect/enabled"])
         self.scroll_effect_enabled_checkbox.setChecked(defaults["scroll_effect/enabled"])
+        self.max_fps_spin.setValue(defaults["animation/max_fps"])
+        self.prediction_spin.setValue(defaults["cursor/prediction_ms"])
+        self.capture_backend_combo.setCurrentText(defaults["capture/backend"])
+        self.capture_mode_combo.setCurrentText(defaults["capture/mode"])
+        self.eraser_shape_combo.setCurrentText(defaults["eraser/shape"])
+        self.undo_memory_spin.setValue(defaults["undo/memory_mb"])
+        self.simplify_checkbox.setChecked(defaults["pen/simplify"])
+        self.smoothing_combo.setCurrentText(defaults["pen/smoothing"])
         
         # 모든 버튼 색상 업데이트
         self.set_button_color(self.cursor_color_btn, defaults["cursor/color"])
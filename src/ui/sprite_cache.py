@@ -0,0 +1,69 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 48 * 1024 * 1024  # 48 MB
+
+
+class SpriteCache:
+    """Memory-bounded LRU cache of pre-rendered effect sprites.
+
+    Keys start with the effect type and include everything the sprite depends
+    on (colour, device pixel ratio, direction, frame index), so a settings or
+    DPR change simply misses the cache and renders new sprites.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = SpriteCache()
+        return cls._instance
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._sprites = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def new_pixmap(width, height, dpr):
+        """Transparent pixmap of the given logical size for the given DPR"""
+        pixmap = QPixmap(max(1, int(width * dpr + 0.999)), max(1, int(height * dpr + 0.999)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    def get(self, key, render):
+        """Return the sprite for key, calling render() on a miss"""
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+
+        sprite = render()
+        self._sprites[key] = sprite
+        self._bytes += self._sprite_bytes(sprite)
+
+        # Evict least recently used sprites beyond the memory bound
+        while self._bytes > self.max_bytes and len(self._sprites) > 1:
+            _, old = self._sprites.popitem(last=False)
+            self._bytes -= self._sprite_bytes(old)
+        return sprite
+
+    def invalidate(self, effect_type=None):
+        """Drop sprites of one effect type (or everything)"""
+        if effect_type is None:
+            self._sprites.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._sprites if k[0] == effect_type]:
+            self._bytes -= self._sprite_bytes(self._sprites.pop(key))
+        logger.debug(f"Sprite cache invalidated for {effect_type}")
+
+    @staticmethod
+    def _sprite_bytes(sprite):
+        return sprite.width() * sprite.height() * 4
@@ -0,0 +1,373 @@
+"""Annotation strokes drawn in the zoom view.
+
+A stroke is one press-drag-release gesture of the pen or the highlighter.
+Its points live in a flat array('f') (x0, y0, x1, y1, ...) in image
+coordinates, so a long scribble costs 8 bytes per point instead of one
+tuple, two QPoints and a QColor reference per segment. Colours are
+interned in the document palette and strokes keep only the palette index.
+The eraser clips polylines with NumPy over the same buffer, all segments
+of a stroke at once.
+"""
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QColor, QPolygonF
+from array import array
+import numpy as np
+import math
+
+TOOL_PEN = 0
+TOOL_HIGHLIGHTER = 1
+
+GRID_CELL_SIZE = 128  # Spatial index cell size (image pixels)
+SMALL_QUERY = 32      # Up to this many hits are ordered by list search instead of a full scan
+
+ERASER_SQUARE = "square"
+ERASER_CIRCLE = "circle"
+CLIP_EPSILON = 1e-6   # Segment parameter slack; grazing the eraser boundary is not a hit
+
+
+class _Level:
+    """Coarser copy of a stroke's points, drawn when the detail is not visible"""
+
+    __slots__ = ("tolerance", "points", "_polygon")
+
+    def __init__(self, tolerance, xy):
+        self.tolerance = tolerance  # Max deviation from the full stroke (image pixels)
+        self.points = np.ascontiguousarray(xy, dtype=np.float32)
+        self._polygon = None
+
+    def polygon(self):
+        if self._polygon is None:
+            self._polygon = QPolygonF([QPointF(x, y) for x, y in self.points.tolist()])
+        return self._polygon
+
+
+class Stroke:
+    """One pen or highlighter gesture with a cached bounding box"""
+
+    __slots__ = ("tool", "color_id", "width", "points",
+                 "min_x", "min_y", "max_x", "max_y", "_polygon", "levels")
+
+    def __init__(self, tool, color_id, width, points=()):
+        self.tool = tool
+        self.color_id = color_id
+        self.width = width
+        self.points = array('f')
+        self.min_x = self.min_y = math.inf
+        self.max_x = self.max_y = -math.inf
+        self._polygon = None  # QPolygonF for painting, built on first use
+        self.levels = ()      # Coarser detail levels, finest first
+        for i in range(0, len(points), 2):
+            self.add_point(points[i], points[i + 1])
+
+    def __len__(self):
+        return len(self.points) // 2
+
+    def add_point(self, x, y):
+        self.points.append(x)
+        self.points.append(y)
+        if x < self.min_x:
+            self.min_x = x
+        if x > self.max_x:
+            self.max_x = x
+        if y < self.min_y:
+            self.min_y = y
+        if y > self.max_y:
+            self.max_y = y
+        if self._polygon is not None:
+            self._polygon.append(QPointF(x, y))
+
+    @classmethod
+    def from_array(cls, tool, color_id, width, xy):
+        """Stroke from an (n, 2) array of points"""
+        stroke = cls(tool, color_id, width)
+        stroke.set_points(xy)
+        return stroke
+
+    def set_points(self, xy):
+        """Replace all points with an (n, 2) array (not while the stroke is indexed)"""
+        xy = np.ascontiguousarray(xy, dtype=np.float32)
+        self.points = array('f', xy.tobytes())
+        self.min_x, self.min_y = (float(v) for v in xy.min(axis=0))
+        self.max_x, self.max_y = (float(v) for v in xy.max(axis=0))
+        self._polygon = None
+        self.levels = ()
+
+    def copy_with(self, xy, levels=()):
+        """New stroke with this tool, colour and width but other geometry"""
+        stroke = Stroke.from_array(self.tool, self.color_id, self.width, xy)
+        stroke.set_levels(levels)
+        return stroke
+
+    def set_levels(self, levels):
+        """Attach coarser copies: (tolerance, (n, 2) array) pairs, finest first"""
+        self.levels = tuple(_Level(tolerance, xy) for tolerance, xy in levels)
+
+    def xy(self):
+        """Points as an (n, 2) float32 array sharing memory with the stroke"""
+        return np.frombuffer(self.points, dtype=np.float32).reshape(-1, 2)
+
+    def point(self, index):
+        return self.points[2 * index], self.points[2 * index + 1]
+
+    def bounds(self):
+        """Painted area (image coordinates): points plus the pen reach.
+
+        Round pen joins reach half the width; the highlighter's miter joins
+        can reach up to twice the width (Qt's default miter limit).
+        """
+        margin = self.width * 2 if self.tool == TOOL_HIGHLIGHTER else self.width / 2
+        return QRectF(self.min_x - margin, self.min_y - margin,
+                      self.max_x - self.min_x + 2 * margin, self.max_y - self.min_y + 2 * margin)
+
+    def polygon(self):
+        if self._polygon is None:
+            points = self.points
+            self._polygon = QPolygonF([QPointF(points[i], points[i + 1]) for i in range(0, len(points), 2)])
+        return self._polygon
+
+    def detail_polygon(self, max_error):
+        """Coarsest polygon that stays within max_error (image pixels) of the stroke"""
+        chosen = None
+        for level in self.levels:
+            if level.tolerance > max_error:
+                break
+            chosen = level
+        return self.polygon() if chosen is None else chosen.polygon()
+
+
+def _rect_intervals(x0, y0, dx, dy, rect):
+    """Liang-Barsky for all segments at once: (t_in, t_out) of the part inside rect"""
+    t_in = np.zeros(len(x0))
+    t_out = np.ones(len(x0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - rect.left()), (dx, rect.right() - x0),
+                     (-dy, y0 - rect.top()), (dy, rect.bottom() - y0)):
+            t = q / p
+            t_in = np.where(p < 0, np.maximum(t_in, t), t_in)
+            t_out = np.where(p > 0, np.minimum(t_out, t), t_out)
+            # Parallel to this edge and outside of it: never inside
+            t_out = np.where((p == 0) & (q < 0), -1.0, t_out)
+    return t_in, t_out
+
+
+def _circle_intervals(x0, y0, dx, dy, rect):
+    """(t_in, t_out) of every segment inside the circle inscribed in rect"""
+    center = rect.center()
+    radius = min(rect.width(), rect.height()) / 2
+    fx, fy = x0 - center.x(), y0 - center.y()
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - a * c
+    root = np.sqrt(np.maximum(disc, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_in = np.maximum((-b - root) / a, 0.0)
+        t_out = np.minimum((-b + root) / a, 1.0)
+    t_out = np.where(disc < 0, -1.0, t_out)
+    # Repeated points: inside when the point itself is
+    degenerate = a == 0
+    t_in = np.where(degenerate, 0.0, t_in)
+    t_out = np.where(degenerate, np.where(c <= 0, 1.0, -1.0), t_out)
+    return t_in, t_out
+
+
+def clip_polyline(xy, rect, shape=ERASER_SQUARE):
+    """Parts of a polyline ((n, 2) float array) outside the eraser shape.
+
+    Returns None if no segment enters the shape, otherwise the list of
+    surviving sub-polylines. Cut ends lie exactly on the eraser boundary.
+    """
+    x0, y0 = xy[:-1, 0].astype(np.float64), xy[:-1, 1].astype(np.float64)
+    dx, dy = xy[1:, 0] - x0, xy[1:, 1] - y0
+    intervals = _circle_intervals if shape == ERASER_CIRCLE else _rect_intervals
+    t_in, t_out = intervals(x0, y0, dx, dy, rect)
+    cut = np.flatnonzero(t_out - t_in > CLIP_EPSILON)
+    if not len(cut):
+        return None
+
+    # Run j goes from where cut j-1 leaves the eraser to where cut j enters it
+    t_in, t_out = t_in[cut], t_out[cut]
+    delta = xy[cut + 1] - xy[cut]
+    has_entry = t_in > CLIP_EPSILON        # Otherwise the run ends on vertex cut[j]
+    inner_exit = t_out < 1 - CLIP_EPSILON  # Otherwise the next run starts on vertex cut[j] + 1
+    entries = xy[cut] + t_in[:, None] * delta
+    exits = np.where(inner_exit[:, None], xy[cut] + t_out[:, None] * delta, xy[cut + 1])
+    first = np.concatenate(([1], cut + 1 + ~inner_exit))  # First vertex after the run's start point
+    last = np.concatenate((cut, [len(xy) - 1]))           # Last vertex before its end point
+    counts = 1 + np.maximum(last - first + 1, 0) + np.concatenate((has_entry, [False]))
+    # Runs between back-to-back hits are empty; only real pieces reach Python
+    pieces = []
+    for j in np.flatnonzero(counts >= 2):
+        parts = [exits[j - 1:j] if j else xy[:1], xy[first[j]:last[j] + 1]]
+        if j < len(cut) and has_entry[j]:
+            parts.append(entries[j:j + 1])
+        piece = np.concatenate(parts)
+        # A run reduced to a point would still paint a cap
+        if (piece != piece[0]).any():
+            pieces.append(piece)
+    return pieces
+
+
+class StrokeGrid:
+    """Uniform grid over the bounding boxes of committed strokes"""
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of strokes
+
+    def _keys(self, rect):
+        size = self.cell_size
+        left, right = int(math.floor(rect.left() / size)), int(math.floor(rect.right() / size))
+        top, bottom = int(math.floor(rect.top() / size)), int(math.floor(rect.bottom() / size))
+        return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+    def clear(self):
+        self.cells = {}
+
+    def add(self, stroke):
+        for key in self._keys(stroke.bounds()):
+            self.cells.setdefault(key, set()).add(stroke)
+
+    def remove(self, stroke):
+        for key in self._keys(stroke.bounds()):
+            cell = self.cells.get(key)
+            if cell is not None:
+                cell.discard(stroke)
+                if not cell:
+                    del self.cells[key]
+
+    def __contains__(self, stroke):
+        cell = self.cells.get(self._keys(stroke.bounds())[0])
+        return cell is not None and stroke in cell
+
+    def query(self, rect):
+        """Strokes whose bounds overlap rect"""
+        found = set()
+        for key in self._keys(rect):
+            cell = self.cells.get(key)
+            if cell:
+                found.update(cell)
+        return {stroke for stroke in found if rect.intersects(stroke.bounds())}
+
+
+class StrokeDocument:
+    """Ordered strokes of one zoom view session plus their colour palette.
+
+    Committed strokes are kept in a StrokeGrid so the eraser and partial
+    layer repaints only look at strokes near the area in question. The
+    live stroke is indexed once it is finished.
+    """
+
+    def __init__(self):
+        self.strokes = []
+        self.colors = []      # Palette: color id -> QColor
+        self._color_ids = {}  # rgba -> color id
+        self.index = StrokeGrid()
+
+    def __len__(self):
+        return len(self.strokes)
+
+    def clear(self):
+        self.strokes = []
+        self.colors = []
+        self._color_ids = {}
+        self.index.clear()
+
+    def color_id(self, color):
+        rgba = color.rgba()
+        color_id = self._color_ids.get(rgba)
+        if color_id is None:
+            color_id = len(self.colors)
+            self.colors.append(QColor(color))
+            self._color_ids[rgba] = color_id
+        return color_id
+
+    def color(self, stroke):
+        return self.colors[stroke.color_id]
+
+    def begin(self, tool, color, width, point):
+        """Start a live stroke at point; it is painted with the committed ones"""
+        stroke = Stroke(tool, self.color_id(color), width, (point.x(), point.y()))
+        self.strokes.append(stroke)
+        return stroke
+
+    def finish(self, stroke):
+        """End a live stroke; a press without movement leaves nothing behind"""
+        if len(stroke) < 2:
+            if stroke in self.strokes:
+                self.strokes.remove(stroke)
+        else:
+            self.index.add(stroke)
+
+    def strokes_in(self, rect):
+        """Committed strokes overlapping rect, in paint order"""
+        candidates = self.index.query(rect)
+        if len(candidates) <= SMALL_QUERY:
+            return sorted(candidates, key=self.strokes.index)
+        return [stroke for stroke in self.strokes if stroke in candidates]
+
+    def splice(self, position, count, strokes):
+        """Replace count committed strokes at position with strokes.
+
+        Keeps the index in step; returns the bounds of everything removed
+        or inserted (the area to repaint).
+        """
+        damaged = QRectF()
+        for stroke in self.strokes[position:position + count]:
+            self.index.remove(stroke)
+            damaged = damaged.united(stroke.bounds())
+        self.strokes[position:position + count] = strokes
+        for stroke in strokes:
+            self.index.add(stroke)
+            damaged = damaged.united(stroke.bounds())
+        return damaged
+
+    def replace(self, stroke, replacement):
+        """Put replacement in the place of a committed stroke (e.g. a copy simplified on a worker).
+
+        Committed strokes are never changed, so history entries holding
+        stroke keep its geometry. Returns the damaged area, empty if the
+        stroke is no longer in the document.
+        """
+        if stroke not in self.index:
+            return QRectF()
+        return self.splice(self.strokes.index(stroke), 1, (replacement,))
+
+    def erase(self, rect, shape=ERASER_SQUARE, changes=None):
+        """Erase what the eraser (rect or its inscribed circle, image coordinates) covers.
+
+        A stroke is hit where its painted area (half its width around the
+        polyline) reaches the eraser, so each polyline is clipped against the
+        eraser shape grown by half the stroke width and split into the
+        surviving sub-strokes; their caps then end at the eraser's edge, and
+        touching a long highlight only takes out the part under the eraser.
+        Returns the damaged area, empty if nothing was erased: the eraser
+        footprint plus the widest changed stroke, and the whole bounds of
+        changed translucent strokes
+        (their pieces overlap and stack alpha wherever the stroke crossed
+        itself). Each replacement is appended to changes as
+        (position, erased stroke, pieces) for the undo history.
+        """
+        replaced = {}
+        margin = 0
+        damaged = QRectF()
+        for stroke in self.index.query(rect):
+            half = stroke.width / 2
+            pieces = clip_polyline(stroke.xy(), rect.adjusted(-half, -half, half, half), shape)
+            if pieces is not None:
+                replaced[stroke] = [Stroke.from_array(stroke.tool, stroke.color_id, stroke.width, piece)
+                                    for piece in pieces]
+                margin = max(margin, half + 2 * stroke.width)
+                if self.colors[stroke.color_id].alpha() < 255:
+                    damaged = damaged.united(stroke.bounds())
+        for stroke, pieces in replaced.items():
+            # Splice in place (C-level search and move, no Python loop over all strokes)
+            position = self.strokes.index(stroke)
+            self.splice(position, 1, pieces)
+            if changes is not None:
+                changes.append((position, stroke, pieces))
+        if not replaced:
+            return QRectF()
+        # Otherwise only caps and joins next to the cuts change (cuts lie half a width outside the
+        # eraser, miter joins reach up to twice the width past them)
+        return damaged.united(rect.adjusted(-margin, -margin, margin, margin))
@@ -0,0 +1,211 @@
+"""Undo/redo log of zoom view annotation edits.
+
+Commands never copy geometry: committed strokes are immutable (the eraser
+replaces a stroke with new pieces instead of changing it), so a command
+only keeps references to the strokes it took out or put in together with
+their position in the document. Undo and redo splice those strokes back
+and return the damaged area, so the annotation layer repaints just that.
+
+The log is bounded by an estimate of the memory it alone keeps alive
+(mostly erased and cleared strokes). Consecutive eraser moves of one
+gesture and consecutive view changes are coalesced into one entry; the
+oldest entries are dropped when the cap is exceeded.
+"""
+from PyQt6.QtCore import QRectF, QSettings
+from collections import deque
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_MB = 32
+COMMAND_BYTES = 64  # Rough per-entry overhead (object, list slots)
+RECORD_BYTES = 48   # Per replaced stroke inside an entry
+
+
+def _stroke_bytes(stroke):
+    return RECORD_BYTES + len(stroke.points) * stroke.points.itemsize
+
+
+class _AddStroke:
+    __slots__ = ("position", "stroke", "cost")
+
+    def __init__(self, position, stroke):
+        self.position = position
+        self.stroke = stroke
+        self.cost = COMMAND_BYTES  # The stroke itself lives in the document
+
+    def undo(self, document):
+        return document.splice(self.position, 1, ())
+
+    def redo(self, document):
+        return document.splice(self.position, 0, (self.stroke,))
+
+
+class _Erase:
+    """All stroke replacements of one eraser gesture, in the order they happened"""
+
+    __slots__ = ("changes", "cost")
+
+    def __init__(self):
+        self.changes = []  # (position, erased stroke, surviving pieces)
+        self.cost = COMMAND_BYTES
+
+    def extend(self, changes):
+        self.changes.extend(changes)
+        added = sum(_stroke_bytes(stroke) for _, stroke, _ in changes)
+        self.cost += added
+        return added
+
+    def undo(self, document):
+        damaged = QRectF()
+        for position, stroke, pieces in reversed(self.changes):
+            damaged = damaged.united(document.splice(position, len(pieces), (stroke,)))
+        return damaged
+
+    def redo(self, document):
+        damaged = QRectF()
+        for position, stroke, pieces in self.changes:
+            damaged = damaged.united(document.splice(position, 1, pieces))
+        return damaged
+
+
+class _Clear:
+    __slots__ = ("strokes", "cost")
+
+    def __init__(self, strokes):
+        self.strokes = strokes
+        self.cost = COMMAND_BYTES + sum(_stroke_bytes(stroke) for stroke in strokes)
+
+    def undo(self, document):
+        return document.splice(0, 0, self.strokes)
+
+    def redo(self, document):
+        return document.splice(0, len(self.strokes), ())
+
+
+class _ViewChange:
+    """View state (scale, zoom center, pan offset) to switch back to"""
+
+    __slots__ = ("view", "cost")
+
+    def __init__(self, view):
+        self.view = view
+        self.cost = COMMAND_BYTES
+
+
+class StrokeHistory:
+    """Undo/redo stacks for one StrokeDocument"""
+
+    def __init__(self, document):
+        self.document = document
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self._open = None  # Newest entry that further eraser moves / view changes merge into
+        self.apply_settings()
+
+    def apply_settings(self):
+        self.max_bytes = max(1, QSettings().value("undo/memory_mb", DEFAULT_HISTORY_MB, int)) * 1024 * 1024
+        self._trim()
+
+    def __len__(self):
+        return len(self._undo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._open = None
+
+    def seal(self):
+        """End coalescing, e.g. when the eraser gesture ends"""
+        self._open = None
+
+    def _push(self, command):
+        self._bytes -= sum(entry.cost for entry in self._redo)
+        self._redo.clear()
+        self._undo.append(command)
+        self._bytes += command.cost
+        self._open = command
+        self._trim()
+
+    def _trim(self):
+        # Keep the newest entry even if it alone exceeds the cap
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            dropped = self._undo.popleft()
+            self._bytes -= dropped.cost
+            if dropped is self._open:
+                self._open = None
+            logger.debug(f"Undo history over {self.max_bytes // (1024 * 1024)} MB, oldest entry dropped")
+
+    def record_add(self, position, stroke):
+        self._push(_AddStroke(position, stroke))
+
+    def record_erase(self, changes):
+        """Record replacements reported by StrokeDocument.erase()"""
+        if not changes:
+            return
+        if isinstance(self._open, _Erase):
+            self._bytes += self._open.extend(changes)
+            self._trim()
+            return
+        command = _Erase()
+        command.extend(changes)
+        self._push(command)
+
+    def record_clear(self, strokes):
+        self._push(_Clear(strokes))
+
+    def replace_added(self, stroke, replacement):
+        """Let the entry that added stroke add replacement instead (a finished copy of it).
+
+        Not possible once the stroke was erased or cleared: those entries
+        restore its exact geometry. Returns whether the swap is allowed.
+        """
+        added = None
+        for command in reversed((*self._undo, *self._redo)):
+            if isinstance(command, _AddStroke):
+                if command.stroke is stroke:
+                    added = command
+            elif isinstance(command, _Erase):
+                if any(erased is stroke for _, erased, _ in command.changes):
+                    return False
+            elif isinstance(command, _Clear):
+                if any(cleared is stroke for cleared in command.strokes):
+                    return False
+        if added is not None:
+            added.stroke = replacement
+        return True
+
+    def record_view(self, view):
+        """Record the view state before it is changed"""
+        if not isinstance(self._open, _ViewChange):
+            self._push(_ViewChange(view))
+
+    def undo(self, view):
+        """Undo the newest entry.
+
+        view is the current view state. Returns (damaged image area, view
+        state to switch to or None).
+        """
+        return self._step(self._undo, self._redo, view, undo=True)
+
+    def redo(self, view):
+        return self._step(self._redo, self._undo, view, undo=False)
+
+    def _step(self, source, target, view, undo):
+        self._open = None
+        while source:
+            command = source.pop()
+            if isinstance(command, _ViewChange):
+                if command.view == view:
+                    # Zoom or pan that ended where it started: nothing to undo
+                    self._bytes -= command.cost
+                    continue
+                previous, command.view = command.view, view
+                target.append(command)
+                return QRectF(), previous
+            target.append(command)
+            damaged = command.undo(self.document) if undo else command.redo(self.document)
+            return damaged, None
+        return QRectF(), None
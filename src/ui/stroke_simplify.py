@@ -0,0 +1,160 @@
+"""Post-processing of a finished pen/highlighter stroke.
+
+Every motion event is a vertex, so a fast scribble stores hundreds of
+nearly collinear points. On release the stroke is resampled by arc length,
+optionally smoothed (Chaikin or Catmull-Rom) and simplified with
+Ramer-Douglas-Peucker. Tolerances are given in screen pixels and divided
+by the zoom factor, so a stroke drawn while zoomed in keeps the detail
+that was visible. Long strokes can be processed on the thread pool; the
+raw stroke is shown until the result arrives. Coarser copies for
+level-of-detail drawing are derived from the result at the same time.
+"""
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QSettings, pyqtSignal
+from .polyline import simplify_rdp
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+SMOOTHING_NONE = "none"
+SMOOTHING_CHAIKIN = "chaikin"
+SMOOTHING_CATMULL_ROM = "catmull-rom"
+
+RESAMPLE_SPACING = 2.0     # Screen pixels between resampled points
+SIMPLIFY_TOLERANCE = 0.75  # Max deviation kept by RDP (screen pixels)
+CHAIKIN_ITERATIONS = 2
+CATMULL_ROM_STEPS = 4      # Points per input segment
+ASYNC_MIN_POINTS = 4000    # Strokes at least this long go to the worker (if enabled)
+LEVEL_FACTOR = 2.0         # Tolerance step between detail levels
+MAX_LEVELS = 4
+
+
+def resample(xy, spacing):
+    """Points every spacing along the polyline (both ends kept)"""
+    step = np.diff(xy, axis=0)
+    length = np.hypot(step[:, 0], step[:, 1])
+    moving = np.concatenate(([True], length > 0))
+    xy, length = xy[moving], length[moving[1:]]
+    distance = np.concatenate(([0.0], np.cumsum(length)))
+    total = distance[-1]
+    if total <= spacing:
+        # A tap collapses to one point here; two equal points still paint a dot
+        return xy[[0, -1]]
+    samples = np.append(np.arange(0.0, total, spacing), total)
+    return np.column_stack((np.interp(samples, distance, xy[:, 0]), np.interp(samples, distance, xy[:, 1])))
+
+
+def chaikin(xy, iterations=CHAIKIN_ITERATIONS):
+    """Corner cutting; the end points stay where they are"""
+    for _ in range(iterations):
+        if len(xy) < 3:
+            break
+        cut = np.empty((2 * (len(xy) - 1), 2))
+        cut[0::2] = 0.75 * xy[:-1] + 0.25 * xy[1:]
+        cut[1::2] = 0.25 * xy[:-1] + 0.75 * xy[1:]
+        xy = np.concatenate((xy[:1], cut, xy[-1:]))
+    return xy
+
+
+def catmull_rom(xy, steps=CATMULL_ROM_STEPS):
+    """Uniform Catmull-Rom spline through every point"""
+    if len(xy) < 3:
+        return xy
+    padded = np.concatenate((xy[:1], xy, xy[-1:]))
+    p0, p1, p2, p3 = (padded[i:len(padded) - 3 + i, None, :] for i in range(4))
+    t = (np.arange(steps) / steps)[None, :, None]
+    curve = 0.5 * (2 * p1 + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t * t +
+                   (3 * p1 - p0 - 3 * p2 + p3) * t * t * t)
+    return np.concatenate((curve.reshape(-1, 2), xy[-1:]))
+
+
+def process(xy, scale=1.0, smoothing=SMOOTHING_NONE):
+    """Resampled, smoothed and simplified copy of an (n, 2) stroke (image coordinates)"""
+    xy = np.asarray(xy, dtype=np.float64)
+    if len(xy) < 3:
+        return xy
+    xy = resample(xy, RESAMPLE_SPACING / scale)
+    if smoothing == SMOOTHING_CHAIKIN:
+        xy = chaikin(xy)
+    elif smoothing == SMOOTHING_CATMULL_ROM:
+        xy = catmull_rom(xy)
+    return simplify_rdp(xy, SIMPLIFY_TOLERANCE / scale)
+
+
+def detail_levels(xy, scale=1.0):
+    """Coarser RDP copies of a processed stroke for level-of-detail drawing.
+
+    Returns (tolerance, points) pairs, finest first; each level allows
+    LEVEL_FACTOR times the deviation of the previous one and is only kept
+    if it actually drops points.
+    """
+    levels = []
+    tolerance = SIMPLIFY_TOLERANCE / scale
+    for _ in range(MAX_LEVELS):
+        if len(xy) <= 2:
+            break
+        tolerance *= LEVEL_FACTOR
+        coarser = simplify_rdp(xy, tolerance)
+        if len(coarser) < len(xy):
+            levels.append((tolerance, coarser))
+            xy = coarser
+    return levels
+
+
+class _SimplifySignals(QObject):
+    finished = pyqtSignal(object, object, object)  # stroke, processed (n, 2) array, detail levels
+
+
+class _SimplifyTask(QRunnable):
+    def __init__(self, stroke, xy, scale, smoothing, signals):
+        super().__init__()
+        self.stroke = stroke
+        self.xy = xy
+        self.scale = scale
+        self.smoothing = smoothing
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = process(self.xy, self.scale, self.smoothing)
+            levels = detail_levels(result, self.scale)
+        except Exception as e:
+            logger.warning(f"Stroke simplification failed: {e}")
+            return
+        self.signals.finished.emit(self.stroke, result, levels)
+
+
+class StrokeSimplifier(QObject):
+    """Applies process() to finished strokes, inline or on the thread pool.
+
+    Strokes handed to the worker are reported through finished (queued to
+    the GUI thread); the receiver decides whether the stroke is still in
+    the document.
+    """
+
+    finished = pyqtSignal(object, object, object)  # stroke, processed (n, 2) array, detail levels
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._signals = _SimplifySignals()
+        self._signals.finished.connect(self.finished)
+        self.apply_settings()
+
+    def apply_settings(self):
+        settings = QSettings()
+        self.enabled = settings.value("pen/simplify", True, type=bool)
+        self.smoothing = settings.value("pen/smoothing", SMOOTHING_NONE, str)
+        self.use_worker = settings.value("pen/simplify_async", True, type=bool)
+
+    def simplify(self, stroke, scale):
+        """(points, detail levels) for stroke, or None if it is skipped or sent to the worker"""
+        if not self.enabled or len(stroke) < 3:
+            return None
+        xy = stroke.xy()
+        if self.use_worker and len(stroke) >= ASYNC_MIN_POINTS:
+            # The worker gets its own copy; the stroke's buffer stays on this thread
+            QThreadPool.globalInstance().start(
+                _SimplifyTask(stroke, xy.copy(), scale, self.smoothing, self._signals))
+            return None
+        points = process(xy, scale, self.smoothing)
+        return points, detail_levels(points, scale)
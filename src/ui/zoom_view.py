@@ -1,12 +1,33 @@
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QTimer, pyqtSignal, QSize, QSettings
-from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QScreen, QCursor, QTransform, QPainterPath
+from PyQt6.QtCore import Qt, QPoint, QRect, QRectF, QTimer, pyqtSignal, QSize, QSettings
+from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QScreen, QCursor, QTransform
+from .screen_topology import ScreenTopology
+from src.capture.screen_capture import ScreenCapturer
+from src.capture.capture_modes import capture_target
+from .stroke_document import StrokeDocument, TOOL_PEN, TOOL_HIGHLIGHTER, ERASER_CIRCLE, ERASER_SQUARE
+from .annotation_layer import AnnotationLayer, LiveStrokeLayer
+from .stroke_history import StrokeHistory
+from .stroke_simplify import StrokeSimplifier
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ERASER_SIZE = 20  # Eraser size every activation starts with (pixels)
+VIEW_LAYER_SETTLE_MS = 80  # Idle time after a zoom/pan step before strokes are re-rendered sharp
+VIEW_LAYER_STEP_MS = 12    # Render time per event loop pass, so input stays responsive
+
 class ZoomView(QWidget):
+    """Full-screen zoom/annotation view.
+
+    MainWindow keeps its zoom views alive between uses: activate() resets the
+    per-session state and close_zoom_view() only hides the window, so pens,
+    the pencil cursor and the native window survive until the next hotkey.
+    """
     closed = pyqtSignal()  # Signal emitted when zoom view is closed
+    capture_ready = pyqtSignal()  # Emitted once the capture has been swapped in
+
+    _pencil_cursor_cache = None  # Loaded once per process, shared by all views
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -19,13 +40,12 @@ class ZoomView(QWidget):
             Qt.WindowType.Tool
         )
         
-        # Screen size settings
-        self.screen_geometry = QApplication.primaryScreen().geometry()
+        # Screen size settings (updated to the screen under the pointer on activate)
+        self.topology = ScreenTopology.instance()
+        self.target_screen = self.topology.primary().screen
+        self.screen_geometry = self.topology.primary().geometry
         self.setGeometry(self.screen_geometry)
 
-        # ▶ Initialize QPainterPath for highlighter path storage
-        self.highlight_path = QPainterPath()
-        
         # State variables
         self.scale_factor = 1.0  # Initial zoom ratio (1.0 = original size)
         self.scale_factor_min = 1.0  # Minimum zoom ratio (original size)
@@ -35,13 +55,25 @@ class ZoomView(QWidget):
         self.drawing_mode = False  # Whether drawing mode is active
         self.last_pos = None  # Last mouse position
         self.screen_capture = None  # Screen capture image
+        self.capture_request = None  # Pending asynchronous capture request id
+        self.capture_mode = "screen"  # screen / window / region
+        self.capture_rect = QRect(self.screen_geometry)  # Captured area (global logical coordinates)
+        self.activation_time = None  # For activation latency logging
+        self._first_frame_pending = False  # Log time-to-first-frame once per activation
         self.original_screen_capture = None  # Original screen capture image (no transformation)
         
+        # Captures arrive asynchronously from a worker thread
+        ScreenCapturer.instance().captured.connect(self._complete_capture)
+        ScreenCapturer.instance().failed.connect(self._capture_failed)
+        
         # Drawing-related variables
-        self.drawings = []  # List to store drawn lines [(start_point, end_point), ...]
+        self.document = StrokeDocument()  # Pen and highlighter strokes (image coordinates)
+        self.live_stroke = None  # Stroke being drawn while a button is held
+        self.history = StrokeHistory(self.document)  # Ctrl+Z / Ctrl+Y
+        # 놓는 순간 스트로크를 리샘플링/단순화 (긴 스트로크는 워커 스레드에서)
+        self.simplifier = StrokeSimplifier(self)
+        self.simplifier.finished.connect(self._apply_simplified)
         settings = QSettings()
-        self.pen_color = settings.value("pen/color1", QColor(255, 0, 0), type=QColor)  # Default pen color (red)
-        self.pen_width = settings.value("pen/width", 3, int)  # Default pen thickness
         
         # Panning-related variables
         self.panning = False  # Panning mode state
@@ -61,6 +93,7 @@ class ZoomView(QWidget):
         
         # Cursor image-related variables
         self.pencil_cursor = None  # Pencil cursor image
+        self._init_pencil_cursor()
         
         # MainWindow's circular cursor reference (for hiding during capture)
         self.main_window_circle_cursor = None
@@ -68,94 +101,145 @@ class ZoomView(QWidget):
         # Setup for tracking mouse movement events
         self.setMouseTracking(True)
 
-       # ▶ 투명도를 낮추고 두께를 2배로 늘림
-        alpha = settings.value("highlight/opacity", 64, int)
-        hl_color = settings.value("highlight/color1", QColor(255, 255, 0), type=QColor)  # 기본은 노란색
-        hl_color.setAlpha(alpha)
-        self.highlighter_color = hl_color
-        self.highlighter_width = settings.value("highlight/width", 20, int)
         # ▶ 끝처리, 교차부 스타일 지정 (겹쳐도 원형 엔드캡 없음)
         self.highlighter_cap   = Qt.PenCapStyle.FlatCap     # FlatCap: Remove circular end part
         self.highlighter_join  = Qt.PenJoinStyle.MiterJoin  # MiterJoin: Connect sharply
-        # ▶ 현재 드로잉 색상·두께 초기값 (pen_color/pen_width 사용)
-        self.current_color = self.pen_color
-        self.current_width = self.pen_width
+        
+        # 완료된 스트로크는 캡처 해상도의 레이어에 한 번만 래스터화
+        self.annotation_layer = AnnotationLayer(self.highlighter_cap, self.highlighter_join)
+        # 그리는 중인 스트로크는 새 구간만 스크래치 레이어에 추가로 그림
+        self.live_layer = LiveStrokeLayer(self.highlighter_cap, self.highlighter_join)
+        # 확대 상태에서는 줌/패닝이 멈춘 뒤 화면 해상도 레이어를 다시 그림 (제스처 중에는 확대 비트맵)
+        self._view_layer_timer = QTimer(self)
+        self._view_layer_timer.setSingleShot(True)
+        self._view_layer_timer.timeout.connect(self._render_view_layer)
+        self._settle_transform = None  # Transform the settle timer was last started for
         
         # 현재 활성 도구 추적 변수 추가
         self.highlighter_active = False
 
         # ── Eraser 설정 ──
-        self.eraser_size = 20  # Default eraser size (20x20 pixels)
+        self.eraser_size = DEFAULT_ERASER_SIZE  # Default eraser size (20x20 pixels)
         self.eraser_min_size = 5  # Minimum eraser size
         self.eraser_max_size = 100  # Maximum eraser size
         self.eraser_step = 5  # Size adjustment step
         self.eraser_color = QColor(255, 0, 0, 128)  # Semi-transparent red color for eraser
         self.eraser_active = False  # Whether eraser is currently active
         
-        # 저장된 하이라이트 경로를 관리하는 배열 추가
-        self.highlighter_paths = []
+        # 펜/하이라이터 기본값 - 설정이 바뀌면 MainWindow가 apply_settings()를 다시 호출
+        self.apply_settings()
+        self._reset_tools()
         
         # 스레드 관련 변수 추가
         self._cleanup_required = False
         
         logger.debug("ZoomView initialized")
 
+    def apply_settings(self):
+        """Read the pen/highlighter defaults every activation starts from.
+
+        The tool in use is left alone, so a settings change during a session
+        does not switch the pen; the new defaults apply from the next
+        activation. Color keys read their colors when pressed.
+        """
+        settings = QSettings()
+        # ▶ 투명도를 낮추고 두께를 2배로 늘림
+        alpha = settings.value("highlight/opacity", 64, int)
+        hl_color = settings.value("highlight/color1", QColor(255, 255, 0), type=QColor)  # 기본은 노란색
+        hl_color.setAlpha(alpha)
+        self._tool_defaults = (
+            settings.value("pen/color1", QColor(255, 0, 0), type=QColor),  # Default pen color (red)
+            settings.value("pen/width", 3, int),  # Default pen thickness
+            hl_color,
+            settings.value("highlight/width", 20, int),
+        )
+        self.eraser_shape = settings.value("eraser/shape", ERASER_SQUARE, str)  # square / circle
+        self.history.apply_settings()
+        self.simplifier.apply_settings()
+
+    def _reset_tools(self):
+        """Restore pens changed during the previous session (color keys, +/-)"""
+        pen_color, pen_width, highlighter_color, highlighter_width = self._tool_defaults
+        self.pen_color = QColor(pen_color)
+        self.pen_width = pen_width
+        self.highlighter_color = QColor(highlighter_color)
+        self.highlighter_width = highlighter_width
+        # ▶ 현재 드로잉 색상·두께 초기값 (pen_color/pen_width 사용)
+        self.current_color = self.pen_color
+        self.current_width = self.pen_width
+        self.eraser_size = DEFAULT_ERASER_SIZE
+
     def erase_at_position(self, pos):
-        """Erase drawing at specified position"""
+        """Erase drawing at specified position; returns the damaged area in image coordinates"""
         # 화면 좌표를 이미지 좌표로 변환
         image_pos = self.screen_to_image(pos)
         
         # 현재 확대/축소 비율을 고려한 지우개 크기 계산
         scaled_eraser_size = self.eraser_size / self.scale_factor
         
-        # 지우개 영역 계산 (이미지 좌표계에서)
-        eraser_rect = QRect(
-            int(image_pos.x() - scaled_eraser_size / 2),
-            int(image_pos.y() - scaled_eraser_size / 2),
-            int(scaled_eraser_size),
-            int(scaled_eraser_size)
+        # 지우개 영역 계산 (이미지 좌표계에서, 잘린 끝이 지우개 경계와 맞도록 실수 좌표)
+        eraser_rect = QRectF(
+            image_pos.x() - scaled_eraser_size / 2,
+            image_pos.y() - scaled_eraser_size / 2,
+            scaled_eraser_size,
+            scaled_eraser_size
         )
         
-        # 지울 그림 찾기
-        to_remove = []
-        for i, (start_pt, end_pt, col, wd) in enumerate(self.drawings):
-            # 선분의 경계 상자 계산 (이미지 좌표계에서)
-            line_rect = QRect(
-                int(min(start_pt.x(), end_pt.x()) - wd/2),
-                int(min(start_pt.y(), end_pt.y()) - wd/2),
-                int(abs(end_pt.x() - start_pt.x()) + wd),
-                int(abs(end_pt.y() - start_pt.y()) + wd)
-            )
-            
-            # 지우개 영역과 선분이 겹치면 제거 목록에 추가
-            if eraser_rect.intersects(line_rect):
-                to_remove.append(i)
-        
-        # 뒤에서부터 제거 (인덱스 변화 방지)
-        for i in sorted(to_remove, reverse=True):
-            del self.drawings[i]
-        
-        # 하이라이터 경로도 확인하고 제거
-        to_remove = []
-        for i, path_info in enumerate(self.highlighter_paths):
-            # 하이라이터 경로의 경계 상자를 이미지 좌표계로 변환
-            path_rect = path_info['path'].boundingRect()
-            scaled_rect = QRect(
-                int(path_rect.x() - path_info['width']/2),
-                int(path_rect.y() - path_info['width']/2),
-                int(path_rect.width() + path_info['width']),
-                int(path_rect.height() + path_info['width'])
-            )
-            
-            if eraser_rect.intersects(scaled_rect):
-                to_remove.append(i)
-        
-        # 하이라이터 경로도 뒤에서부터 제거
-        for i in sorted(to_remove, reverse=True):
-            del self.highlighter_paths[i]
+        # 펜/하이라이트 모두 지우개 모양 안의 부분만 잘라내고 나머지는 조각으로 남김
+        changes = []
+        damaged = self.document.erase(eraser_rect, self.eraser_shape, changes)
+        # 같은 지우개 동작의 변경은 실행 취소 한 단계로 합쳐짐
+        self.history.record_erase(changes)
+        # 레이어는 지워진 영역만 남은 스트로크로 다시 그림
+        self.annotation_layer.repaint(self.document, damaged)
+        return damaged
+
+    def _view_state(self):
+        """Zoom/pan state for the undo history"""
+        center = QPoint(self.zoom_center) if self.zoom_center is not None else None
+        return (self.scale_factor, center, QPoint(self.pan_offset))
+
+    def _record_view(self):
+        """Call before changing zoom or pan; consecutive changes are one undo step"""
+        self.history.record_view(self._view_state())
+
+    def undo(self):
+        self._finish_stroke()
+        self._apply_history(*self.history.undo(self._view_state()))
+
+    def redo(self):
+        self._finish_stroke()
+        self._apply_history(*self.history.redo(self._view_state()))
+
+    def _apply_history(self, damaged, view):
+        """Show the result of an undo/redo step"""
+        if view is not None:
+            self.scale_factor, center, pan_offset = view
+            self.zoom_center = QPoint(center) if center is not None else None
+            self.pan_offset = QPoint(pan_offset)
+            self.update()
+        if not damaged.isEmpty():
+            # 캐시 레이어는 바뀐 스트로크 영역만 다시 그림
+            self.annotation_layer.repaint(self.document, damaged)
+            self._update_image_rect(damaged)
+
+    def clear_annotations(self):
+        """Remove every stroke (one undo step)"""
+        self._finish_stroke()
+        strokes = list(self.document.strokes)
+        if not strokes:
+            return
+        damaged = self.document.splice(0, len(strokes), ())
+        self.history.record_clear(strokes)
+        self.annotation_layer.repaint(self.document, damaged)
+        self._update_image_rect(damaged)
+        logger.debug(f"Annotations cleared ({len(strokes)} strokes)")
 
     def _init_pencil_cursor(self):
         """Initialize pencil cursor shape"""
+        if ZoomView._pencil_cursor_cache is not None:
+            self.pencil_cursor = ZoomView._pencil_cursor_cache
+            return
         try:
             # Try to load pencil cursor image (from resources folder)
             pencil_pixmap = QPixmap("resources/pencil_cursor.png")
@@ -171,10 +255,28 @@ class ZoomView(QWidget):
             # If error occurs, use default pencil cursor
             self.pencil_cursor = Qt.CursorShape.CrossCursor
             logger.error(f"Failed to load pencil cursor: {e}")
+        ZoomView._pencil_cursor_cache = self.pencil_cursor
+
+    def prewarm(self):
+        """Create the native window ahead of the first activation (stays hidden)"""
+        start = time.perf_counter()
+        self.ensurePolished()
+        self.winId()
+        logger.debug(f"ZoomView pre-warmed in {(time.perf_counter() - start) * 1000:.1f} ms")
     
-    def activate(self):
-        """Activate drawing mode"""
+    def activate(self, mode=None, screen=None, requested_at=None):
+        """Activate drawing mode
+
+        mode selects the capture scope: "screen", "window" or "region"
+        (defaults to capture/mode). The view covers exactly the captured
+        rect, so all transforms work in capture-local coordinates.
+        screen pins the view to one whole screen (multi-screen sessions).
+        requested_at is the perf_counter() time of the hotkey, for latency logs.
+        """
         try:
+            self.activation_time = requested_at if requested_at is not None else time.perf_counter()
+            self._first_frame_pending = True
+            
             # 이전 세션의 정리가 필요한 경우 정리 수행
             if self._cleanup_required:
                 self.cleanup_resources()
@@ -182,15 +284,18 @@ class ZoomView(QWidget):
             # 초기 상태 재설정
             self.reset_state()
             
-            # 펜슬 커서 초기화
-            self._init_pencil_cursor()
-            
-            # circular cursor 상태 저장
-            if self.main_window_circle_cursor:
-                was_visible = self.main_window_circle_cursor.isVisible()
-                self.circle_cursor_was_visible = was_visible
-                logger.debug(f"Saved initial circle cursor visibility state: {was_visible}")
+            # 캡처 범위 결정 (포인터가 있는 화면 / 활성 창 / 포인터 주변 영역)
+            if mode is None:
+                mode = QSettings().value("capture/mode", "screen", str)
+            info, self.capture_rect = capture_target(mode, QCursor.pos(), screen)
+            self.capture_mode = mode
+            self.target_screen = info.screen
+            self.screen_geometry = info.geometry
+            self.setGeometry(self.capture_rect)
             
+            # circle_cursor_was_visible은 MainWindow가 첫 뷰를 열기 전에 한 번 저장한다
+            # ("all" 모드에서는 앞선 뷰가 이미 커서를 숨겼으므로 여기서 다시 읽으면 안 됨)
+
             # 성능 개선: 화면 표시 먼저 하고 캡처는 나중에
             # 윈도우 표시 및 포커스 설정
             self.show()
@@ -205,12 +310,13 @@ class ZoomView(QWidget):
             if self.pencil_cursor:
                 self.setCursor(self.pencil_cursor)
             
-            # 화면 캡처 - 원형 커서가 보이지 않도록 처리됨
+            # 화면 캡처 - 원형 커서가 보이지 않도록 처리됨 (워커 스레드에서 비동기로 수행)
             self.capture_screen()
             
             self._cleanup_required = True
             
-            logger.debug("ZoomView UI initialized, screen capture completed")
+            logger.debug(f"ZoomView shown in {(time.perf_counter() - self.activation_time) * 1000:.1f} ms, "
+                         f"waiting for screen capture")
         except Exception as e:
             logger.error(f"Error during ZoomView activation: {e}")
             self.close_zoom_view()
@@ -227,7 +333,7 @@ class ZoomView(QWidget):
                 return
             
             # 현재 마우스 위치를 줌 중심으로 설정
-            self.zoom_center = QCursor.pos()
+            self.zoom_center = self.mapFromGlobal(QCursor.pos())
             self.current_cursor_pos = self.zoom_center
             
             # 그리기 모드 활성화
@@ -253,28 +359,36 @@ class ZoomView(QWidget):
         self.panning = False
         self.pan_start_pos = None
         self.pan_offset = QPoint(0, 0)
-        self.highlight_path = QPainterPath()
-        self.drawings = []
-        self.highlighter_paths = []
+        self.document.clear()
+        self.history.clear()
+        self.live_stroke = None
+        self.annotation_layer.reset()
+        self.live_layer.reset()
+        self._view_layer_timer.stop()
         self.eraser_active = False
         self.highlighter_active = False
+        self._reset_tools()
 
     def cleanup_resources(self):
         """Clean up resources"""
         try:
+            # 진행 중인 캡처 요청 취소
+            if self.capture_request is not None:
+                ScreenCapturer.instance().cancel(self.capture_request)
+                self.capture_request = None
+            
             # 스크린 캡처 이미지 정리
             if self.screen_capture:
                 self.screen_capture = None
             if self.original_screen_capture:
                 self.original_screen_capture = None
             
-            # 펜슬 커서 정리
-            if self.pencil_cursor:
-                self.pencil_cursor = None
-            
             # 스레드 관련 데이터 정리
-            self.drawings = []
-            self.highlighter_paths = []
+            self.document.clear()
+            self.history.clear()
+            self.live_stroke = None
+            self.annotation_layer.reset()
+            self.live_layer.reset()
             
             # 모든 이벤트 처리 완료
             QApplication.processEvents()
@@ -283,53 +397,58 @@ class ZoomView(QWidget):
             logger.error(f"Error during resource cleanup: {e}")
 
     def capture_screen(self):
-        """Capture current screen"""
+        """Request an asynchronous capture of the target screen"""
         try:
             logger.debug("Starting screen capture...")
             
-            # 캡처 전에 원형 커서 숨기기 - ZoomView와 MainWindow의 두 커서 모두 숨김
-            main_cursor_visible = False
+            # 캡처 전에 원형 커서 숨기기 - 다음 컴포지터 프레임 이후에 캡처가 시작됨
             if self.main_window_circle_cursor and self.main_window_circle_cursor.isVisible():
-                main_cursor_visible = True
                 self.main_window_circle_cursor.hide()
-                # 화면 갱신을 위해 잠시 대기
-                QApplication.processEvents()
             
-            # 화면 캡처 지연 - 커서가 완전히 사라질 시간을 줌
-            QTimer.singleShot(50, lambda: self._complete_capture(main_cursor_visible))
+            capturer = ScreenCapturer.instance()
+            if self.capture_request is not None:
+                capturer.cancel(self.capture_request)
+            self.capture_request = capturer.capture(self.target_screen, self.capture_rect)
             
             return True
         except Exception as e:
             logger.error(f"Screen capture failed: {e}")
             return False
 
-    def _complete_capture(self, main_cursor_visible):
-        """커서가 화면에서 사라진 후 실제 캡처 수행"""
+    def _complete_capture(self, request_id, image):
+        """Swap in the capture delivered by the worker"""
+        if request_id != self.capture_request or not self.isVisible():
+            return
         try:
-            # 오래 걸리는 화면 캡처 작업 최적화
-            pixmap = QApplication.primaryScreen().grabWindow(0)
+            pixmap = QPixmap.fromImage(image)  # Keeps the screen DPR of the capture
             self.original_screen_capture = pixmap
             self.screen_capture = pixmap
-            
-            # 캡처 완료 후 필요한 경우 원형 커서 다시 표시
-            if main_cursor_visible and self.main_window_circle_cursor:
-                # 메인 화면에서의 원형 커서는 다시 표시하지 않음 (ZoomView 내에서는 다른 커서 사용)
-                pass
+            self.annotation_layer.reset(pixmap)
+            self.live_layer.reset(pixmap)
             
             # 화면 업데이트
             self.update()
             
-            # 현재 마우스 위치를 줌 중심으로 설정
-            self.zoom_center = QCursor.pos()
+            # 현재 마우스 위치를 줌 중심으로 설정 (위젯 좌표)
+            self.zoom_center = self.mapFromGlobal(QCursor.pos())
             self.current_cursor_pos = self.zoom_center
             
             # 그리기 모드 활성화
             self.drawing_mode = True
             
-            logger.debug(f"Screen capture completed: {pixmap.width()}x{pixmap.height()}")
+            latency = (time.perf_counter() - self.activation_time) * 1000 if self.activation_time else 0.0
+            logger.debug(f"Screen capture completed ({self.capture_mode}): {pixmap.width()}x{pixmap.height()}, "
+                         f"activation latency {latency:.1f} ms")
+            self.capture_ready.emit()
         except Exception as e:
             logger.error(f"Delayed screen capture failed: {e}")
 
+    def _capture_failed(self, request_id, message):
+        if request_id != self.capture_request:
+            return
+        logger.error("Screen capture failed, closing zoom view")
+        self.close_zoom_view()
+
     def get_transform(self):
         """Return transformation matrix suitable for current zoom/shrink/pan state"""
         transform = QTransform()
@@ -355,81 +474,50 @@ class ZoomView(QWidget):
         if not self.original_screen_capture:
             return
         
+        if self._first_frame_pending:
+            self._first_frame_pending = False
+            if self.activation_time is not None:
+                logger.debug(f"ZoomView first frame {(time.perf_counter() - self.activation_time) * 1000:.1f} ms "
+                             f"after activation")
+        
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # 성능 개선: 클리핑 영역 설정으로 불필요한 그리기 방지
-        painter.setClipRect(event.rect())
+        painter.setClipRegion(event.region())
         
         # 원본 크기(1.0)이고 패닝이 없는 경우
         if self.scale_factor == 1.0 and self.pan_offset == QPoint(0, 0):
             # 화면 전체에 캡처된 이미지 표시
             painter.drawPixmap(self.rect(), self.original_screen_capture)
         
-            # ● 드로잉 (색상·두께 반영)
-            # 성능 개선: 배치 처리로 그리기 작업 최적화
-            batch_size = 20
-            for i in range(0, len(self.drawings), batch_size):
-                batch = self.drawings[i:i+batch_size]
-                for start_pt, end_pt, col, wd in batch:
-                    pen = QPen(col, wd)
-                    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-                    painter.setPen(pen)
-                    painter.drawLine(start_pt, end_pt)
-            
-            # ● 저장된 하이라이트 경로 모두 그리기
-            highlight_pen = QPen()
-            highlight_pen.setCapStyle(self.highlighter_cap)
-            highlight_pen.setJoinStyle(self.highlighter_join)
-            
-            # 성능 개선: 같은 색상/두께 경로는 한 번에 그리기
-            current_color = None
-            current_width = None
-            
-            for path_info in self.highlighter_paths:
-                if current_color != path_info['color'] or current_width != path_info['width']:
-                    current_color = path_info['color']
-                    current_width = path_info['width']
-                    highlight_pen.setColor(current_color)
-                    highlight_pen.setWidth(current_width)
-                    painter.setPen(highlight_pen)
-                painter.drawPath(path_info['path'])
-            
-            # ● 현재 그리는 중인 하이라이터 경로 그리기
-            if not self.highlight_path.isEmpty():
-                highlight_pen = QPen(self.highlighter_color, self.highlighter_width)
-                highlight_pen.setCapStyle(self.highlighter_cap)
-                highlight_pen.setJoinStyle(self.highlighter_join)
-                painter.setPen(highlight_pen)
-                painter.drawPath(self.highlight_path)
+            # ● 완료된 스트로크 레이어 + 그리는 중인 스트로크
+            if self.annotation_layer.image is not None:
+                painter.drawImage(self.rect(), self.annotation_layer.image)
+            self._paint_live_stroke(painter)
         
         # 확대된 경우 (scale_factor > 1.0) 또는 패닝된 경우
         else:
             # 변환 행렬 적용
-            painter.setTransform(self.get_transform())
+            transform = self.get_transform()
+            painter.setTransform(transform)
             painter.drawPixmap(0, 0, self.original_screen_capture)
             
-            # ● 드로잉 (색상·두께 반영)
-            for start_pt, end_pt, col, wd in self.drawings:
-                pen = QPen(col, wd)
-                pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-                painter.setPen(pen)
-                painter.drawLine(start_pt, end_pt)
-            
-            # ● 저장된 하이라이트 경로 모두 그리기
-            for path_info in self.highlighter_paths:
-                highlight_pen = QPen(path_info['color'], path_info['width'])
-                highlight_pen.setCapStyle(self.highlighter_cap)
-                highlight_pen.setJoinStyle(self.highlighter_join)
-                painter.setPen(highlight_pen)
-                painter.drawPath(path_info['path'])
-            
-            # ● 현재 그리는 중인 하이라이터 경로 그리기
-            highlight_pen = QPen(self.highlighter_color, self.highlighter_width)
-            highlight_pen.setCapStyle(self.highlighter_cap)
-            highlight_pen.setJoinStyle(self.highlighter_join)
-            painter.setPen(highlight_pen)
-            painter.drawPath(self.highlight_path)
+            # ● 완료된 스트로크 레이어 + 그리는 중인 스트로크
+            if self.annotation_layer.image is not None:
+                view_layer = self.annotation_layer.view
+                if self.scale_factor > 1.0 and view_layer.matches(transform, self.size(), self.devicePixelRatioF()):
+                    painter.resetTransform()
+                    painter.drawImage(QPoint(0, 0), view_layer.image)
+                    painter.setTransform(transform)
+                else:
+                    painter.drawImage(QPoint(0, 0), self.annotation_layer.image)
+                    # 커서 이동 등 같은 변환의 다시 그리기는 타이머를 미루지 않음
+                    if self.scale_factor > 1.0 and (transform != self._settle_transform or
+                                                    not self._view_layer_timer.isActive()):
+                        self._settle_transform = transform
+                        self._view_layer_timer.start(VIEW_LAYER_SETTLE_MS)
+            self._paint_live_stroke(painter)
         
         # Reset transformation (UI elements drawn on original coordinates)
         painter.resetTransform()
@@ -462,7 +550,7 @@ class ZoomView(QWidget):
         if self.eraser_active:
             painter.resetTransform()  # 화면 좌표계로 리셋
             
-            # 반투명한 빨간색 사각형으로 지우개 표시
+            # 반투명한 빨간색 사각형(또는 원)으로 지우개 표시
             painter.setPen(QPen(QColor(0, 0, 0, 180), 1))  # 검은색 테두리
             painter.setBrush(QColor(255, 0, 0, 60))  # 반투명한 빨간색
             
@@ -474,13 +562,36 @@ class ZoomView(QWidget):
                 self.eraser_size,
                 self.eraser_size
             )
-            painter.drawRect(eraser_rect)
+            if self.eraser_shape == ERASER_CIRCLE:
+                painter.drawEllipse(eraser_rect)
+            else:
+                painter.drawRect(eraser_rect)
             
             # 지우개 크기 표시
             if self.eraser_active and (QApplication.mouseButtons() & Qt.MouseButton.LeftButton) and (QApplication.mouseButtons() & Qt.MouseButton.RightButton):
                 painter.setPen(QColor(255, 255, 255))
                 painter.drawText(10, 70, f"Eraser size: {self.eraser_size}px")
 
+    def _render_view_layer(self):
+        """Render the committed strokes at screen resolution for the settled zoom/pan"""
+        if self.annotation_layer.image is None or self.scale_factor <= 1.0 or not self.isVisible():
+            return
+        view_layer = self.annotation_layer.view
+        transform, size, ratio = self.get_transform(), self.size(), self.devicePixelRatioF()
+        if view_layer.matches(transform, size, ratio):
+            return
+        if not view_layer.rendering(transform, size, ratio):
+            view_layer.begin(self.document, transform, size, ratio)
+        if view_layer.step(VIEW_LAYER_STEP_MS / 1000):
+            logger.debug(f"View layer rendered at {self.scale_factor:.1f}x")
+            self.update()
+        else:
+            self._view_layer_timer.start(0)
+
+    def _paint_live_stroke(self, painter):
+        """Paint the stroke still being drawn (committed ones are in the layer)"""
+        self.live_layer.paint(painter)
+
     def wheelEvent(self, event):
         """마우스 휠 이벤트 처리 - 확대/축소 기능"""
         if not self.drawing_mode:
@@ -489,6 +600,7 @@ class ZoomView(QWidget):
         
         # 휠 방향에 따라 확대/축소 비율 조정
         delta = event.angleDelta().y()
+        self._record_view()
         
         # 현재 마우스 위치 저장 (화면 좌표)
         mouse_pos = event.position().toPoint()
@@ -607,6 +719,7 @@ class ZoomView(QWidget):
         if modifiers == Qt.KeyboardModifier.ShiftModifier and event.button() == Qt.MouseButton.LeftButton:
             self.panning = True
             self.pan_start_pos = event.position().toPoint()
+            self._record_view()
             logger.debug(f"Panning started at {self.pan_start_pos}")
             return
             
@@ -618,6 +731,8 @@ class ZoomView(QWidget):
             buttons = QApplication.mouseButtons()
             if buttons & Qt.MouseButton.LeftButton and buttons & Qt.MouseButton.RightButton:
                 self.eraser_active = True
+                self._finish_stroke()
+                self.history.seal()  # 새 지우개 동작은 새 실행 취소 단계
                 logger.debug(f"Eraser activated at {self.last_pos} with size {self.eraser_size}px")
                 self.erase_at_position(self.last_pos)
                 self.update()
@@ -629,11 +744,9 @@ class ZoomView(QWidget):
                 self.current_color = self.highlighter_color
                 self.current_width = self.highlighter_width
                 self.highlighter_active = True  # 하이라이터 활성화 상태 기록
-                # Set start position for Path
-                p = self.last_pos
-                self.highlight_path = QPainterPath()  # 새로운 경로 시작 (기존 경로는 이미 self.drawings에 저장됨)
-                self.highlight_path.moveTo(QPointF(p.x(), p.y()))
-                logger.debug(f"Highlight started at {p}")
+                # 새 하이라이트 스트로크 시작
+                self._begin_stroke(TOOL_HIGHLIGHTER)
+                logger.debug(f"Highlight started at {self.last_pos}")
                 return
 
             # ── Left-click: Start basic pen mode ──
@@ -641,6 +754,7 @@ class ZoomView(QWidget):
                 self.current_color = self.pen_color
                 self.current_width = self.pen_width
                 self.highlighter_active = False  # 펜 활성화 상태 기록
+                self._begin_stroke(TOOL_PEN)
                 logger.debug(f"Pen drawing started at {self.last_pos}")
                 return
 
@@ -648,6 +762,7 @@ class ZoomView(QWidget):
     def mouseMoveEvent(self, event):
         """Mouse movement event"""
         # Update current mouse position (for circular cursor)
+        old_cursor_pos = self.current_cursor_pos
         self.current_cursor_pos = event.position().toPoint()
         
         # When dragging in pan mode
@@ -670,38 +785,44 @@ class ZoomView(QWidget):
             if buttons & Qt.MouseButton.LeftButton and buttons & Qt.MouseButton.RightButton:
                 if not self.eraser_active:
                     self.eraser_active = True
-                self.erase_at_position(self.current_cursor_pos)
-                self.update()
+                    self.update()  # 지우개 크기 표시 추가
+                damaged = self.erase_at_position(self.current_cursor_pos)
+                self._update_image_rect(damaged)
+                self._update_cursor(old_cursor_pos)
                 return
 
             # If not both buttons pressed, deactivate eraser
-            self.eraser_active = False
+            if self.eraser_active:
+                self.eraser_active = False
+                self.update()  # 지우개 크기 표시 제거
             
-            # ▶ Right-click drag: Extend highlighter path
-            if event.buttons() & Qt.MouseButton.RightButton:
-                pt = self.screen_to_image(event.position().toPoint())
-                self.highlight_path.lineTo(QPointF(pt.x(), pt.y()))
-                self.update()
-                return
-
-            # ▶ Left-click drag: Draw pen line
-            if self.last_pos and (event.buttons() & Qt.MouseButton.LeftButton):
+            # ▶ Right-click drag: Extend highlighter stroke / Left-click drag: Extend pen stroke
+            if self.live_stroke is not None and event.buttons() & (Qt.MouseButton.LeftButton | Qt.MouseButton.RightButton):
                 current_pos = self.screen_to_image(event.position().toPoint())
-                # Include color(self.current_color) and thickness(self.current_width) information
-                self.drawings.append((
-                    self.last_pos,
-                    current_pos,
-                    self.current_color,
-                    self.current_width
-                ))
+                self.live_stroke.add_point(current_pos.x(), current_pos.y())
+                self._update_image_rect(self.live_layer.extend())
                 self.last_pos = current_pos
-                
-                logger.debug(f"Drawing line from {self.drawings[-1][0]} to {self.drawings[-1][1]}")
-                self.update()
+                self._update_cursor(old_cursor_pos)
                 return
 
-        # Otherwise: Simple update (circular cursor, etc.)
-        self.update()
+        # Otherwise: only the circle cursor moved
+        self._update_cursor(old_cursor_pos)
+
+    def _cursor_rect(self, pos):
+        """Widget area covered by the circle cursor and eraser box at pos"""
+        size = max(self.circle_cursor_size, self.eraser_size if self.eraser_active else 0) + 4
+        return QRect(pos.x() - size // 2, pos.y() - size // 2, size, size)
+
+    def _update_cursor(self, old_pos):
+        """Repaint the cursor where it was and where it is now"""
+        self.update(self._cursor_rect(old_pos))
+        self.update(self._cursor_rect(self.current_cursor_pos))
+
+    def _update_image_rect(self, rect):
+        """Repaint an image-coordinate area (e.g. a new stroke segment)"""
+        if rect.isEmpty():
+            return
+        self.update(self.get_transform().mapRect(rect).toAlignedRect().adjusted(-2, -2, 2, 2))
 
     
     def mouseReleaseEvent(self, event):
@@ -717,25 +838,52 @@ class ZoomView(QWidget):
         buttons = QApplication.mouseButtons()
         if not (buttons & Qt.MouseButton.LeftButton and buttons & Qt.MouseButton.RightButton):
             self.eraser_active = False
+            self.history.seal()
             logger.debug("Eraser deactivated")
         
-        # Add highlighter path to array when path is completed
-        if self.drawing_mode and event.button() == Qt.MouseButton.RightButton and not self.highlight_path.isEmpty():
-            # 현재 경로를 복제하여 저장 (색상, 두께 정보 포함)
-            current_path = {
-                'path': QPainterPath(self.highlight_path),  # 경로 복제
-                'color': QColor(self.highlighter_color),    # 색상 복제
-                'width': self.highlighter_width             # 두께 저장
-            }
-            self.highlighter_paths.append(current_path)
-            logger.debug(f"Highlight path added to collection, total: {len(self.highlighter_paths)}")
-            
-            # Reset current path (for new drawing)
-            self.highlight_path = QPainterPath()
+        # 스트로크 완료 (클릭만 한 경우는 저장하지 않음)
+        if self.drawing_mode and event.button() in (Qt.MouseButton.LeftButton, Qt.MouseButton.RightButton):
+            self._finish_stroke()
         
         if self.drawing_mode:
             self.last_pos = None
 
+    def _begin_stroke(self, tool):
+        """Start a live stroke at last_pos with the current tool colour and width"""
+        self._finish_stroke()
+        self.live_stroke = self.document.begin(tool, self.current_color, self.current_width, self.last_pos)
+        self.live_layer.begin(self.document, self.live_stroke)
+
+    def _finish_stroke(self):
+        if self.live_stroke is None:
+            return
+        self.live_layer.end()
+        raw_count = len(self.live_stroke)
+        simplified = self.simplifier.simplify(self.live_stroke, self.scale_factor)
+        if simplified is not None:
+            points, levels = simplified
+            self.live_stroke.set_points(points)
+            self.live_stroke.set_levels(levels)
+        self.document.finish(self.live_stroke)
+        if len(self.live_stroke) >= 2:
+            # begin()이 끝에 추가했으므로 마지막 위치
+            self.history.record_add(len(self.document) - 1, self.live_stroke)
+        self.annotation_layer.add(self.document, self.live_stroke)
+        logger.debug(f"Stroke finished ({raw_count} -> {len(self.live_stroke)} points), total: {len(self.document)}")
+        self.live_stroke = None
+
+    def _apply_simplified(self, stroke, points, levels):
+        """Swap in a stroke simplified on the worker (unless it was erased or cleared meanwhile)"""
+        simplified = stroke.copy_with(points, levels)
+        # An undone stroke is swapped in its redo entry only, so redo brings back the simplified one
+        if not self.history.replace_added(stroke, simplified):
+            return
+        damaged = self.document.replace(stroke, simplified)
+        if not damaged.isEmpty():
+            self.annotation_layer.repaint(self.document, damaged)
+            self._update_image_rect(damaged)
+            logger.debug(f"Stroke simplified on worker ({len(stroke)} -> {len(simplified)} points)")
+
     def keyPressEvent(self, event):
         """Handle keyboard events"""
         key = event.key()
@@ -807,6 +955,7 @@ class ZoomView(QWidget):
         elif key in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):
             if modifiers == Qt.KeyboardModifier.ControlModifier:
                 # Ctrl++: Increase zoom ratio
+                self._record_view()
                 old_factor = self.scale_factor
                 self.scale_factor = min(self.scale_factor_max, self.scale_factor + self.scale_step)
                 logger.debug(f"Zoom factor increased to {self.scale_factor:.1f}x")
@@ -836,6 +985,7 @@ class ZoomView(QWidget):
         elif key == Qt.Key.Key_Minus:
             if modifiers == Qt.KeyboardModifier.ControlModifier:
                 # Ctrl+-: Decrease zoom ratio
+                self._record_view()
                 old_factor = self.scale_factor
                 self.scale_factor = max(self.scale_factor_min, self.scale_factor - self.scale_step)
                 logger.debug(f"Zoom factor decreased to {self.scale_factor:.1f}x")
@@ -862,12 +1012,27 @@ class ZoomView(QWidget):
 
         # R: Reset view (panning offset 및 zoom factor 초기화)
         elif key == Qt.Key.Key_R:
+            self._record_view()
             self.pan_offset = QPoint(0, 0)
             self.scale_factor = 1.0
             logger.debug("Reset view: panning offset and scale factor reset")
             self.update()
             return
 
+        # Ctrl+Z: 실행 취소 / Ctrl+Y, Ctrl+Shift+Z: 다시 실행
+        elif key == Qt.Key.Key_Z and modifiers == Qt.KeyboardModifier.ControlModifier:
+            self.undo()
+            return
+        elif (key == Qt.Key.Key_Y and modifiers == Qt.KeyboardModifier.ControlModifier) or \
+                (key == Qt.Key.Key_Z and modifiers == (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier)):
+            self.redo()
+            return
+
+        # Delete: 모든 필기 지우기 (Ctrl+Z로 되돌릴 수 있음)
+        elif key == Qt.Key.Key_Delete:
+            self.clear_annotations()
+            return
+
         # 그 외: 기본 처리
         super().keyPressEvent(event)
 
@@ -917,6 +1082,10 @@ class ZoomView(QWidget):
     def focusOutEvent(self, event):
         """Handle focus loss event"""
         super().focusOutEvent(event)
+        # 다른 화면의 줌 뷰로 포커스가 옮겨간 경우는 그대로 둠 (화면별 줌 뷰)
+        active = QApplication.activeWindow()
+        if isinstance(active, ZoomView) and active is not self:
+            return
         logger.debug("Focus lost - attempting to restore focus")
         # 포커스 상실 시 자동으로 다시 포커스 획득 시도
         self.setFocus()
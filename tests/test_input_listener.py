@@ -0,0 +1,29 @@
+"""Ctrl+number shortcuts reach the zoom modes even when pynput only reports a vk."""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+keyboard = pytest.importorskip("pynput.keyboard")
+
+from PyQt6.QtWidgets import QApplication
+
+from src.input.input_listener import InputListener
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.mark.parametrize("vk, mode", [(50, "region"), (51, "window"), (52, "all")])
+def test_ctrl_digit_vk_activates_zoom_mode(app, vk, mode):
+    listener = InputListener()
+    modes = []
+    listener.activate_zoom_mode.connect(modes.append)
+
+    listener.on_key_press(keyboard.Key.ctrl_l)
+    listener.on_key_press(keyboard.KeyCode(vk=vk))
+
+    assert modes == [mode]
@@ -0,0 +1,45 @@
+"""Eraser hit testing and clipping take the stroke width into account."""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QColor
+
+from src.ui.stroke_document import ERASER_CIRCLE, ERASER_SQUARE, StrokeDocument, TOOL_HIGHLIGHTER, TOOL_PEN
+
+
+def _document(tool, width, points):
+    document = StrokeDocument()
+    stroke = document.begin(tool, QColor(255, 0, 0), width, QPointF(*points[0]))
+    for x, y in points[1:]:
+        stroke.add_point(x, y)
+    document.finish(stroke)
+    return document
+
+
+def test_wide_stroke_is_erased_when_only_its_edge_is_under_the_eraser():
+    # Centerline 8 px below the eraser, but half of the 20 px highlight reaches 2 px into it
+    document = _document(TOOL_HIGHLIGHTER, 20, [(0, 58), (200, 58)])
+    assert not document.erase(QRectF(90, 30, 20, 20)).isEmpty()
+    assert len(document) == 2
+
+
+def test_near_miss_beyond_half_the_width_is_not_erased():
+    document = _document(TOOL_PEN, 4, [(0, 58), (200, 58)])
+    assert document.erase(QRectF(90, 30, 20, 20)).isEmpty()
+    assert len(document) == 1
+
+
+def test_surviving_caps_stay_outside_the_eraser():
+    width = 10
+    for shape in (ERASER_SQUARE, ERASER_CIRCLE):
+        document = _document(TOOL_PEN, width, [(0, 40), (200, 40)])
+        rect = QRectF(90, 30, 20, 20)
+        document.erase(rect, shape)
+        assert len(document) == 2
+        for stroke in document.strokes:
+            xy = stroke.xy()
+            # Round caps reach half the width past the ends
+            assert (xy[:, 0].max() + width / 2 <= rect.left() + 1e-3 or
+                    xy[:, 0].min() - width / 2 >= rect.right() - 1e-3)
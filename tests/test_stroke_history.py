@@ -0,0 +1,59 @@
+"""A stroke simplified after it was committed comes back the same way from undo/redo."""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QColor
+
+from src.ui.stroke_document import StrokeDocument, TOOL_PEN
+from src.ui.stroke_history import StrokeHistory
+
+VIEW = (1.0, None, None)
+
+
+def _add(document, history, points):
+    stroke = document.begin(TOOL_PEN, QColor(255, 0, 0), 4, QPointF(*points[0]))
+    for x, y in points[1:]:
+        stroke.add_point(x, y)
+    document.finish(stroke)
+    history.record_add(len(document) - 1, stroke)
+    return stroke
+
+
+def _simplify(document, history, stroke):
+    """What ZoomView does when the worker result arrives"""
+    simplified = stroke.copy_with(np.array([[0, 0], [100, 0]], dtype=np.float32))
+    if history.replace_added(stroke, simplified):
+        document.replace(stroke, simplified)
+    return simplified
+
+
+def test_result_after_undo_is_what_redo_restores():
+    document = StrokeDocument()
+    history = StrokeHistory(document)
+    stroke = _add(document, history, [(0, 0), (50, 1), (100, 0)])
+    raw = stroke.xy().copy()
+
+    history.undo(VIEW)
+    simplified = _simplify(document, history, stroke)
+    assert len(document) == 0
+    history.redo(VIEW)
+
+    assert document.strokes == [simplified]
+    assert (stroke.xy() == raw).all()  # Committed strokes are never changed
+
+
+def test_result_for_an_erased_stroke_is_dropped():
+    document = StrokeDocument()
+    history = StrokeHistory(document)
+    stroke = _add(document, history, [(0, 0), (50, 1), (100, 0)])
+    changes = []
+    document.erase(QRectF(40, -10, 20, 20), changes=changes)
+    history.record_erase(changes)
+
+    _simplify(document, history, stroke)
+    history.undo(VIEW)
+
+    assert document.strokes == [stroke]
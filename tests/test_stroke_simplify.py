@@ -0,0 +1,12 @@
+"""Stroke post-processing keeps what the pen actually drew."""
+import numpy as np
+
+from src.ui.stroke_simplify import SMOOTHING_CATMULL_ROM, SMOOTHING_CHAIKIN, SMOOTHING_NONE, process
+
+
+def test_tap_keeps_two_points():
+    tap = np.full((12, 2), 5.0)
+    for smoothing in (SMOOTHING_NONE, SMOOTHING_CHAIKIN, SMOOTHING_CATMULL_ROM):
+        points = process(tap, smoothing=smoothing)
+        assert len(points) == 2
+        assert (points == 5.0).all()
@@ -0,0 +1,67 @@
+"""XShm grabs reuse one shared segment per screen and size, and leave the X error handler as they found it."""
+import os
+
+import pytest
+
+if not os.environ.get("DISPLAY"):
+    pytest.skip("no X display", allow_module_level=True)
+
+import ctypes
+import ctypes.util
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage
+
+from src.capture.xshm_backend import MAX_BUFFERS_PER_SCREEN, XShmCaptureBackend, _XErrorHandler
+
+
+@pytest.fixture
+def backend():
+    try:
+        backend = XShmCaptureBackend()
+    except RuntimeError as e:  # No libX11/libXext or no MIT-SHM on this display
+        pytest.skip(str(e))
+    yield backend
+    backend.close()
+
+
+def _screen(name, width, height):
+    """Just the ScreenInfo fields grab() reads, at DPR 1"""
+    return SimpleNamespace(name=name, native_geometry=QRect(0, 0, width, height), device_pixel_ratio=1.0,
+                           native_rect=lambda rect: rect)
+
+
+def test_grab_reuses_one_segment_per_screen_and_size(backend):
+    screen = _screen("test", 64, 48)
+    first = backend.grab(screen)
+    assert (first.width(), first.height()) == (64, 48)
+    assert first.format() == QImage.Format.Format_RGB32
+    address = int(first.constBits())
+
+    second = backend.grab(screen)
+    assert (second.width(), second.height()) == (64, 48)
+    assert int(second.constBits()) == address
+    connection = backend._connections["test"]
+    assert list(connection.buffers) == [("test", 64, 48)]
+
+    for width in (32, 16, 8):
+        backend.grab(screen, QRect(0, 0, width, 8))
+    assert len(connection.buffers) == MAX_BUFFERS_PER_SCREEN
+
+
+def test_close_restores_previous_error_handler():
+    x11 = ctypes.CDLL(ctypes.util.find_library("X11"))
+    x11.XSetErrorHandler.restype = ctypes.c_void_p
+    x11.XSetErrorHandler.argtypes = [_XErrorHandler]
+    sentinel = _XErrorHandler(lambda display, event: 0)
+    original = x11.XSetErrorHandler(sentinel)
+    try:
+        try:
+            backend = XShmCaptureBackend()
+        except RuntimeError as e:
+            pytest.skip(str(e))
+        backend.close()
+        assert x11.XSetErrorHandler(sentinel) == ctypes.cast(sentinel, ctypes.c_void_p).value
+    finally:
+        x11.XSetErrorHandler(_XErrorHandler(original or 0))